@@ -8,6 +8,7 @@ from carrot.app.region.router import region_router
 from carrot.app.pay.router import pay_router
 from carrot.app.image.router import image_router
 from carrot.app.auction.router import auction_router
+from carrot.app.category.router import category_router
 
 api_router = APIRouter()
 
@@ -18,4 +19,5 @@ api_router.include_router(product_router, prefix="/product", tags=["product"])
 api_router.include_router(image_router, prefix="/image", tags=["image"])
 api_router.include_router(region_router, prefix="/region", tags=["region"])
 api_router.include_router(pay_router, prefix="/pay", tags=["pay"])
-api_router.include_router(auction_router, prefix="/auction", tags=["auction"])
\ No newline at end of file
+api_router.include_router(auction_router, prefix="/auction", tags=["auction"])
+api_router.include_router(category_router, prefix="/category", tags=["category"])
\ No newline at end of file
@@ -0,0 +1,52 @@
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from carrot.app.auction.schemas import BidResponse
+
+RECENT_BIDS_SIZE = 20
+MAX_CACHED_AUCTIONS = 1024
+
+
+@dataclass
+class _RecentBids:
+    # 버퍼가 반영하고 있는 입찰 수. DB의 auction.bid_count와 다르면 누락된 입찰이 있는 것
+    bid_count: int
+    bids: deque = field(default_factory=lambda: deque(maxlen=RECENT_BIDS_SIZE))
+
+
+class RecentBidCache:
+    """경매별 최근 입찰 N개를 최신순으로 보관하는 ring buffer 캐시 (LRU로 경매 수 제한)"""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, _RecentBids] = OrderedDict()
+
+    def get(self, auction_id: str, bid_count: int) -> list[BidResponse] | None:
+        # 다른 워커에서 들어온 입찰은 push되지 않으므로 bid_count로 최신 여부를 확인
+        entry = self._entries.get(auction_id)
+        if entry is None or entry.bid_count != bid_count:
+            return None
+        self._entries.move_to_end(auction_id)
+        return list(entry.bids)
+
+    def fill(self, auction_id: str, bids: list[BidResponse], bid_count: int) -> None:
+        """DB에서 읽은 최근 입찰(최신순)로 버퍼를 채움"""
+        entry = _RecentBids(bid_count=bid_count)
+        entry.bids.extend(bids)
+        self._entries[auction_id] = entry
+        self._entries.move_to_end(auction_id)
+        while len(self._entries) > MAX_CACHED_AUCTIONS:
+            self._entries.popitem(last=False)
+
+    def push(self, auction_id: str, bid: BidResponse, bid_count: int) -> None:
+        entry = self._entries.get(auction_id)
+        if entry is None:
+            return
+        if entry.bid_count + 1 != bid_count:
+            # 중간 입찰을 놓쳤거나 순서가 바뀜 -> 다음 조회 때 DB에서 다시 채움
+            del self._entries[auction_id]
+            return
+        entry.bids.appendleft(bid)
+        entry.bid_count = bid_count
+
+
+recent_bid_cache = RecentBidCache()
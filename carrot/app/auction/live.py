@@ -0,0 +1,97 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from fastapi import WebSocket
+
+from carrot.app.auction.models import Auction, AuctionStatus
+from carrot.app.auction.utils import utcnow
+from carrot.app.chat.manager import ConnectionManager
+
+# 입찰 경쟁이 붙어도 경매당 초당 최대 프레임 수. 그 사이의 변경은 마지막 상태 하나로 합쳐짐
+MAX_FRAMES_PER_SECOND = 5
+
+
+def _snapshot(auction: Auction, status: AuctionStatus | None = None) -> dict:
+    return {
+        "auction_id": auction.id,
+        "current_price": auction.current_price,
+        "bid_count": auction.bid_count,
+        "status": AuctionStatus(status or auction.status),
+        "end_at": auction.end_at,
+    }
+
+
+def build_frame(state: dict) -> dict:
+    # 남은 시간은 실제로 보내는 시점 기준으로 계산
+    end_at: datetime = state["end_at"]
+    remaining = max((end_at - utcnow()).total_seconds(), 0.0)
+    return {
+        "type": "auction",
+        "auction_id": state["auction_id"],
+        "current_price": state["current_price"],
+        "bid_count": state["bid_count"],
+        "status": state["status"].value,
+        "end_at": end_at.replace(tzinfo=timezone.utc).isoformat(),
+        "remaining_seconds": round(remaining, 3),
+    }
+
+
+class AuctionLiveBroadcaster:
+    """경매 상태 변경을 구독자에게 밀어주는 채널 (채팅 ConnectionManager로 fan-out)
+
+    같은 프로세스에 연결된 구독자에게만 전달됨
+    """
+
+    def __init__(self, max_frames_per_second: int = MAX_FRAMES_PER_SECOND) -> None:
+        self.manager = ConnectionManager()
+        self._interval = 1.0 / max_frames_per_second
+        self._pending: dict[str, dict] = {}
+        # auction_id -> (마지막 전송 시각, 마지막으로 보낸 bid_count)
+        self._sent: dict[str, tuple[float, int]] = {}
+        self._flushers: dict[str, asyncio.Task] = {}
+
+    async def subscribe(self, websocket: WebSocket, auction: Auction) -> None:
+        await self.manager.connect(websocket, auction.id)
+        await websocket.send_json(build_frame(_snapshot(auction)))
+
+    def unsubscribe(self, websocket: WebSocket, auction_id: str) -> None:
+        self.manager.disconnect(websocket, auction_id)
+        if auction_id not in self.manager.active_connections:
+            self._sent.pop(auction_id, None)
+
+    def publish(self, auction: Auction, status: AuctionStatus | None = None) -> None:
+        """커밋된 경매 상태를 전송 대기열에 올림. 구독자가 없으면 아무것도 하지 않음"""
+        if auction.id not in self.manager.active_connections:
+            return
+        state = _snapshot(auction, status)
+
+        # 커밋 순서와 publish 순서가 뒤바뀌어도 더 오래된 상태가 새 상태를 덮지 않도록 함
+        pending = self._pending.get(auction.id)
+        if pending is not None and pending["bid_count"] > state["bid_count"]:
+            return
+        sent = self._sent.get(auction.id)
+        if sent is not None and sent[1] > state["bid_count"]:
+            return
+
+        self._pending[auction.id] = state
+        if auction.id not in self._flushers:
+            self._flushers[auction.id] = asyncio.create_task(self._flush(auction.id))
+
+    async def _flush(self, auction_id: str) -> None:
+        try:
+            while auction_id in self._pending:
+                sent = self._sent.get(auction_id)
+                if sent is not None:
+                    delay = sent[0] + self._interval - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                state = self._pending.pop(auction_id)
+                self._sent[auction_id] = (time.monotonic(), state["bid_count"])
+                await self.manager.broadcast_to_room(auction_id, build_frame(state))
+        finally:
+            del self._flushers[auction_id]
+
+
+auction_live = AuctionLiveBroadcaster()
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import String, Integer, ForeignKey, Boolean, DateTime
+from sqlalchemy import String, Integer, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from typing import TYPE_CHECKING, Optional
@@ -23,6 +23,9 @@ class Auction(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     product_id: Mapped[str] = mapped_column(String(36), ForeignKey("product.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    # 목록 필터용으로 product에서 복사 (경매 상품은 수정할 수 없으므로 값이 바뀌지 않음)
+    category_id: Mapped[str] = mapped_column(String(36), ForeignKey("category.id", ondelete="CASCADE"), nullable=False)
+    region_id: Mapped[str] = mapped_column(String(36), ForeignKey("region.id", ondelete="CASCADE"), nullable=False)
 
     # starting_price: Mapped[int] = mapped_column(Integer, nullable=False)    # 시작가
     current_price: Mapped[int] = mapped_column(Integer, nullable=False)     # 현재가
@@ -30,19 +33,48 @@ class Auction(Base):
     end_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)      # 경매 종료 시간
     bid_count: Mapped[int] = mapped_column(Integer, default=0)              # 입찰 횟수
     status: Mapped[AuctionStatus] = mapped_column(String(20), default=AuctionStatus.ACTIVE)  # 경매 상태
+    leading_bidder_id: Mapped[Optional[str]] = mapped_column(
+        String(36), ForeignKey("user.id", ondelete="SET NULL"), nullable=True
+    )                                                                       # 현재 최고 입찰자 (입찰 금액을 예치 중)
+    winning_bid_id: Mapped[Optional[str]] = mapped_column(
+        String(36), ForeignKey("bid.id", ondelete="SET NULL", use_alter=True), nullable=True
+    )                                                                       # 낙찰 입찰 (종료 시 기록)
 
     product: Mapped["Product"] = relationship("Product", back_populates="auction", uselist=False)
-    bids: Mapped[list["Bid"]] = relationship("Bid", back_populates="auction", cascade="all, delete-orphan")
+    bids: Mapped[list["Bid"]] = relationship(
+        "Bid", back_populates="auction", cascade="all, delete-orphan", foreign_keys="[Bid.auction_id]"
+    )
+
+    # InnoDB 보조 인덱스는 뒤에 PK(id)가 붙으므로 (정렬 키, id) keyset 조건이 인덱스 범위 스캔 하나로 처리됨
+    __table_args__ = (
+        Index("ix_auction_status_end_at", "status", "end_at"),
+        Index("ix_auction_status_bid_count", "status", "bid_count"),
+        Index("ix_auction_status_current_price", "status", "current_price"),
+        Index("ix_auction_category_status_end_at", "category_id", "status", "end_at"),
+        Index("ix_auction_region_status_end_at", "region_id", "status", "end_at"),
+        # 카테고리/지역 필터와 입찰 수/가격 정렬을 함께 쓰는 목록도 filesort 없이 인덱스 순서대로 읽음
+        Index("ix_auction_category_status_bid_count", "category_id", "status", "bid_count"),
+        Index("ix_auction_category_status_current_price", "category_id", "status", "current_price"),
+        Index("ix_auction_region_status_bid_count", "region_id", "status", "bid_count"),
+        Index("ix_auction_region_status_current_price", "region_id", "status", "current_price"),
+    )
 
 class Bid(Base):
     __tablename__ = "bid"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    auction_id: Mapped[str] = mapped_column(String(36), ForeignKey("auction.id", ondelete="CASCADE"), nullable=False, index=True)
-    bidder_id: Mapped[str] = mapped_column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    auction_id: Mapped[str] = mapped_column(String(36), ForeignKey("auction.id", ondelete="CASCADE"), nullable=False)
+    bidder_id: Mapped[str] = mapped_column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
 
     bid_price: Mapped[int] = mapped_column(Integer, nullable=False)         # 입찰가
     bid_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())  # 입찰 시간
 
-    auction: Mapped["Auction"] = relationship("Auction", back_populates="bids")
-    bidder: Mapped["User"] = relationship("User")
\ No newline at end of file
+    auction: Mapped["Auction"] = relationship("Auction", back_populates="bids", foreign_keys=[auction_id])
+    bidder: Mapped["User"] = relationship("User")
+
+    __table_args__ = (
+        # 경매별 최근 입찰 조회용 (auction_id 단독 인덱스 대체)
+        Index("ix_bid_auction_id_bid_at", "auction_id", "bid_at"),
+        # 내 입찰 집계용 커버링 인덱스 (bidder_id 단독 인덱스 대체)
+        Index("ix_bid_bidder_id_auction_id_bid_price", "bidder_id", "auction_id", "bid_price"),
+    )
\ No newline at end of file
@@ -1,12 +1,13 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
+from sqlalchemy import RowMapping, case, select, update, func, tuple_
 from sqlalchemy.orm import selectinload, joinedload, contains_eager
 from datetime import datetime
 from fastapi import Depends
 
 from carrot.app.auction.models import Auction, Bid, AuctionStatus
+from carrot.app.auction.schemas import AuctionSort
 from carrot.app.product.models import Product
 from carrot.db.connection import get_db_session
 
@@ -16,6 +17,14 @@ from carrot.app.auction.exceptions import (
     NotAllowedActionError
 )
 
+# 정렬 기준 -> (정렬 컬럼, 내림차순 여부). 동점은 id로 구분
+AUCTION_SORT_COLUMNS = {
+    AuctionSort.ENDING_SOON: (Auction.end_at, False),
+    AuctionSort.MOST_BIDS: (Auction.bid_count, True),
+    AuctionSort.PRICE_ASC: (Auction.current_price, False),
+    AuctionSort.PRICE_DESC: (Auction.current_price, True),
+}
+
 class AuctionRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -26,6 +35,8 @@ class AuctionRepository:
         await self.session.flush()  # Ensure product ID is generated
 
         auction.product_id = product.id
+        auction.category_id = product.category_id
+        auction.region_id = product.region_id
         self.session.add(auction)
         
         await self.session.commit()
@@ -54,28 +65,125 @@ class AuctionRepository:
 
     async def get_active_auctions(
         self,
+        now: datetime,
+        sort: AuctionSort,
+        limit: int,
+        after: Optional[tuple[Any, str]] = None,
         category_id: Optional[str] = None,
         region_id: Optional[str] = None,
     ) -> List[Auction]:
+        column, descending = AUCTION_SORT_COLUMNS[sort]
         stmt = (
             select(Auction)
-            .where(Auction.status == AuctionStatus.ACTIVE)
+            .where(Auction.status == AuctionStatus.ACTIVE, Auction.end_at > now)
             .options(selectinload(Auction.product))
-            .order_by(Auction.end_at.asc())
+            .limit(limit)
         )
 
-        # ✅ 필터가 있을 때만 join 한 번
-        if category_id or region_id:
-            stmt = stmt.join(Auction.product)
+        # 비정규화된 컬럼으로 필터링하므로 product join 없이 (필터, status, 정렬 키) 인덱스 사용
+        if category_id:
+            stmt = stmt.where(Auction.category_id == category_id)
+        if region_id:
+            stmt = stmt.where(Auction.region_id == region_id)
+
+        # keyset: 이전 페이지 마지막 항목의 (정렬 키, id) 다음부터
+        if after is not None:
+            key = tuple_(column, Auction.id)
+            stmt = stmt.where(key < tuple_(*after) if descending else key > tuple_(*after))
 
-            if category_id:
-                stmt = stmt.where(Product.category_id == category_id)
+        if descending:
+            stmt = stmt.order_by(column.desc(), Auction.id.desc())
+        else:
+            stmt = stmt.order_by(column.asc(), Auction.id.asc())
 
-            if region_id:
-                stmt = stmt.where(Product.region_id == region_id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
 
+    async def get_auction_for_bid(self, auction_id: str) -> Optional[Auction]:
+        # 입찰은 경매 행 잠금 -> 입찰자/직전 최고 입찰자 잠금 순서로 진행
+        # 경매 행을 먼저 잡으므로 같은 경매의 입찰은 직렬화되고, 유저 잠금 순서가 뒤섞이지 않음
+        stmt = (
+            select(Auction)
+            .where(Auction.id == auction_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return await self.session.scalar(stmt)
+
+    async def get_recent_bids(self, auction_id: str, limit: int) -> List[Bid]:
+        stmt = (
+            select(Bid)
+            .where(Bid.auction_id == auction_id)
+            .order_by(Bid.bid_at.desc(), Bid.id.desc())
+            .limit(limit)
+        )
         result = await self.session.execute(stmt)
-        return result.scalars().unique().all()
+        return list(result.scalars().all())
+
+    async def get_active_deadlines(self) -> list[tuple[str, datetime]]:
+        result = await self.session.execute(
+            select(Auction.id, Auction.end_at).where(Auction.status == AuctionStatus.ACTIVE)
+        )
+        return list(result.tuples().all())
+
+    async def get_active_ids(self, auction_ids: list[str]) -> set[str]:
+        result = await self.session.scalars(
+            select(Auction.id).where(Auction.id.in_(auction_ids), Auction.status == AuctionStatus.ACTIVE)
+        )
+        return set(result.all())
+
+    async def claim_expired_auctions(
+        self,
+        now: datetime,
+        limit: int,
+        auction_ids: list[str] | None = None,
+        exclude_ids: list[str] | None = None,
+    ) -> List[Auction]:
+        # SKIP LOCKED: 여러 워커가 동시에 종료 처리를 돌려도 같은 경매를 중복 처리하지 않음
+        stmt = (
+            select(Auction)
+            .where(Auction.status == AuctionStatus.ACTIVE, Auction.end_at <= now)
+            .order_by(Auction.end_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if auction_ids is not None:
+            stmt = stmt.where(Auction.id.in_(auction_ids))
+        if exclude_ids:
+            stmt = stmt.where(Auction.id.not_in(exclude_ids))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_winning_bids(self, auction_ids: list[str]) -> dict[str, Bid]:
+        # 입찰가는 항상 current_price보다 커야 하므로 current_price와 같은 입찰이 최고 입찰
+        stmt = (
+            select(Bid)
+            .join(Auction, Auction.id == Bid.auction_id)
+            .where(Bid.auction_id.in_(auction_ids), Bid.bid_price == Auction.current_price)
+            .order_by(Bid.bid_at)
+        )
+        result = await self.session.execute(stmt)
+        return {bid.auction_id: bid for bid in result.scalars().all()}
+
+    async def finalize_auctions(self, values: list[dict]) -> None:
+        # PK 기준 bulk UPDATE (executemany)
+        await self.session.execute(update(Auction), values)
+
+    async def get_product_owners(self, product_ids: list[str]) -> dict[str, str]:
+        result = await self.session.execute(
+            select(Product.id, Product.owner_id).where(Product.id.in_(product_ids))
+        )
+        return dict(result.tuples().all())
+
+    async def mark_products_sold(self, product_ids: list[str]) -> None:
+        if not product_ids:
+            return
+        await self.session.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids))
+            .values(is_sold=True)
+            .execution_options(synchronize_session=False)
+        )
 
     async def delete_auction(self, auction: Auction) -> None:
         await self.session.delete(auction)
@@ -106,13 +214,47 @@ class AuctionRepository:
         await self.session.refresh(merged)
         return merged
 
-    async def gets_user_bids(self, user_id: str) -> List[Bid]:
+    async def get_user_auction_summaries(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[tuple[datetime, str]] = None,
+        status: Optional[AuctionStatus] = None,
+    ) -> list[RowMapping]:
+        # 입찰 행을 모두 가져오지 않고 경매당 한 행으로 집계
+        # (bidder_id, auction_id, bid_price) 인덱스만으로 GROUP BY/MAX/COUNT 처리
+        my_max_bid = func.max(Bid.bid_price)
         stmt = (
-            select(Bid)
+            select(
+                Auction.id.label("auction_id"),
+                Auction.product_id,
+                Product.title,
+                Auction.current_price,
+                Auction.bid_count,
+                Auction.end_at,
+                Auction.status,
+                my_max_bid.label("my_max_bid"),
+                func.count().label("my_bid_count"),
+                # 예치 도입 전 경매는 leading_bidder_id가 없으므로 최고가로 판단
+                case(
+                    (Auction.leading_bidder_id.is_not(None), Auction.leading_bidder_id == user_id),
+                    else_=my_max_bid == Auction.current_price,
+                ).label("is_winning"),
+            )
+            .select_from(Bid)
+            .join(Auction, Auction.id == Bid.auction_id)
+            .join(Product, Product.id == Auction.product_id)
             .where(Bid.bidder_id == user_id)
-            .options(joinedload(Bid.auction).joinedload(Auction.product))
+            .group_by(Auction.id, Product.id)
+            .order_by(Auction.end_at.desc(), Auction.id.desc())
+            .limit(limit)
         )
+        if status is not None:
+            stmt = stmt.where(Auction.status == status)
+        if after is not None:
+            stmt = stmt.where(tuple_(Auction.end_at, Auction.id) < tuple_(*after))
+
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return list(result.mappings().all())
 
     
\ No newline at end of file
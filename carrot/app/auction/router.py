@@ -1,12 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Annotated
+from typing import Optional, Annotated
 
-from carrot.db.connection import get_db_session
-from carrot.app.auth.utils import login_with_header
+from carrot.db.connection import db, get_db_session
+from carrot.db.transaction import run_in_transaction
+from carrot.app.auth.utils import login_with_header, login_with_header_detached
 
 from carrot.app.auction.services import AuctionService
-from carrot.app.auction.schemas import AuctionListResponse, AuctionResponse, BidCreate, BidResponse # Pydantic 모델 가정
+from carrot.app.auction.repositories import AuctionRepository
+from carrot.app.auction.exceptions import AuctionNotFoundError
+from carrot.app.auction.live import auction_live
+from carrot.app.auction.schemas import (
+    AuctionDetailResponse,
+    AuctionListPageResponse,
+    AuctionListResponse,
+    AuctionResponse,
+    AuctionSort,
+    AuctionStatus,
+    BidCreate,
+    BidResponse,
+    MyAuctionPageResponse,
+    MyAuctionResponse,
+)
 
 from carrot.app.user.models import User
 
@@ -30,38 +45,88 @@ auction_router = APIRouter()
 #     )
 #     return AuctionResponse.model_validate(auction)
 
-# 2. 경매 목록 조회 (카테고리, 지역 필터링)
-@auction_router.get("/", response_model=List[AuctionListResponse])
+# 2. 경매 목록 조회 (카테고리, 지역 필터링 + 정렬, keyset 페이지네이션)
+@auction_router.get("/", response_model=AuctionListPageResponse)
 async def get_auctions(
     service: Annotated[AuctionService, Depends(AuctionService.create)],
     category_id: Optional[str] = Query(None, description="카테고리 ID로 필터링"),
     region_id: Optional[str] = Query(None, description="지역 ID로 필터링"),
-) -> List[AuctionListResponse]:
-    auctions = await service.list_auctions(category_id, region_id)
-    return [AuctionListResponse.model_validate(a) for a in auctions]
+    sort: AuctionSort = Query(AuctionSort.ENDING_SOON, description="정렬 기준"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=100),
+) -> AuctionListPageResponse:
+    auctions, next_cursor = await service.list_auctions(sort, limit, cursor, category_id, region_id)
+    return AuctionListPageResponse(
+        items=[AuctionListResponse.model_validate(a) for a in auctions],
+        next_cursor=next_cursor,
+    )
 
-# # 3. 경매 상세 조회
-# @auction_router.get("/{auction_id}", response_model=AuctionResponse)
-# async def get_auction_detail(
-#     auction_id: str,
-#     service: Annotated[AuctionService, Depends(AuctionService.create)],
-# ) -> AuctionResponse:
-#     auction = await service.get_auction_details(auction_id)
-#     return AuctionResponse.model_validate(auction)
+# 내가 입찰한 경매 (경매당 한 행으로 집계). /{auction_id}보다 먼저 등록되어야 함
+@auction_router.get("/me", response_model=MyAuctionPageResponse)
+async def get_my_auctions(
+    user: Annotated[User, Depends(login_with_header)],
+    service: Annotated[AuctionService, Depends(AuctionService.create)],
+    status: Optional[AuctionStatus] = Query(None, description="경매 상태로 필터링"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(20, ge=1, le=100),
+) -> MyAuctionPageResponse:
+    rows, next_cursor = await service.list_my_auctions(user.id, limit, cursor, status)
+    return MyAuctionPageResponse(
+        items=[MyAuctionResponse.model_validate(dict(row)) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+# 3. 경매 상세 조회 (최근 입찰 포함)
+@auction_router.get("/{auction_id}", response_model=AuctionDetailResponse)
+async def get_auction_detail(
+    auction_id: str,
+    service: Annotated[AuctionService, Depends(AuctionService.create)],
+) -> AuctionDetailResponse:
+    auction, recent_bids = await service.get_auction_details(auction_id)
+    return AuctionDetailResponse.model_validate(auction).model_copy(
+        update={"recent_bids": recent_bids}
+    )
 
 # 4. 입찰하기
 @auction_router.post("/{auction_id}/bids", response_model=BidResponse)
 async def place_bid(
     auction_id: str,
     bid_data: BidCreate,
-    bidder: Annotated[User, Depends(login_with_header)],
-    service: Annotated[AuctionService, Depends(AuctionService.create)],
+    bidder: Annotated[User, Depends(login_with_header_detached)],
 ) -> BidResponse:
 
-    bid = await service.place_bid(
-        auction_id=auction_id,
-        bidder_id=bidder.id,
-        bid_price=bid_data.bid_price
+    bid = await run_in_transaction(
+        "auction.place_bid",
+        lambda session: AuctionService.create(session).place_bid(
+            auction_id=auction_id,
+            bidder_id=bidder.id,
+            bid_price=bid_data.bid_price
+        ),
     )
 
-    return BidResponse.model_validate(bid)
\ No newline at end of file
+    return BidResponse.model_validate(bid)
+
+# 5. 실시간 경매 구독 (현재가, 입찰 수, 남은 시간)
+@auction_router.websocket("/ws/{auction_id}")
+async def auction_websocket(websocket: WebSocket, auction_id: str):
+    # 소켓이 열려 있는 동안 DB 커넥션을 잡고 있지 않도록 첫 상태만 짧게 조회
+    async with db.session_factory() as session:
+        try:
+            auction = await AuctionRepository(session).get_auction_by_id(auction_id)
+        except AuctionNotFoundError:
+            auction = None
+
+    await websocket.accept()
+    if auction is None:
+        await websocket.close(code=4004)
+        return
+
+    await auction_live.subscribe(websocket, auction)
+    try:
+        # 클라이언트가 보내는 메시지는 없음. 연결 종료 감지용
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        auction_live.unsubscribe(websocket, auction_id)
@@ -0,0 +1,229 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from carrot.db.connection import db
+from carrot.app.auction.models import Auction, AuctionStatus
+from carrot.app.auction.repositories import AuctionRepository
+from carrot.app.auction.live import auction_live
+from carrot.app.auction.utils import utcnow
+from carrot.app.pay.repositories import PayRepository
+from carrot.app.pay.services import PayService
+from carrot.app.product.cache import product_cache
+from carrot.app.user.repositories import UserRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+CLOSE_BATCH_SIZE = 100
+# 다른 워커에서 생성/연장된 경매도 이 주기 안에는 종료되도록 DB를 다시 확인
+RESYNC_INTERVAL_SECONDS = 60.0
+# 따로 종료해도 실패한 경매는 지수 백오프로 미뤄서 뒤의 경매가 계속 종료되도록 함
+BASE_RETRY_SECONDS = 10
+MAX_RETRY_SECONDS = 60 * 60
+
+
+def _normalize(end_at: datetime) -> datetime:
+    if end_at.tzinfo is not None:
+        end_at = end_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return end_at
+
+
+class AuctionCloseScheduler:
+    """종료 시각(end_at)의 min-heap으로 만료된 경매를 제때 종료 처리하는 백그라운드 작업
+
+    heap은 언제 DB를 확인할지만 결정하고, 실제 종료 대상은 DB에서 SKIP LOCKED로 가져오므로
+    여러 워커가 동시에 돌아도 같은 경매를 두 번 처리하지 않음
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, str]] = []
+        # auction_id -> 현재 유효한 end_at. heap에 남은 예전 항목은 꺼낼 때 버림 (lazy deletion)
+        self._deadlines: dict[str, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        # auction_id -> (연속 실패 횟수, 다음 재시도 시각). 이 시각 전에는 종료 대상에서 뺌
+        self._failures: dict[str, tuple[int, datetime]] = {}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, auction_id: str, end_at: datetime) -> None:
+        """새 경매 등록 또는 종료 시각 변경. O(log n)"""
+        end_at = _normalize(end_at)
+        self._deadlines[auction_id] = end_at
+        heapq.heappush(self._heap, (end_at, auction_id))
+        if self._heap[0] == (end_at, auction_id):
+            self._wakeup.set()
+
+    def _next_deadline(self) -> datetime | None:
+        while self._heap:
+            end_at, auction_id = self._heap[0]
+            if self._deadlines.get(auction_id) == end_at:
+                return end_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> list[str]:
+        due = []
+        while (deadline := self._next_deadline()) is not None and deadline <= now:
+            _, auction_id = heapq.heappop(self._heap)
+            del self._deadlines[auction_id]
+            due.append(auction_id)
+        return due
+
+    async def rebuild(self) -> None:
+        async with db.session_factory() as session:
+            deadlines = await AuctionRepository(session).get_active_deadlines()
+        self._deadlines = {auction_id: _normalize(end_at) for auction_id, end_at in deadlines}
+        self._heap = [(end_at, auction_id) for auction_id, end_at in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+    async def close_expired(self) -> int:
+        closed = 0
+        while True:
+            claimed, auctions = await self.process_batch()
+            for auction in auctions:
+                self._deadlines.pop(auction.id, None)
+            closed += len(auctions)
+            if claimed < CLOSE_BATCH_SIZE:
+                return closed
+
+    async def prune_failures(self) -> None:
+        """다른 워커가 종료했거나 취소된 경매의 백오프 기록을 지움"""
+        if not self._failures:
+            return
+        async with db.session_factory() as session:
+            active = await AuctionRepository(session).get_active_ids(list(self._failures))
+        for auction_id in self._failures.keys() - active:
+            del self._failures[auction_id]
+
+    def _retrying_ids(self, now: datetime) -> list[str]:
+        return [auction_id for auction_id, (_, retry_at) in self._failures.items() if retry_at > now]
+
+    async def process_batch(self) -> tuple[int, list[Auction]]:
+        """만료된 경매를 한 트랜잭션으로 종료. (가져온 경매 수, 종료된 경매)"""
+        now = utcnow()
+        auctions: list[Auction] = []
+        try:
+            async with db.session_factory() as session:
+                auctions = await AuctionRepository(session).claim_expired_auctions(
+                    now, CLOSE_BATCH_SIZE, exclude_ids=self._retrying_ids(now)
+                )
+                if not auctions:
+                    return 0, []
+                statuses = await self._close(session, auctions)
+                await session.commit()
+        except Exception:
+            if not auctions:
+                raise
+            # 한 경매의 실패로 배치 전체가 롤백됨 -> 경매마다 따로 종료해서 나머지는 닫히도록 함
+            logger.exception(f"auction close batch of {len(auctions)} failed, closing one by one")
+            return len(auctions), await self._close_each([auction.id for auction in auctions])
+
+        self._publish(auctions, statuses)
+        return len(auctions), auctions
+
+    async def _close_each(self, auction_ids: list[str]) -> list[Auction]:
+        closed = []
+        for auction_id in auction_ids:
+            now = utcnow()
+            try:
+                async with db.session_factory() as session:
+                    auctions = await AuctionRepository(session).claim_expired_auctions(
+                        now, 1, auction_ids=[auction_id]
+                    )
+                    if not auctions:
+                        # 그 사이 다른 워커가 종료함
+                        continue
+                    statuses = await self._close(session, auctions)
+                    await session.commit()
+            except Exception:
+                attempts = self._failures.get(auction_id, (0, now))[0] + 1
+                delay = min(BASE_RETRY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_SECONDS)
+                self._failures[auction_id] = (attempts, now + timedelta(seconds=delay))
+                logger.exception(f"failed to close auction {auction_id} ({attempts} attempts), retrying in {delay}s")
+                continue
+
+            self._failures.pop(auction_id, None)
+            self._publish(auctions, statuses)
+            closed.extend(auctions)
+        return closed
+
+    async def _close(self, session: AsyncSession, auctions: list[Auction]) -> dict[str, AuctionStatus]:
+        repository = AuctionRepository(session)
+        pay_service = PayService(PayRepository(session), UserRepository(session), session)
+
+        winning_bids = await repository.get_winning_bids([a.id for a in auctions])
+        statuses = {
+            auction.id: AuctionStatus.FINISHED if auction.id in winning_bids else AuctionStatus.FAILED
+            for auction in auctions
+        }
+        await repository.finalize_auctions([
+            {
+                "id": auction.id,
+                "status": statuses[auction.id],
+                "winning_bid_id": winning_bids[auction.id].id if auction.id in winning_bids else None,
+            }
+            for auction in auctions
+        ])
+        won = [auction for auction in auctions if auction.id in winning_bids]
+        await repository.mark_products_sold([auction.product_id for auction in won])
+
+        # 최고 입찰자의 예치금을 판매자에게 지급 (예치 없이 입찰된 기존 경매는 leading_bidder_id가 없음)
+        owners = await repository.get_product_owners([auction.product_id for auction in won])
+        await pay_service.settle_auctions([
+            (auction.id, auction.leading_bidder_id, owners[auction.product_id], auction.current_price)
+            for auction in won
+            if auction.leading_bidder_id is not None
+        ])
+        return statuses
+
+    def _publish(self, auctions: list[Auction], statuses: dict[str, AuctionStatus]) -> None:
+        for auction in auctions:
+            product_cache.invalidate_detail(auction.product_id)
+            auction_live.publish(auction, statuses[auction.id])
+
+    async def _run(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception:
+            logger.exception("failed to rebuild auction deadlines")
+
+        while True:
+            deadline = self._next_deadline()
+            timeout = RESYNC_INTERVAL_SECONDS
+            if deadline is not None:
+                timeout = min(max((deadline - utcnow()).total_seconds(), 0.0), timeout)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                self._wakeup.clear()
+                # 더 이른 종료 시각이 등록됨 -> 대기 시간 다시 계산
+                if not self._pop_due(utcnow()):
+                    continue
+            except asyncio.TimeoutError:
+                self._pop_due(utcnow())
+                try:
+                    await self.prune_failures()
+                except Exception:
+                    logger.exception("failed to prune auction close failures")
+
+            try:
+                await self.close_expired()
+            except Exception:
+                logger.exception("auction close batch failed")
+
+
+auction_close_scheduler = AuctionCloseScheduler()
@@ -12,6 +12,13 @@ class AuctionStatus(str, Enum):
     FAILED = "failed"
     CANCELED = "canceled"
 
+# 경매 목록 정렬 기준
+class AuctionSort(str, Enum):
+    ENDING_SOON = "ending_soon"
+    MOST_BIDS = "most_bids"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+
 class AuctionCreate(BaseModel):
     # starting_price: int = Field(..., gt=0, description="경매 시작 가격")
     end_at: datetime = Field(..., description="경매 종료 시간")
@@ -28,13 +35,15 @@ class AuctionCreate(BaseModel):
         
         if v <= current_time:
             raise ValueError("경매 종료 시간은 현재 시간보다 미래여야 합니다.")
-        return v
+        # DB에는 tz 정보 없이 저장되므로 UTC로 맞춰 둠
+        return v.astimezone(timezone.utc)
     
 class AuctionProductSummary(BaseModel):
     id: str
     owner_id: str
     title: str
     image_ids: List[str]
+    thumbnail_url: str | None = None
     content: str | None
     price: int
     like_count: int
@@ -58,6 +67,10 @@ class AuctionListResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AuctionListPageResponse(BaseModel):
+    items: List[AuctionListResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지가 없으면 null
+
 class AuctionResponse(BaseModel):
     id: str
     product_id: str
@@ -82,3 +95,22 @@ class BidResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AuctionDetailResponse(AuctionResponse):
+    product: AuctionProductSummary
+    recent_bids: List[BidResponse] = []  # 최신순 최근 입찰
+
+class MyAuctionResponse(BaseModel):
+    auction_id: str
+    product_id: str
+    title: str
+    current_price: int
+    bid_count: int
+    end_at: datetime
+    status: AuctionStatus
+    my_max_bid: int       # 내 최고 입찰가
+    my_bid_count: int     # 내 입찰 횟수
+    is_winning: bool      # 현재 최고 입찰자인지 (종료된 경매면 낙찰 여부)
+
+class MyAuctionPageResponse(BaseModel):
+    items: List[MyAuctionResponse]
+    next_cursor: Optional[str] = None
@@ -1,4 +1,5 @@
-from datetime import datetime, timezone
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import List, Annotated
 
 from fastapi import Depends
@@ -6,8 +7,15 @@ from sqlalchemy import select
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from carrot.app.auction.models import Auction, AuctionStatus, Bid
-from carrot.app.auction.schemas import AuctionCreate
-from carrot.app.auction.repositories import AuctionRepository
+from carrot.app.auction.schemas import AuctionCreate, AuctionSort, BidResponse
+from carrot.app.auction.cache import RECENT_BIDS_SIZE, recent_bid_cache
+from carrot.app.auction.repositories import AUCTION_SORT_COLUMNS, AuctionRepository
+from carrot.common.exceptions import InvalidCursorException
+from carrot.common.pagination import decode_cursor, encode_cursor
+from carrot.app.auction.utils import utcnow
+from carrot.app.auction.live import auction_live
+from carrot.app.auction.scheduler import auction_close_scheduler
+from carrot.app.auction.settings import AUCTION_SETTINGS
 from carrot.db.connection import get_db_session
 
 from carrot.app.auction.exceptions import (
@@ -17,23 +25,30 @@ from carrot.app.auction.exceptions import (
 )
 
 from carrot.app.product.models import Product
+from carrot.app.product.cache import product_cache
 from carrot.app.product.schemas import ProductPostRequest
+from carrot.app.pay.repositories import PayRepository
+from carrot.app.pay.services import PayService
+from carrot.app.user.repositories import UserRepository
 
 class AuctionService:
     def __init__(
         self, 
         repository: AuctionRepository, 
-        db_session: AsyncSession
+        db_session: AsyncSession,
+        pay_service: PayService,
     ) -> None:
         self.repository = repository
         self.db_session = db_session
+        self.pay_service = pay_service
 
     @classmethod
     def create(cls, db_session: Annotated[AsyncSession, Depends(get_db_session)]) -> "AuctionService":
         """세션을 공유하는 서비스 인스턴스 생성"""
         return cls(
             repository=AuctionRepository(db_session),
-            db_session=db_session
+            db_session=db_session,
+            pay_service=PayService(PayRepository(db_session), UserRepository(db_session), db_session),
         )
 
     async def create_auction_with_product(self, owner_id: str, region_id: str, product_data: ProductPostRequest, auction_data: AuctionCreate) -> Auction:
@@ -59,34 +74,124 @@ class AuctionService:
     async def update_auction(self, auction: Auction) -> Auction:
         return await self.repository.update_auction(auction)
 
-    async def list_auctions(self, category_id: str | None = None, region_id: str | None = None) -> List[Auction]:
-        return await self.repository.get_active_auctions(category_id, region_id)
+    async def list_auctions(
+        self,
+        sort: AuctionSort,
+        limit: int,
+        cursor: str | None = None,
+        category_id: str | None = None,
+        region_id: str | None = None,
+    ) -> tuple[List[Auction], str | None]:
+        after = None
+        if cursor is not None:
+            after = self._parse_cursor(sort, decode_cursor(cursor, sort.value))
+
+        # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+        auctions = await self.repository.get_active_auctions(
+            utcnow(), sort, limit + 1, after, category_id, region_id
+        )
+        if len(auctions) <= limit:
+            return auctions, None
+
+        auctions = auctions[:limit]
+        last = auctions[-1]
+        column, _ = AUCTION_SORT_COLUMNS[sort]
+        value = getattr(last, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return auctions, encode_cursor(sort.value, [value, last.id])
+
+    @staticmethod
+    def _parse_cursor(sort: AuctionSort, values: list) -> tuple:
+        if len(values) != 2 or not isinstance(values[1], str):
+            raise InvalidCursorException()
+        value = values[0]
+        try:
+            if sort == AuctionSort.ENDING_SOON:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, int):
+                raise InvalidCursorException()
+        except (TypeError, ValueError):
+            raise InvalidCursorException()
+        return value, values[1]
     
-    async def get_auction_details(self, auction_id: str) -> Auction:
-        return await self.repository.get_auction_by_id(auction_id)
+    async def list_my_auctions(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: str | None = None,
+        status: AuctionStatus | None = None,
+    ) -> tuple[list, str | None]:
+        after = None
+        if cursor is not None:
+            values = decode_cursor(cursor, "my_auctions")
+            after = self._parse_cursor(AuctionSort.ENDING_SOON, values)
+
+        rows = await self.repository.get_user_auction_summaries(user_id, limit + 1, after, status)
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor("my_auctions", [last["end_at"].isoformat(), last["auction_id"]])
+
+    async def get_auction_details(self, auction_id: str) -> tuple[Auction, List[BidResponse]]:
+        auction = await self.repository.get_auction_by_id(auction_id)
+
+        recent_bids = recent_bid_cache.get(auction.id, auction.bid_count)
+        if recent_bids is None:
+            # 같은 트랜잭션 안의 두 SELECT는 같은 스냅샷(REPEATABLE READ)을 보므로 bid_count와 입찰 목록이 일치함
+            bids = await self.repository.get_recent_bids(auction.id, RECENT_BIDS_SIZE)
+            recent_bids = [BidResponse.model_validate(bid) for bid in bids]
+            recent_bid_cache.fill(auction.id, recent_bids, auction.bid_count)
+        return auction, recent_bids
     
     async def place_bid(self, auction_id: str, bidder_id: str, bid_price: int) -> Bid:
-        auction = await self.repository.get_auction_by_id(auction_id)
-        
-        if auction.status != AuctionStatus.ACTIVE:
-            raise NotAllowedActionError()
-        if auction.end_at <= datetime.now():
-            raise NotAllowedActionError()
-        if bid_price <= auction.current_price:
+        now = utcnow()
+
+        # 경매 행 잠금 -> 유저 잠금(id 순) 순서 고정. 입찰 한 번에 실행되는 문장 수도 고정
+        # (SELECT 경매, SELECT 유저, UPDATE 경매, UPDATE 유저, INSERT 입찰, INSERT 원장)
+        auction = await self.repository.get_auction_for_bid(auction_id)
+        if auction is None:
+            raise AuctionNotFoundError()
+        if (
+            auction.status != AuctionStatus.ACTIVE
+            or auction.end_at <= now
+            or bid_price <= auction.current_price
+        ):
             raise NotAllowedActionError()
 
         new_bid = Bid(
+            id=str(uuid.uuid4()),
             auction_id=auction_id,
             bidder_id=bidder_id,
-            bid_price=bid_price
+            bid_price=bid_price,
+            bid_at=now,
+        )
+        await self.pay_service.hold_for_bid(
+            bid_id=new_bid.id,
+            auction_id=auction_id,
+            bidder_id=bidder_id,
+            amount=bid_price,
+            outbid_user_id=auction.leading_bidder_id,
+            outbid_amount=auction.current_price,
         )
-        await self.repository.add_bid_without_commit(new_bid)
 
         auction.current_price = bid_price
         auction.bid_count += 1
-        await self.repository.update_auction_without_commit(auction)
+        auction.leading_bidder_id = bidder_id
+        # soft close: 마감 직전 입찰이면 종료 시각 연장 (같은 UPDATE로 반영됨)
+        extended = (auction.end_at - now).total_seconds() <= AUCTION_SETTINGS.SOFT_CLOSE_WINDOW_SECONDS
+        if extended:
+            auction.end_at += timedelta(seconds=AUCTION_SETTINGS.SOFT_CLOSE_EXTENSION_SECONDS)
+        await self.repository.add_bid_without_commit(new_bid)
 
         await self.db_session.commit()
-        await self.db_session.refresh(new_bid)
-        await self.db_session.refresh(auction)
-        return new_bid
\ No newline at end of file
+        # 상품 상세 응답에 경매 현재가가 포함되므로 캐시 무효화 (경매 상품은 목록에 나오지 않음)
+        product_cache.invalidate_detail(auction.product_id)
+        recent_bid_cache.push(auction.id, BidResponse.model_validate(new_bid), auction.bid_count)
+        if extended:
+            auction_close_scheduler.schedule(auction.id, auction.end_at)
+        # 연장된 end_at도 같은 프레임으로 구독자에게 전달됨
+        auction_live.publish(auction)
+        return new_bid
@@ -0,0 +1,15 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from carrot.settings import SETTINGS
+
+
+class AuctionSettings(BaseSettings):
+    # soft close: 종료 WINDOW초 이내에 입찰이 들어오면 종료 시각을 EXTENSION초 연장
+    SOFT_CLOSE_WINDOW_SECONDS: int = 60
+    SOFT_CLOSE_EXTENSION_SECONDS: int = 60
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False, env_prefix="AUCTION_", env_file=SETTINGS.env_file, extra="ignore"
+    )
+
+
+AUCTION_SETTINGS = AuctionSettings()
@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """end_at과 같은 기준(UTC, tzinfo 없음)의 현재 시각"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -8,9 +8,11 @@ from authlib.jose import jwt, JWTClaims
 from authlib.jose.errors import JoseError
 
 from carrot.app.user.exceptions import OnboardingException
-from carrot.app.user.models import UserStatus
+from carrot.app.user.models import User, UserStatus
+from carrot.app.user.repositories import UserRepository
 from carrot.app.user.services import UserService
 from carrot.app.auth.settings import AUTH_SETTINGS
+from carrot.db.connection import db
 from carrot.app.auth.exceptions import (
     BadAuthorizationHeaderException,
     UnauthenticatedException,
@@ -80,6 +82,19 @@ async def login_with_header(
     return user
 
 
+async def login_with_header_detached(
+    authorization: Annotated[str | None, Header()] = None,
+) -> User:
+    """login_with_header와 같지만 짧은 세션으로 유저를 읽고 커넥션을 바로 반납
+
+    run_in_transaction으로 자기 세션을 여는 엔드포인트용. 요청 세션이 커넥션을 쥔 채로
+    두 번째 커넥션을 기다리면, 동시 요청이 많을 때 풀을 나눠 가진 채 서로 기다리다 pool timeout이 남
+    반환된 User는 세션에서 분리되어 있으므로 관계를 지연 로딩할 수 없음
+    """
+    async with db.session_factory() as session:
+        return await login_with_header(UserService(UserRepository(session)), authorization)
+
+
 async def partial_login_with_header(
     user_service: Annotated[UserService, Depends()],
     authorization: Annotated[str | None, Header()] = None,
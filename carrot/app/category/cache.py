@@ -0,0 +1,53 @@
+import asyncio
+import logging
+import time
+
+from carrot.db.connection import db
+from carrot.app.category.models import Category
+from carrot.app.category.repositories import CategoryRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+# 카테고리는 마이그레이션/관리자만 바꾸는 참조 데이터. 이 주기가 지나면 백그라운드에서 다시 읽음
+REFRESH_INTERVAL_SECONDS = 10 * 60
+
+
+class CategoryCache:
+    """프로세스 전역 카테고리 목록 캐시. 시작 시 로드하고, 주기가 지나면 백그라운드에서 다시 로드"""
+
+    def __init__(self) -> None:
+        self._categories: tuple[Category, ...] | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    def _is_fresh(self) -> bool:
+        return self._categories is not None and self._loaded_at + REFRESH_INTERVAL_SECONDS > time.monotonic()
+
+    async def load(self) -> tuple[Category, ...]:
+        async with self._lock:
+            # 동시에 여러 요청이 로드를 시작해도 DB 조회는 한 번만
+            if self._is_fresh():
+                return self._categories
+            async with db.session_factory() as session:
+                categories = await CategoryRepository(session).get_all_categories()
+            self._categories = tuple(categories)
+            self._loaded_at = time.monotonic()
+            return self._categories
+
+    async def get_all(self) -> tuple[Category, ...]:
+        if self._categories is None:
+            return await self.load()
+        if not self._is_fresh() and (self._refresh_task is None or self._refresh_task.done()):
+            # 만료돼도 요청은 기존 목록으로 바로 응답하고 다시 읽기는 백그라운드에서
+            self._refresh_task = asyncio.create_task(self._reload())
+        return self._categories
+
+    async def _reload(self) -> None:
+        try:
+            await self.load()
+        except Exception:
+            logger.exception("failed to reload categories")
+
+
+category_cache = CategoryCache()
@@ -7,4 +7,13 @@ class Category(Base):
     __tablename__ = "category"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    name: Mapped[str] = mapped_column(String(20), unique=True, index=True)
\ No newline at end of file
+    name: Mapped[str] = mapped_column(String(20), unique=True, index=True)
+
+
+# 지역별 카테고리 상품 수 집계 (CategoryFacetRefresher가 주기적으로 다시 계산)
+class CategoryProductCount(Base):
+    __tablename__ = "category_product_count"
+
+    region_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    category_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    product_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
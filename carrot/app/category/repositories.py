@@ -0,0 +1,51 @@
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from carrot.app.category.models import Category, CategoryProductCount
+from carrot.app.product.models import Product
+from carrot.app.auction.models import Auction
+
+
+class CategoryRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_all_categories(self) -> list[Category]:
+        result = await self.session.scalars(select(Category).order_by(Category.name))
+        return list(result.all())
+
+    async def get_product_counts(self, region_id: str | None) -> dict[str, int]:
+        if region_id:
+            # PK (region_id, category_id) 범위 스캔
+            query = select(
+                CategoryProductCount.category_id, CategoryProductCount.product_count
+            ).where(CategoryProductCount.region_id == region_id)
+        else:
+            # 집계 테이블 자체가 작으므로 합산 비용이 낮음
+            query = select(
+                CategoryProductCount.category_id,
+                func.sum(CategoryProductCount.product_count),
+            ).group_by(CategoryProductCount.category_id)
+
+        result = await self.session.execute(query)
+        return {category_id: int(count) for category_id, count in result.tuples()}
+
+    async def refresh_product_counts(self) -> None:
+        # 목록 API와 같은 기준(경매 상품 제외)으로 지역 x 카테고리 상품 수를 다시 계산
+        counts = (
+            select(
+                Product.region_id,
+                Product.category_id,
+                func.count(Product.id),
+            )
+            .select_from(Product)
+            .outerjoin(Auction, Auction.product_id == Product.id)
+            .where(Auction.id == None)
+            .group_by(Product.region_id, Product.category_id)
+        )
+        await self.session.execute(delete(CategoryProductCount))
+        await self.session.execute(
+            insert(CategoryProductCount).from_select(
+                ["region_id", "category_id", "product_count"], counts
+            )
+        )
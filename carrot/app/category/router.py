@@ -0,0 +1,24 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, Query
+
+from carrot.app.category.schemas import CategoryFacetResponse, CategoryResponse
+from carrot.app.category.services import CategoryService
+
+category_router = APIRouter()
+
+
+@category_router.get("/", status_code=200, response_model=List[CategoryResponse])
+async def list_categories(
+    service: Annotated[CategoryService, Depends()],
+) -> List[CategoryResponse]:
+    categories = await service.list_categories()
+    return [CategoryResponse.model_validate(category) for category in categories]
+
+
+@category_router.get("/facets", status_code=200, response_model=List[CategoryFacetResponse])
+async def get_category_facets(
+    service: Annotated[CategoryService, Depends()],
+    region_id: str | None = Query(default=None, alias="region"),
+) -> List[CategoryFacetResponse]:
+    return await service.get_facets(region_id)
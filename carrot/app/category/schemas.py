@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class CategoryResponse(BaseModel):
+    id: str
+    name: str
+
+    class Config:
+        from_attributes = True
+
+
+class CategoryFacetResponse(BaseModel):
+    category_id: str
+    name: str
+    product_count: int
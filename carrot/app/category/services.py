@@ -0,0 +1,30 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from carrot.db.connection import get_db_session
+from carrot.app.category.cache import category_cache
+from carrot.app.category.models import Category
+from carrot.app.category.repositories import CategoryRepository
+from carrot.app.category.schemas import CategoryFacetResponse
+
+
+class CategoryService:
+    def __init__(self, session: Annotated[AsyncSession, Depends(get_db_session)]) -> None:
+        self.repository = CategoryRepository(session)
+
+    async def list_categories(self) -> tuple[Category, ...]:
+        return await category_cache.get_all()
+
+    async def get_facets(self, region_id: str | None) -> list[CategoryFacetResponse]:
+        categories = await category_cache.get_all()
+        counts = await self.repository.get_product_counts(region_id)
+        return [
+            CategoryFacetResponse(
+                category_id=category.id,
+                name=category.name,
+                product_count=counts.get(category.id, 0),
+            )
+            for category in categories
+        ]
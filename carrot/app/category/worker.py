@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from carrot.db.connection import db
+from carrot.db.locks import try_advisory_lock
+from carrot.app.category.repositories import CategoryRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+REFRESH_INTERVAL_SECONDS = 60.0
+LOCK_NAME = "category_product_count_refresh"
+
+
+class CategoryFacetRefresher:
+    """category_product_count 집계 테이블을 주기적으로 다시 계산하는 백그라운드 작업"""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("category facet refresh failed")
+            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+
+    async def refresh(self) -> bool:
+        async with db.session_factory() as session:
+            async with session.begin():
+                # 여러 워커 중 하나만 집계하도록 잠금을 못 잡으면 건너뜀
+                async with try_advisory_lock(session, LOCK_NAME) as acquired:
+                    if not acquired:
+                        return False
+                    await CategoryRepository(session).refresh_product_counts()
+                    return True
+
+
+category_facet_refresher = CategoryFacetRefresher()
@@ -1,3 +1,5 @@
+import asyncio
+import json
 from typing import List, Dict
 from fastapi import WebSocket
 
@@ -12,7 +14,8 @@ class ConnectionManager:
         self.active_connections[room_id].append(websocket)
 
     def disconnect(self, websocket: WebSocket, room_id: str):
-        if room_id in self.active_connections:
+        # broadcast 중 이미 정리된 연결일 수 있음
+        if websocket in self.active_connections.get(room_id, ()):
             self.active_connections[room_id].remove(websocket)
             # 방에 아무도 없으면 방 정보 삭제
             if not self.active_connections[room_id]:
@@ -20,9 +23,18 @@ class ConnectionManager:
 
     async def broadcast_to_room(self, room_id: str, message: dict):
         # 해당 방에 연결된 모든 클라이언트에게 메시지 전송
-        if room_id in self.active_connections:
-            for connection in self.active_connections[room_id]:
-                # 실제 서비스에선 JSON 형식이 기본입니다.
-                await connection.send_json(message)
+        connections = list(self.active_connections.get(room_id, ()))
+        if not connections:
+            return
+        # 직렬화는 한 번만 하고, 느린 클라이언트 하나가 나머지를 막지 않도록 동시에 전송
+        text = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+        results = await asyncio.gather(
+            *(connection.send_text(text) for connection in connections),
+            return_exceptions=True,
+        )
+        # 이미 끊긴 연결은 정리
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, room_id)
 
 manager = ConnectionManager()
\ No newline at end of file
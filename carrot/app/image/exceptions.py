@@ -6,4 +6,40 @@ class FileUploadFailedException(CarrotException):
             status_code=500,
             error_code="ERR_001",
             error_msg="File Upload Failed"
-        )
\ No newline at end of file
+        )
+
+
+class UnsupportedImageTypeException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            error_code="IMG_001",
+            error_msg="Unsupported image type"
+        )
+
+
+class ImageNotUploadedException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            error_code="IMG_002",
+            error_msg="Image has not been uploaded"
+        )
+
+
+class InvalidUploadedImageException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            error_code="IMG_003",
+            error_msg="Uploaded image is too large or has a different type"
+        )
+
+
+class TooManyImageIdsException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            error_code="IMG_004",
+            error_msg="Too many image ids"
+        )
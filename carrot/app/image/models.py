@@ -1,5 +1,6 @@
 import uuid
-from sqlalchemy import String, Integer, ForeignKey, Boolean
+from datetime import datetime
+from sqlalchemy import BINARY, JSON, Index, String, Integer, ForeignKey, Boolean, DateTime, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from carrot.db.common import Base
@@ -9,4 +10,63 @@ class Image(Base):
     __tablename__ = "image"
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    image_url: Mapped[str] = mapped_column(String(255), nullable=False)
\ No newline at end of file
+    image_url: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # 원본 크기와 업로드 후 만든 축소본. 아직 만드는 중이거나(image_variant_outbox), 변환 이전에 올라왔거나
+    # 변환에 실패한 이미지는 NULL
+    width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    thumbnail_url: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # [{"width", "height", "format", "url"}, ...] 가로 크기 오름차순
+    variants: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+
+    # 원본 파일의 sha256. 같은 파일이 다시 올라오면 새로 저장하지 않고 이 행을 돌려줌 (도입 이전 이미지는 NULL)
+    content_hash: Mapped[bytes | None] = mapped_column(BINARY(32), nullable=True)
+    # 이 이미지를 붙인 상품 이미지(product_image) 수. 상품에 붙일 때 올리고 뗄 때 내림
+    # 0 이하가 되어야 ImageDeletionWorker가 지움 (같은 파일을 다시 올려도 늘지 않음)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # ImageDeletionWorker가 S3 객체를 지우기 시작한 이미지. 다시 공유하거나 상품에 붙이지 않음
+    deleting: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+
+    __table_args__ = (
+        Index("ux_image_content_hash", "content_hash", unique=True),
+    )
+
+    @property
+    def object_urls(self) -> list[str]:
+        # 원본과 축소본 객체 URL
+        return [self.image_url, *(variant["url"] for variant in self.variants or ())]
+
+
+# 이미지 삭제 outbox: 삭제를 요청한 트랜잭션과 같은 트랜잭션에서 기록되고,
+# ImageDeletionWorker가 DB 행과 S3 객체를 일괄 삭제한 뒤 지움. MAX_ATTEMPTS번 실패하면 로그를 남기고 지움
+class ImageDeletion(Base):
+    __tablename__ = "image_deletion_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # image 행은 worker가 지우므로 FK를 두지 않음
+    image_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    last_error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+
+# 축소본 생성 outbox: 이미지 행과 같은 트랜잭션에서 기록되고,
+# ImageVariantWorker가 요청 밖에서 축소본을 만들어 올리고 이미지 행에 채운 뒤 지움
+class ImageVariantJob(Base):
+    __tablename__ = "image_variant_outbox"
+
+    image_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    last_error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+
+# presigned 업로드가 같은 내용의 기존 이미지를 공유하게 됐을 때 업로드 id -> 기존 이미지 id
+# 클라이언트 객체는 지우므로, 같은 키로 확인을 다시 호출해도 같은 이미지를 돌려주려고 남겨 둠
+class ImageAlias(Base):
+    __tablename__ = "image_alias"
+
+    image_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # 대상 이미지가 지워질 때 ImageDeletionWorker가 함께 지움
+    target_image_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
@@ -0,0 +1,114 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from PIL import Image as PILImage, ImageOps
+
+from carrot.app.image.settings import IMAGE_SETTINGS
+
+# 압축 폭탄 방지: 이보다 픽셀이 많으면 디코딩하지 않음
+# Pillow는 MAX_IMAGE_PIXELS를 넘으면 경고만 하고 그 2배를 넘어야 DecompressionBombError를 내므로
+# render_variants에서 헤더의 크기를 직접 확인함
+MAX_IMAGE_PIXELS = 50_000_000
+PILImage.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+EXIF_ORIENTATION = 0x0112
+
+# 변환 결과 형식 -> (Pillow 포맷, Content-Type, 확장자)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+}
+
+
+@dataclass
+class RenderedVariant:
+    width: int
+    height: int
+    format: str
+    data: bytes
+
+
+@dataclass
+class RenderedImage:
+    width: int
+    height: int
+    variants: list[RenderedVariant]
+
+
+def render_variants(data: bytes) -> RenderedImage:
+    """원본을 디코딩해 가로 크기별 WebP/JPEG 축소본을 만듦 (프로세스 풀에서 실행)
+
+    EXIF 방향은 픽셀에 적용한 뒤 메타데이터 없이 저장하므로 위치 정보 등이 남지 않음
+    """
+    with PILImage.open(io.BytesIO(data)) as source:
+        # open()은 헤더만 읽으므로 여기서 거르면 픽셀을 디코딩하지 않음
+        width, height = source.size
+        if width * height > MAX_IMAGE_PIXELS:
+            raise PILImage.DecompressionBombError(
+                f"{width}x{height} exceeds {MAX_IMAGE_PIXELS} pixels"
+            )
+        if source.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        # JPEG는 디코딩 단계에서 필요한 크기 근처까지 줄여서 읽음 (다른 형식은 무시됨)
+        # 회전 후 어느 쪽이 가로가 될지 모르므로 양쪽 모두 가장 큰 축소본 이상으로 유지
+        largest = max(IMAGE_SETTINGS.VARIANT_WIDTHS)
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    variants = []
+    # 원본보다 작은 것은 원본 크기로 대체 (확대하지 않음)
+    for target_width in sorted({min(w, width) for w in IMAGE_SETTINGS.VARIANT_WIDTHS}):
+        target_height = max(round(height * target_width / width), 1)
+        resized = image.resize((target_width, target_height), PILImage.LANCZOS)
+
+        buffer = io.BytesIO()
+        resized.save(buffer, "WEBP", quality=IMAGE_SETTINGS.WEBP_QUALITY, method=4)
+        variants.append(RenderedVariant(target_width, target_height, "webp", buffer.getvalue()))
+
+        buffer = io.BytesIO()
+        # JPEG는 투명도가 없으므로 흰 배경에 합성
+        if resized.mode == "RGBA":
+            background = PILImage.new("RGB", resized.size, (255, 255, 255))
+            background.paste(resized, mask=resized.getchannel("A"))
+            resized = background
+        resized.save(
+            buffer, "JPEG", quality=IMAGE_SETTINGS.JPEG_QUALITY, optimize=True, progressive=True
+        )
+        variants.append(RenderedVariant(target_width, target_height, "jpeg", buffer.getvalue()))
+    return RenderedImage(width, height, variants)
+
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def start() -> None:
+    """변환 프로세스 풀 생성 (서버 시작 시 lifespan에서 호출)
+
+    워커는 fork 대신 spawn으로 띄움. boto3/DB 드라이버 스레드가 생긴 뒤에 fork하면
+    다른 스레드가 잡고 있던 락까지 복사되어 자식 프로세스가 멈출 수 있음
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=IMAGE_SETTINGS.PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+async def process_image(data: bytes) -> RenderedImage:
+    """CPU를 많이 쓰는 디코딩/리사이즈를 별도 프로세스에서 실행 (이벤트 루프와 GIL을 막지 않음)"""
+    # lifespan 밖(스크립트, 테스트)에서 불려도 동작하도록 없으면 만듦 (spawn이므로 나중에 만들어도 안전)
+    start()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_process_pool, render_variants, data)
+
+
+def shutdown() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
@@ -1,7 +1,11 @@
-from sqlalchemy import select
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from carrot.app.image.models import Image
+from carrot.app.image.models import Image, ImageAlias, ImageDeletion, ImageVariantJob
+from carrot.app.product.models import ProductImage
 
 
 class ImageRepository:
@@ -14,11 +18,264 @@ class ImageRepository:
         await self.session.refresh(image)
         return image
 
-    async def get_image_by_image_id(self, image_id: str) -> Image | None:
+    async def get_image_by_hash(self, content_hash: bytes) -> Image | None:
+        # 잠금 읽기: 일반 SELECT는 트랜잭션의 첫 읽기 시점 스냅샷(REPEATABLE READ)을 보므로,
+        # 그 뒤에 다른 트랜잭션이 커밋한 행이 보이지 않을 수 있음
+        # 행을 잠가서 ImageDeletionWorker가 같은 행을 지우는 중으로 표시하는 것과 순서가 정해짐
+        return await self.session.scalar(
+            select(Image)
+            .where(Image.content_hash == content_hash)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+
+    async def attach_images(self, image_ids: list[str]) -> bool:
+        # 상품에 붙인 수만큼 참조 수를 올림 (같은 증가량끼리 UPDATE 한 번)
+        # 없거나 지우는 중인 이미지가 있으면 False (호출한 쪽 트랜잭션을 롤백해야 함)
+        by_count: dict[int, list[str]] = defaultdict(list)
+        for image_id, count in Counter(image_ids).items():
+            by_count[count].append(image_id)
+        attached = 0
+        for count, ids in by_count.items():
+            result = await self.session.execute(
+                update(Image)
+                .where(Image.id.in_(ids), Image.deleting.is_(False))
+                .values(ref_count=Image.ref_count + count)
+                .execution_options(synchronize_session=False)
+            )
+            attached += result.rowcount
+        return attached == sum(len(ids) for ids in by_count.values())
+
+    async def release_images(self, image_ids: list[str]) -> None:
+        # 상품에서 뗀 수만큼 참조 수를 내림 (같은 감소량끼리 UPDATE 한 번)
+        by_count: dict[int, list[str]] = defaultdict(list)
+        for image_id, count in Counter(image_ids).items():
+            by_count[count].append(image_id)
+        for count, ids in by_count.items():
+            await self.session.execute(
+                update(Image)
+                .where(Image.id.in_(ids))
+                .values(ref_count=Image.ref_count - count)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def get_releasable_images(self, image_ids: list[str]) -> list[Image]:
+        # 참조 수가 0 이하이거나 이미 지우는 중인(지난 시도에서 S3 삭제가 실패한) 이미지만 잠그고 가져옴
+        if not image_ids:
+            return []
+        query = (
+            select(Image)
+            .where(Image.id.in_(image_ids), or_(Image.ref_count <= 0, Image.deleting))
+            .with_for_update()
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def mark_images_deleting(self, image_ids: list[str]) -> None:
+        # 해시를 비워서 같은 파일이 다시 올라와도 지우는 중인 이미지를 공유하지 않음
+        if not image_ids:
+            return
+        await self.session.execute(
+            update(Image)
+            .where(Image.id.in_(image_ids))
+            .values(deleting=True, content_hash=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_image_by_image_id(self, image_id: str, for_update: bool = False) -> Image | None:
         query = select(Image).where(Image.id == image_id)
+        if for_update:
+            # 스냅샷이 아니라 최신 커밋을 읽음 (동시에 저장된 행 확인용)
+            query = query.with_for_update().execution_options(populate_existing=True)
         result = await self.session.execute(query)
         return result.scalars().one_or_none()
 
+    async def add_image_alias(self, image_id: str, target_image_id: str) -> None:
+        # 같은 업로드 id가 이미 있으면 IntegrityError
+        self.session.add(ImageAlias(image_id=image_id, target_image_id=target_image_id))
+        await self.session.flush()
+
+    async def get_aliased_image(self, image_id: str, for_update: bool = False) -> Image | None:
+        query = (
+            select(Image)
+            .join(ImageAlias, ImageAlias.target_image_id == Image.id)
+            .where(ImageAlias.image_id == image_id)
+        )
+        if for_update:
+            query = query.with_for_update().execution_options(populate_existing=True)
+        result = await self.session.execute(query)
+        return result.scalars().one_or_none()
+
+    async def get_images_by_ids(self, image_ids: list[str]) -> list[Image]:
+        if not image_ids:
+            return []
+        # 지우는 중인 이미지는 없는 것으로 취급
+        query = select(Image).where(Image.id.in_(image_ids), Image.deleting.is_(False))
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
     async def remove_image(self, image: Image) -> None:
         await self.session.delete(image)
         await self.session.flush()
+
+    async def add_image_deletions(self, image_ids: list[str]) -> None:
+        if not image_ids:
+            return
+        now = datetime.now(timezone.utc)
+        await self.session.execute(
+            insert(ImageDeletion),
+            [{"image_id": image_id, "next_attempt_at": now} for image_id in image_ids],
+        )
+
+    async def lease_image_deletions(
+        self, now: datetime, limit: int, max_attempts: int, lease_until: datetime
+    ) -> list[ImageDeletion]:
+        # lease_variant_jobs와 같이 다음 시도 시각을 미뤄 두고 커밋. S3 삭제 동안 행 잠금을 잡고 있지 않음
+        query = (
+            select(ImageDeletion)
+            .where(
+                ImageDeletion.next_attempt_at <= now,
+                ImageDeletion.attempts < max_attempts,
+            )
+            .order_by(ImageDeletion.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        deletions = list((await self.session.execute(query)).scalars().all())
+        if deletions:
+            await self.session.execute(
+                update(ImageDeletion)
+                .where(ImageDeletion.id.in_([deletion.id for deletion in deletions]))
+                .values(next_attempt_at=lease_until)
+                .execution_options(synchronize_session=False)
+            )
+        return deletions
+
+    async def remove_exhausted_image_deletions(self, max_attempts: int, limit: int) -> list[ImageDeletion]:
+        # 재시도를 모두 써버린 삭제 요청을 꺼내서 지움 (테이블에 계속 쌓이지 않도록)
+        query = (
+            select(ImageDeletion)
+            .where(ImageDeletion.attempts >= max_attempts)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        deletions = list((await self.session.execute(query)).scalars().all())
+        await self.remove_image_deletions([deletion.id for deletion in deletions])
+        return deletions
+
+    async def get_referenced_image_ids(self, image_ids: list[str]) -> set[str]:
+        # 다른 상품이 아직 같은 이미지를 쓰고 있으면 지우지 않음
+        if not image_ids:
+            return set()
+        # 잠금 읽기: 트랜잭션 스냅샷 이후에 커밋된 상품 이미지도 봄
+        query = (
+            select(ProductImage.image_id)
+            .where(ProductImage.image_id.in_(image_ids))
+            .distinct()
+            .with_for_update(read=True)
+        )
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def remove_images_by_ids(self, image_ids: list[str]) -> None:
+        if not image_ids:
+            return
+        await self.session.execute(delete(Image).where(Image.id.in_(image_ids)))
+        await self.session.execute(delete(ImageAlias).where(ImageAlias.target_image_id.in_(image_ids)))
+
+    async def remove_image_deletions(self, deletion_ids: list[int]) -> None:
+        if not deletion_ids:
+            return
+        await self.session.execute(
+            delete(ImageDeletion).where(ImageDeletion.id.in_(deletion_ids))
+        )
+
+    async def postpone_image_deletions(
+        self, deletion_ids: list[int], next_attempt_at: datetime, error: str
+    ) -> None:
+        if not deletion_ids:
+            return
+        await self.session.execute(
+            update(ImageDeletion)
+            .where(ImageDeletion.id.in_(deletion_ids))
+            .values(
+                attempts=ImageDeletion.attempts + 1,
+                next_attempt_at=next_attempt_at,
+                last_error=error[:255],
+            )
+        )
+
+    async def add_variant_jobs(self, image_ids: list[str]) -> None:
+        if not image_ids:
+            return
+        now = datetime.now(timezone.utc)
+        await self.session.execute(
+            insert(ImageVariantJob),
+            [{"image_id": image_id, "next_attempt_at": now} for image_id in image_ids],
+        )
+
+    async def lease_variant_jobs(
+        self, now: datetime, limit: int, max_attempts: int, lease_until: datetime
+    ) -> list[ImageVariantJob]:
+        # 잠근 행의 다음 시도 시각을 lease_until로 미뤄 두고 커밋하면, 변환하는 동안 트랜잭션을 잡고 있지 않아도
+        # 다른 워커가 같은 작업을 가져가지 않음. 워커가 중간에 죽으면 lease가 끝난 뒤 다시 처리됨
+        query = (
+            select(ImageVariantJob)
+            .where(
+                ImageVariantJob.next_attempt_at <= now,
+                ImageVariantJob.attempts < max_attempts,
+            )
+            .order_by(ImageVariantJob.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list((await self.session.execute(query)).scalars().all())
+        if jobs:
+            await self.session.execute(
+                update(ImageVariantJob)
+                .where(ImageVariantJob.image_id.in_([job.image_id for job in jobs]))
+                .values(next_attempt_at=lease_until)
+                .execution_options(synchronize_session=False)
+            )
+        return jobs
+
+    async def get_pending_variant_image_ids(self, image_ids: list[str]) -> set[str]:
+        if not image_ids:
+            return set()
+        query = select(ImageVariantJob.image_id).where(ImageVariantJob.image_id.in_(image_ids))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def set_image_variants(
+        self, image_id: str, width: int, height: int, variants: list[dict], thumbnail_url: str
+    ) -> bool:
+        # 그 사이 이미지가 삭제됐거나 지우는 중이면 False
+        result = await self.session.execute(
+            update(Image)
+            .where(Image.id == image_id, Image.deleting.is_(False))
+            .values(width=width, height=height, variants=variants, thumbnail_url=thumbnail_url)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def remove_variant_jobs(self, image_ids: list[str]) -> None:
+        if not image_ids:
+            return
+        await self.session.execute(
+            delete(ImageVariantJob).where(ImageVariantJob.image_id.in_(image_ids))
+        )
+
+    async def postpone_variant_jobs(
+        self, image_ids: list[str], next_attempt_at: datetime, error: str
+    ) -> None:
+        if not image_ids:
+            return
+        await self.session.execute(
+            update(ImageVariantJob)
+            .where(ImageVariantJob.image_id.in_(image_ids))
+            .values(
+                attempts=ImageVariantJob.attempts + 1,
+                next_attempt_at=next_attempt_at,
+                last_error=error[:255],
+            )
+        )
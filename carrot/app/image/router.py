@@ -1,14 +1,24 @@
-from typing import Annotated
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from carrot.db.connection import get_session_factory
-from carrot.app.image.schemas import ImageResponse
+from carrot.app.image.schemas import (
+    ImageResponse,
+    ImageUploadConfirmRequest,
+    ImageUploadRequest,
+    ImageUploadResponse,
+)
 from carrot.app.image.services import ImageService
+from carrot.app.image.settings import IMAGE_SETTINGS
+from carrot.app.image.worker import image_variant_worker
 
 image_router = APIRouter()
 
+# 업로드된 이미지는 바뀌지 않으므로 CDN/클라이언트가 1년 동안 재검증 없이 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 @image_router.post("/product", status_code=201, response_model=ImageResponse)
 async def upload_product_image(
@@ -18,6 +28,8 @@ async def upload_product_image(
     service = ImageService(session)
     async with session.begin():
         image = await service.upload_image(file)
+    # 축소본은 커밋된 뒤 워커가 만듦
+    image_variant_worker.notify()
     return ImageResponse.model_validate(image)
 
 
@@ -29,9 +41,54 @@ async def upload_profile_image(
     service = ImageService(session)
     async with session.begin():
         image = await service.upload_image(file)
+    # 축소본은 커밋된 뒤 워커가 만듦
+    image_variant_worker.notify()
+    return ImageResponse.model_validate(image)
+
+
+# 이미지 바이트가 API 서버를 거치지 않는 업로드: 발급 -> 클라이언트가 S3에 직접 POST -> 확인
+@image_router.post("/uploads", status_code=201, response_model=ImageUploadResponse)
+async def create_image_upload(
+    session: Annotated[AsyncSession, Depends(get_session_factory)],
+    request: ImageUploadRequest,
+) -> ImageUploadResponse:
+    service = ImageService(session)
+    image_id, key, presigned = service.create_upload(request.content_type, request.checksum_sha256)
+    return ImageUploadResponse(
+        image_id=image_id,
+        key=key,
+        url=presigned["url"],
+        fields=presigned["fields"],
+        expires_in=IMAGE_SETTINGS.PRESIGNED_UPLOAD_EXPIRES_SECONDS,
+    )
+
+
+@image_router.post("/uploads/confirm", status_code=201, response_model=ImageResponse)
+async def confirm_image_upload(
+    session: Annotated[AsyncSession, Depends(get_session_factory)],
+    request: ImageUploadConfirmRequest,
+) -> ImageResponse:
+    service = ImageService(session)
+    async with session.begin():
+        image = await service.confirm_upload(request.key)
+    image_variant_worker.notify()
     return ImageResponse.model_validate(image)
 
 
+@image_router.get("", status_code=200, response_model=List[ImageResponse])
+async def view_images(
+    session: Annotated[AsyncSession, Depends(get_session_factory)],
+    response: Response,
+    ids: List[str] = Query(..., description="이미지 ID 목록 (ids=a&ids=b 또는 ids=a,b)"),
+) -> List[ImageResponse]:
+    service = ImageService(session)
+    image_ids = [image_id for value in ids for image_id in value.split(",") if image_id]
+    images, final = await service.view_images_in_order(image_ids)
+    # 없는 id가 섞였으면 아직 확인되지 않은 업로드, 축소본을 만드는 중이면 곧 바뀔 응답이므로 캐시하지 않음
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if final else "no-store"
+    return [ImageResponse.model_validate(image) for image in images]
+
+
 @image_router.get("/product/{image_id}", status_code=200, response_model=ImageResponse)
 async def view_product_image(
     session: Annotated[AsyncSession, Depends(get_session_factory)],
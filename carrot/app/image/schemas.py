@@ -6,12 +6,52 @@ from pydantic import BaseModel, EmailStr, field_validator
 from pydantic.functional_validators import AfterValidator
 
 from carrot.common.exceptions import InvalidFormatException
+from carrot.app.image.storage import decode_checksum_sha256
 from carrot.app.region.schemas import RegionResponse
-    
+
+# GET /image?ids= 한 번에 조회할 수 있는 최대 이미지 수
+IMAGE_BATCH_MAX_IDS = 100
+
+
+def validate_checksum_sha256(v: str) -> str:
+    if decode_checksum_sha256(v) is None:
+        raise InvalidFormatException()
+    return v
+
+
+class ImageVariantResponse(BaseModel):
+    width: int
+    height: int
+    format: str
+    url: str
+
+
 class ImageResponse(BaseModel):
     id: str
     image_url: str
+    width: int | None = None
+    height: int | None = None
+    thumbnail_url: str | None = None
+    variants: List[ImageVariantResponse] | None = None
 
     class Config:
         from_attributes = True
 
+
+class ImageUploadRequest(BaseModel):
+    content_type: str
+    # 올릴 파일의 sha256 (base64). S3가 업로드된 내용과 맞는지 검증하고, 확인 단계에서 중복 판단에 씀
+    checksum_sha256: Annotated[str, AfterValidator(validate_checksum_sha256)]
+
+
+class ImageUploadResponse(BaseModel):
+    image_id: str
+    key: str
+    # 클라이언트는 url로 fields + file을 multipart/form-data POST (file은 마지막 필드)
+    url: str
+    fields: dict[str, str]
+    expires_in: int
+
+
+class ImageUploadConfirmRequest(BaseModel):
+    key: str
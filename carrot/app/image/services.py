@@ -1,14 +1,44 @@
-import boto3
+import asyncio
+import hashlib
+import io
+import re
 import uuid
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from carrot.app.image.models import Image
-from carrot.app.image.exceptions import FileUploadFailedException
+from carrot.app.image.exceptions import (
+    FileUploadFailedException,
+    ImageNotUploadedException,
+    InvalidUploadedImageException,
+    TooManyImageIdsException,
+    UnsupportedImageTypeException,
+)
 from carrot.app.image.repositories import ImageRepository
+from carrot.app.image.schemas import IMAGE_BATCH_MAX_IDS
+from carrot.app.image.settings import IMAGE_SETTINGS
+from carrot.app.image.storage import (
+    IMAGE_CONTENT_TYPES,
+    S3_ERRORS,
+    decode_checksum_sha256,
+    delete_objects,
+    hash_file,
+    hash_object,
+    head_object,
+    object_key_from_url,
+    object_url,
+    presigned_upload,
+    upload_object,
+)
+from carrot.db.errors import is_duplicate_key_error
 
-BUCKET_NAME = "team9-image-database"
-s3_client = boto3.client("s3")
+# presigned 업로드 키: "{image_id}.{확장자}"
+UPLOAD_KEY_PATTERN = re.compile(r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.([a-z]+)$")
+
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
 
 
 class ImageService:
@@ -20,26 +50,176 @@ class ImageService:
         image_id = str(uuid.uuid4())
         file_extension = file.filename.split(".")[-1]
         s3_filename = f"{image_id}.{file_extension}"
+        image = Image(id=image_id, image_url=object_url(s3_filename))
+        # 축소본은 ImageVariantWorker가 요청 밖에서 만듦 (너무 큰 파일은 만들지 않음)
+        # 크기를 모르는 업로드(chunked)는 메모리에 통째로 읽지 않도록 큰 파일과 같이 취급
+        render = (
+            file.content_type in IMAGE_CONTENT_TYPES
+            and file.size is not None
+            and file.size <= IMAGE_SETTINGS.MAX_UPLOAD_BYTES
+        )
+
+        if render:
+            data = await file.read()
+            image.content_hash = await asyncio.to_thread(_sha256, data)
+            fileobj = io.BytesIO(data)
+        else:
+            # UploadFile은 디스크/메모리에 spool된 파일이므로 스레드에서 청크 단위로 해시를 구한 뒤
+            # 파트 단위로 읽어 올림
+            image.content_hash = await hash_file(file.file)
+            fileobj = file.file
+        # 같은 파일이 이미 있으면 S3에 올리지 않고 기존 이미지를 공유 (참조 수는 상품에 붙일 때 올라감)
+        existing = await self.repository.get_image_by_hash(image.content_hash)
+        if existing is not None:
+            return existing
+        try:
+            await upload_object(fileobj, s3_filename, file.content_type)
+        except S3_ERRORS:
+            raise FileUploadFailedException
+
+        saved, created = await self._save_image(image)
+        if render and created:
+            await self.repository.add_variant_jobs([image.id])
+        return saved
 
+    async def _save_image(self, image: Image) -> tuple[Image, bool]:
+        """새 이미지 행 저장. (image, 새로 저장했는지) 반환
+
+        같은 업로드(같은 image_id)의 확인이 동시에 들어와 먼저 저장됐으면 그 행을 그대로 쓰고,
+        같은 파일이 다른 업로드로 먼저 저장됐으면 그 이미지를 공유함.
+        어느 쪽이든 기존 행과 키가 겹치는 객체는 지우지 않음 (같은 키면 먼저 저장한 쪽의 원본임)
+        """
         try:
-            s3_client.upload_fileobj(
-                file.file,
-                BUCKET_NAME,
-                s3_filename,
-                ExtraArgs={"ContentType": file.content_type},
-            )
-            file_url = f"https://{BUCKET_NAME}.s3.ap-northeast-2.amazonaws.com/{s3_filename}"
-        except Exception:
+            async with self.session.begin_nested():
+                return await self.repository.upload_image(image), True
+        except IntegrityError as e:
+            if image.content_hash is None or not is_duplicate_key_error(e):
+                raise
+        # 먼저 저장된 행은 이 트랜잭션의 스냅샷 이후에 커밋됐으므로 잠금 읽기로 확인
+        existing = await self.repository.get_image_by_image_id(image.id, for_update=True)
+        if existing is None:
+            existing = await self.repository.get_image_by_hash(image.content_hash)
+        if existing is None:
+            # 그 사이 먼저 저장된 이미지가 삭제됨
             raise FileUploadFailedException
+        shared = set(existing.object_urls)
+        await delete_objects(
+            [object_key_from_url(url) for url in image.object_urls if url not in shared]
+        )
+        return existing, False
+
+    async def _alias_upload(self, image_id: str, existing: Image) -> Image:
+        """presigned 업로드가 기존 이미지를 공유하게 됐음을 기록
+
+        클라이언트 객체는 지우므로, 같은 키로 확인을 다시 호출하면 이 기록으로 같은 이미지를 돌려줌
+        """
+        try:
+            async with self.session.begin_nested():
+                await self.repository.add_image_alias(image_id, existing.id)
+        except IntegrityError as e:
+            if not is_duplicate_key_error(e):
+                raise
+            # 같은 키의 확인이 동시에 들어와 먼저 기록함: 그 결과를 씀
+            aliased = await self.repository.get_aliased_image(image_id, for_update=True)
+            if aliased is None:
+                raise FileUploadFailedException
+            return aliased
+        return existing
+
+    def create_upload(self, content_type: str, checksum_sha256: str) -> tuple[str, str, dict]:
+        """S3에 직접 올릴 presigned POST 발급. (image_id, key, presigned) 반환. DB에는 아직 기록하지 않음"""
+        extension = IMAGE_CONTENT_TYPES.get(content_type)
+        if extension is None:
+            raise UnsupportedImageTypeException()
+        image_id = str(uuid.uuid4())
+        key = f"{image_id}.{extension}"
+        return image_id, key, presigned_upload(key, content_type, checksum_sha256)
 
-        image = Image(id=image_id, image_url=file_url)
-        new = await self.repository.upload_image(image)
-        return new
+    async def confirm_upload(self, key: str) -> Image:
+        """클라이언트가 presigned POST로 올린 객체를 확인하고 Image 행을 만듦 (같은 키로 다시 호출하면 같은 이미지를 돌려줌)
+
+        객체를 내려받지 않고 HEAD만 하며, 축소본은 ImageVariantWorker가 커밋 후에 만듦
+        """
+        match = UPLOAD_KEY_PATTERN.match(key)
+        if match is None:
+            raise ImageNotUploadedException()
+        image_id, extension = match.groups()
+
+        image = await self.repository.get_image_by_image_id(image_id)
+        if image is None:
+            # 같은 파일이 이미 있어 기존 이미지를 공유하게 된 업로드
+            image = await self.repository.get_aliased_image(image_id)
+        if image is not None:
+            return image
+
+        head = await head_object(key)
+        if head is None:
+            raise ImageNotUploadedException()
+        # S3 정책으로 이미 막히지만, 정책 없이 올라온 객체도 받지 않도록 다시 확인
+        if (
+            head.get("ContentLength", 0) > IMAGE_SETTINGS.MAX_UPLOAD_BYTES
+            or IMAGE_CONTENT_TYPES.get(head.get("ContentType")) != extension
+        ):
+            await delete_objects([key])
+            raise InvalidUploadedImageException()
+
+        # 업로드 때 S3가 검증한 체크섬을 그대로 내용 해시로 씀
+        content_hash = decode_checksum_sha256(head.get("ChecksumSHA256"))
+        if content_hash is None:
+            # 체크섬 없이 올라온 객체(체크섬 필드 이전에 발급된 URL 등)만 청크 단위로 읽어 해시
+            try:
+                content_hash = await hash_object(key)
+            except S3_ERRORS:
+                raise FileUploadFailedException
+        existing = await self.repository.get_image_by_hash(content_hash)
+        if existing is not None and existing.id == image_id:
+            # 같은 키의 확인이 동시에 들어와 먼저 저장함. 같은 업로드이므로 객체를 남김
+            return existing
+        if existing is not None:
+            # 같은 파일이 이미 있으면 기존 이미지를 공유하고 클라이언트가 올린 객체는 지움
+            existing = await self._alias_upload(image_id, existing)
+            await delete_objects([key])
+            return existing
+
+        image = Image(id=image_id, image_url=object_url(key), content_hash=content_hash)
+        saved, created = await self._save_image(image)
+        if created:
+            await self.repository.add_variant_jobs([image.id])
+        elif saved.id != image_id:
+            # 같은 파일이 다른 업로드로 먼저 저장됨 (클라이언트 객체는 _save_image가 지움)
+            saved = await self._alias_upload(image_id, saved)
+        return saved
 
     async def view_image(self, image_id: str) -> Image:
         image = await self.repository.get_image_by_image_id(image_id)
         return image
 
+    async def view_images(self, image_ids: list[str]) -> list[Image]:
+        return await self.repository.get_images_by_ids(image_ids)
+
+    async def view_images_in_order(self, image_ids: list[str]) -> tuple[list[Image], bool]:
+        """IN 쿼리 한 번으로 조회해 요청한 순서대로 반환 (중복 id는 한 번만). (images, 더 바뀌지 않는 응답인지)
+
+        모두 찾았고 축소본을 만드는 중인 이미지가 없어야 더 바뀌지 않는 응답
+        """
+        image_ids = list(dict.fromkeys(image_ids))
+        if len(image_ids) > IMAGE_BATCH_MAX_IDS:
+            raise TooManyImageIdsException()
+        images = {image.id: image for image in await self.repository.get_images_by_ids(image_ids)}
+        final = len(images) == len(image_ids)
+        if final:
+            final = not await self.repository.get_pending_variant_image_ids(image_ids)
+        return [images[image_id] for image_id in image_ids if image_id in images], final
+
+    async def attach_product_images(self, image_ids: list[str]) -> bool:
+        """상품에 붙인 이미지의 참조 수를 올림. 없거나 지우는 중인 이미지가 있으면 False"""
+        return await self.repository.attach_images(image_ids)
+
     async def remove_product_image(self, image_id: str) -> None:
-        image = await self.repository.get_image_by_image_id(image_id)
-        await self.repository.remove_image(image)
+        await self.remove_product_images([image_id])
+
+    async def remove_product_images(self, image_ids: list[str]) -> None:
+        # 호출한 쪽의 트랜잭션 안에서 상품에서 뗀 만큼 참조 수를 내리고 outbox에 기록만 하고,
+        # 실제 DB 행 / S3 객체 삭제는 ImageDeletionWorker가 참조가 남지 않은 이미지만 일괄 처리
+        await self.repository.release_images(image_ids)
+        await self.repository.add_image_deletions(image_ids)
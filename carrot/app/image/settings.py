@@ -0,0 +1,36 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from carrot.settings import SETTINGS
+
+
+class ImageSettings(BaseSettings):
+    S3_BUCKET: str = "team9-image-database"
+    S3_REGION: str = "ap-northeast-2"
+    # 로컬 S3 호환 서버(MinIO 등)를 쓸 때만 지정. 없으면 AWS S3
+    S3_ENDPOINT_URL: str | None = None
+
+    # 동시에 진행하는 업로드 수 (업로드 전용 스레드 풀 크기)
+    UPLOAD_CONCURRENCY: int = 8
+    # 이 크기 이상이면 multipart upload, 파트 하나의 크기도 같음
+    MULTIPART_THRESHOLD_BYTES: int = 8 * 1024 * 1024
+    # 파일 하나의 파트를 동시에 올리는 수
+    MULTIPART_CONCURRENCY: int = 4
+
+    # presigned POST로 직접 올릴 때 허용하는 최대 크기와 URL 유효 시간
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    PRESIGNED_UPLOAD_EXPIRES_SECONDS: int = 300
+
+    # 업로드 시 만드는 축소본 가로 크기(px). 원본보다 큰 크기는 만들지 않음
+    VARIANT_WIDTHS: list[int] = [320, 640, 1280]
+    # 목록 카드에 쓰는 썸네일 가로 크기 (VARIANT_WIDTHS 중 하나)
+    THUMBNAIL_WIDTH: int = 320
+    WEBP_QUALITY: int = 80
+    JPEG_QUALITY: int = 82
+    # 이미지 디코딩/리사이즈를 돌리는 프로세스 수
+    PROCESS_WORKERS: int = 2
+
+    model_config = SettingsConfigDict(
+        case_sensitive=False, env_prefix="IMAGE_", env_file=SETTINGS.env_file, extra="ignore"
+    )
+
+
+IMAGE_SETTINGS = ImageSettings()
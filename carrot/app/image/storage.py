@@ -0,0 +1,185 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+import boto3
+from boto3.exceptions import Boto3Error
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
+
+from carrot.app.image.settings import IMAGE_SETTINGS
+
+BUCKET_NAME = IMAGE_SETTINGS.S3_BUCKET
+s3_client = boto3.client(
+    "s3",
+    region_name=IMAGE_SETTINGS.S3_REGION,
+    endpoint_url=IMAGE_SETTINGS.S3_ENDPOINT_URL,
+)
+
+# S3 호출이 실패했을 때 boto3/botocore가 던지는 예외 (업로드 실패로 응답할 대상)
+S3_ERRORS = (Boto3Error, BotoCoreError, ClientError)
+
+# 내용 해시를 계산할 때 한 번에 읽는 크기
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# S3 DeleteObjects 한 번에 지울 수 있는 최대 키 개수
+DELETE_BATCH_SIZE = 1000
+
+# 작은 파일은 PutObject 한 번, 큰 파일은 파트 단위로 읽으면서 multipart upload
+# (파일 전체를 메모리에 올리지 않음)
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=IMAGE_SETTINGS.MULTIPART_THRESHOLD_BYTES,
+    multipart_chunksize=IMAGE_SETTINGS.MULTIPART_THRESHOLD_BYTES,
+    max_concurrency=IMAGE_SETTINGS.MULTIPART_CONCURRENCY,
+)
+# 업로드 전용 스레드 풀. 기본 executor를 다른 to_thread 작업과 나눠 쓰지 않음
+_upload_executor = ThreadPoolExecutor(
+    max_workers=IMAGE_SETTINGS.UPLOAD_CONCURRENCY, thread_name_prefix="s3-upload"
+)
+# 풀이 가득 차면 요청이 executor 큐에 무한정 쌓이지 않고 여기서 기다림
+_upload_slots = asyncio.Semaphore(IMAGE_SETTINGS.UPLOAD_CONCURRENCY)
+
+
+# presigned 업로드로 받는 이미지 형식 -> 객체 키 확장자
+IMAGE_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+
+def object_url(key: str) -> str:
+    if IMAGE_SETTINGS.S3_ENDPOINT_URL:
+        return f"{IMAGE_SETTINGS.S3_ENDPOINT_URL.rstrip('/')}/{BUCKET_NAME}/{key}"
+    return f"https://{BUCKET_NAME}.s3.{IMAGE_SETTINGS.S3_REGION}.amazonaws.com/{key}"
+
+
+def object_key_from_url(url: str) -> str:
+    return url.rsplit("/", 1)[-1]
+
+
+def _hash_file_sync(fileobj: BinaryIO) -> bytes:
+    digest = hashlib.sha256()
+    while chunk := fileobj.read(HASH_CHUNK_BYTES):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.digest()
+
+
+async def hash_file(fileobj: BinaryIO) -> bytes:
+    """파일 내용의 sha256. 청크 단위로 읽으므로 큰 파일도 메모리에 올리지 않고, 끝나면 처음으로 되감음"""
+    return await asyncio.to_thread(_hash_file_sync, fileobj)
+
+
+def _upload_object_sync(fileobj: BinaryIO, key: str, content_type: str | None) -> None:
+    extra_args = {"ContentType": content_type} if content_type else None
+    s3_client.upload_fileobj(
+        fileobj, BUCKET_NAME, key, ExtraArgs=extra_args, Config=UPLOAD_TRANSFER_CONFIG
+    )
+
+
+async def upload_object(fileobj: BinaryIO, key: str, content_type: str | None) -> None:
+    """파일 객체를 S3에 업로드. boto3 호출은 업로드 전용 스레드에서 실행되어 이벤트 루프를 막지 않음"""
+    async with _upload_slots:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            _upload_executor, _upload_object_sync, fileobj, key, content_type
+        )
+
+
+def presigned_upload(key: str, content_type: str, checksum_sha256: str) -> dict:
+    """클라이언트가 S3에 직접 올릴 presigned POST (url, fields). 서명만 하므로 네트워크 호출 없음
+
+    형식과 크기 제한, 클라이언트가 알려준 sha256(base64)은 정책(policy)에 들어가서
+    S3가 업로드 시점에 거부하거나 검증함. 검증된 체크섬은 객체에 저장되어 확인 단계에서 HEAD로 읽음
+    """
+    fields = {
+        "Content-Type": content_type,
+        "x-amz-checksum-algorithm": "SHA256",
+        "x-amz-checksum-sha256": checksum_sha256,
+    }
+    return s3_client.generate_presigned_post(
+        BUCKET_NAME,
+        key,
+        Fields=fields,
+        Conditions=[
+            *({name: value} for name, value in fields.items()),
+            ["content-length-range", 1, IMAGE_SETTINGS.MAX_UPLOAD_BYTES],
+        ],
+        ExpiresIn=IMAGE_SETTINGS.PRESIGNED_UPLOAD_EXPIRES_SECONDS,
+    )
+
+
+def decode_checksum_sha256(value: str | None) -> bytes | None:
+    """S3 체크섬 헤더(base64)를 32바이트 sha256으로. 없거나 multipart 합성 체크섬("...-N")이면 None"""
+    if not value or "-" in value:
+        return None
+    try:
+        digest = base64.b64decode(value, validate=True)
+    except binascii.Error:
+        return None
+    return digest if len(digest) == hashlib.sha256().digest_size else None
+
+
+def _head_object_sync(key: str) -> dict | None:
+    try:
+        # ChecksumMode를 켜야 업로드 때 검증된 ChecksumSHA256이 응답에 포함됨
+        return s3_client.head_object(Bucket=BUCKET_NAME, Key=key, ChecksumMode="ENABLED")
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+async def head_object(key: str) -> dict | None:
+    """객체 메타데이터 (ContentLength, ContentType, ChecksumSHA256 등). 없으면 None"""
+    return await asyncio.to_thread(_head_object_sync, key)
+
+
+def _hash_object_sync(key: str) -> bytes:
+    digest = hashlib.sha256()
+    body = s3_client.get_object(Bucket=BUCKET_NAME, Key=key)["Body"]
+    for chunk in body.iter_chunks(HASH_CHUNK_BYTES):
+        digest.update(chunk)
+    return digest.digest()
+
+
+async def hash_object(key: str) -> bytes:
+    """S3 객체 내용의 sha256. 청크 단위로 읽으므로 객체 전체를 메모리에 올리지 않음"""
+    return await asyncio.to_thread(_hash_object_sync, key)
+
+
+def _download_object_sync(key: str) -> bytes:
+    return s3_client.get_object(Bucket=BUCKET_NAME, Key=key)["Body"].read()
+
+
+async def download_object(key: str) -> bytes:
+    return await asyncio.to_thread(_download_object_sync, key)
+
+
+def _delete_objects_sync(keys: list[str]) -> list[str]:
+    failed: list[str] = []
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        chunk = keys[start:start + DELETE_BATCH_SIZE]
+        try:
+            response = s3_client.delete_objects(
+                Bucket=BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+            )
+        except Exception:
+            failed.extend(chunk)
+            continue
+        failed.extend(error["Key"] for error in response.get("Errors", []))
+    return failed
+
+
+async def delete_objects(keys: list[str]) -> list[str]:
+    """키들을 일괄 삭제하고 삭제에 실패한 키 목록을 반환"""
+    if not keys:
+        return []
+    # boto3는 동기 클라이언트이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    return await asyncio.to_thread(_delete_objects_sync, keys)
@@ -0,0 +1,276 @@
+import asyncio
+import io
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from carrot.db.connection import db
+from carrot.app.image.models import Image
+from carrot.app.image.processing import VARIANT_FORMATS, RenderedImage, process_image
+from carrot.app.image.repositories import ImageRepository
+from carrot.app.image.settings import IMAGE_SETTINGS
+from carrot.app.image.storage import (
+    delete_objects,
+    download_object,
+    object_key_from_url,
+    object_url,
+    upload_object,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+BATCH_SIZE = 100
+POLL_INTERVAL_SECONDS = 5.0
+MAX_ATTEMPTS = 8
+BASE_BACKOFF_SECONDS = 10
+MAX_BACKOFF_SECONDS = 60 * 60
+
+# 축소본은 한 번에 몇 개씩만 가져감. 변환은 프로세스 풀 크기만큼만 동시에 돌아감
+VARIANT_BATCH_SIZE = 10
+# 가져간 작업을 다른 워커가 다시 가져가지 않는 시간. 이 안에 끝내지 못하면(워커가 죽는 등) 다시 처리됨
+VARIANT_LEASE_SECONDS = 5 * 60
+DELETION_LEASE_SECONDS = 5 * 60
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BASE_BACKOFF_SECONDS * 2 ** attempts, MAX_BACKOFF_SECONDS))
+
+
+class ImageDeletionWorker:
+    """image_deletion_outbox를 주기적으로 비우는 백그라운드 작업"""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        # 새 삭제 요청이 커밋되면 다음 폴링까지 기다리지 않고 바로 처리
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                logger.exception("image deletion batch failed")
+                processed = 0
+
+            if processed >= BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def process_batch(self) -> int:
+        now = datetime.now(timezone.utc)
+        # 삭제 요청을 가져가면서 지울 이미지를 표시하고 바로 커밋. S3 삭제 동안에는 이미지/outbox 행을 잠그지 않음
+        async with db.session_factory() as session:
+            async with session.begin():
+                repository = ImageRepository(session)
+                exhausted = await repository.remove_exhausted_image_deletions(MAX_ATTEMPTS, BATCH_SIZE)
+                if exhausted:
+                    logger.error(
+                        f"giving up deleting images after {MAX_ATTEMPTS} attempts: "
+                        f"{sorted({deletion.image_id for deletion in exhausted})}"
+                    )
+                deletions = await repository.lease_image_deletions(
+                    now, BATCH_SIZE, MAX_ATTEMPTS, now + timedelta(seconds=DELETION_LEASE_SECONDS)
+                )
+                if not deletions:
+                    return 0
+
+                # 같은 파일을 다시 올려 이미지를 공유하는 업로드가 남아 있으면(ref_count > 0) 지우지 않음
+                images = await repository.get_releasable_images(
+                    list({deletion.image_id for deletion in deletions})
+                )
+                referenced = await repository.get_referenced_image_ids([image.id for image in images])
+                images = [image for image in images if image.id not in referenced]
+                # 표시한 이미지는 다른 요청이 공유하거나 상품에 붙이지 않으므로 잠금 없이 S3에서 지워도 됨
+                await repository.mark_images_deleting([image.id for image in images])
+
+        # 원본과 축소본 객체를 함께 지움. 하나라도 실패하면 이미지 행을 남겨두고 재시도
+        keys = {
+            image.id: [object_key_from_url(url) for url in image.object_urls]
+            for image in images
+        }
+        failed_keys = set(await delete_objects([key for group in keys.values() for key in group]))
+        failed_image_ids = {
+            image_id for image_id, group in keys.items() if failed_keys.intersection(group)
+        }
+
+        async with db.session_factory() as session:
+            async with session.begin():
+                repository = ImageRepository(session)
+                await repository.remove_images_by_ids(
+                    [image_id for image_id in keys if image_id not in failed_image_ids]
+                )
+
+                done = [d.id for d in deletions if d.image_id not in failed_image_ids]
+                await repository.remove_image_deletions(done)
+
+                # 실패한 건은 시도 횟수별로 묶어 지수 백오프로 재시도 예약
+                retry_groups: dict[int, list[int]] = defaultdict(list)
+                for deletion in deletions:
+                    if deletion.image_id in failed_image_ids:
+                        retry_groups[deletion.attempts].append(deletion.id)
+                for attempts, deletion_ids in retry_groups.items():
+                    await repository.postpone_image_deletions(
+                        deletion_ids, now + _backoff(attempts), "S3 delete failed"
+                    )
+        if retry_groups:
+            logger.warning(f"{len(failed_image_ids)} image deletions postponed")
+        return len(deletions)
+
+
+image_deletion_worker = ImageDeletionWorker()
+
+
+class VariantRenderError(Exception):
+    """원본을 디코딩할 수 없어 다시 시도해도 축소본을 만들 수 없음"""
+
+
+async def _render_variants(image: Image) -> dict:
+    """원본을 내려받아 축소본을 만들어 올리고, 이미지 행에 채울 값을 반환"""
+    data = await download_object(object_key_from_url(image.image_url))
+    try:
+        rendered: RenderedImage = await process_image(data)
+    except Exception as e:
+        raise VariantRenderError(repr(e)) from e
+
+    variants = []
+    uploads = []
+    for variant in rendered.variants:
+        _, content_type, extension = VARIANT_FORMATS[variant.format]
+        key = f"{image.id}_w{variant.width}.{extension}"
+        uploads.append(upload_object(io.BytesIO(variant.data), key, content_type))
+        variants.append({
+            "width": variant.width,
+            "height": variant.height,
+            "format": variant.format,
+            "url": object_url(key),
+        })
+    await asyncio.gather(*uploads)
+
+    thumbnail_width = min(IMAGE_SETTINGS.THUMBNAIL_WIDTH, rendered.width)
+    webp = [variant for variant in variants if variant["format"] == "webp"]
+    return {
+        "width": rendered.width,
+        "height": rendered.height,
+        "variants": variants,
+        "thumbnail_url": next(
+            (variant["url"] for variant in webp if variant["width"] >= thumbnail_width), webp[-1]["url"]
+        ),
+    }
+
+
+class ImageVariantWorker:
+    """image_variant_outbox의 이미지마다 축소본을 만드는 백그라운드 작업
+
+    업로드/확인 요청은 원본만 저장하고 바로 응답하고, 원본을 내려받아 디코딩/리사이즈하는 일은 여기서 함
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        # 새 이미지가 커밋되면 다음 폴링까지 기다리지 않고 바로 처리
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except Exception:
+                logger.exception("image variant batch failed")
+                processed = 0
+
+            if processed >= VARIANT_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def process_batch(self) -> int:
+        now = datetime.now(timezone.utc)
+        # 작업을 가져가는 트랜잭션은 바로 커밋하고, 내려받기/변환/업로드 동안에는 커넥션을 잡고 있지 않음
+        async with db.session_factory() as session:
+            async with session.begin():
+                repository = ImageRepository(session)
+                jobs = await repository.lease_variant_jobs(
+                    now, VARIANT_BATCH_SIZE, MAX_ATTEMPTS, now + timedelta(seconds=VARIANT_LEASE_SECONDS)
+                )
+                if not jobs:
+                    return 0
+                images = {
+                    image.id: image
+                    for image in await repository.get_images_by_ids([job.image_id for job in jobs])
+                }
+
+        # 그 사이 지워진 이미지는 작업만 지움
+        rendering = [job for job in jobs if job.image_id in images]
+        results = await asyncio.gather(
+            *(_render_variants(images[job.image_id]) for job in rendering), return_exceptions=True
+        )
+
+        done = [job.image_id for job in jobs if job.image_id not in images]
+        retry_groups: dict[int, list[str]] = defaultdict(list)
+        orphaned: list[str] = []
+        async with db.session_factory() as session:
+            async with session.begin():
+                repository = ImageRepository(session)
+                for job, result in zip(rendering, results):
+                    if isinstance(result, VariantRenderError):
+                        # 디코딩할 수 없는 파일이면 원본만 둠
+                        logger.warning(f"image {job.image_id}: failed to render variants ({result})")
+                        done.append(job.image_id)
+                    elif isinstance(result, Exception):
+                        logger.warning(f"image {job.image_id}: variant upload failed ({result!r})")
+                        retry_groups[job.attempts].append(job.image_id)
+                    else:
+                        # ImageDeletionWorker가 먼저 지우는 중으로 표시했거나 지웠으면 UPDATE가 0행이고,
+                        # 방금 올린 축소본은 아무도 지우지 않으므로 여기서 지움
+                        if not await repository.set_image_variants(job.image_id, **result):
+                            orphaned += [object_key_from_url(variant["url"]) for variant in result["variants"]]
+                        done.append(job.image_id)
+
+                await repository.remove_variant_jobs(done)
+                for attempts, image_ids in retry_groups.items():
+                    await repository.postpone_variant_jobs(
+                        image_ids, now + _backoff(attempts), "S3 download/upload failed"
+                    )
+        await delete_objects(orphaned)
+        return len(jobs)
+
+
+image_variant_worker = ImageVariantWorker()
@@ -16,4 +16,22 @@ class ReceiverNotFoundException(CarrotException):
             status_code=status.HTTP_400_BAD_REQUEST,
             error_code="ERR_012",
             error_msg="cannot transfer to non-existent user",
-        )
\ No newline at end of file
+        )
+
+
+class SelfTransferException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            error_code="ERR_014",
+            error_msg="Cannot transfer to self",
+        )
+
+
+class DuplicateRequestKeyException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            error_code="ERR_015",
+            error_msg="request_key is used more than once",
+        )
@@ -0,0 +1,49 @@
+import hashlib
+from collections import OrderedDict
+
+MAX_RECENT_KEYS = 10000
+
+
+# 서버가 만드는 ledger(입찰 예치/해제, 낙찰 정산) 키 앞에 붙여 해시하는 바이트
+# UTF-8 문자열에는 나올 수 없으므로 클라이언트가 어떤 request_key를 보내도 같은 해시를 만들 수 없음
+INTERNAL_KEY_PREFIX = b"\xff"
+
+
+def hash_request_key(request_key: str, internal: bool = False) -> bytes:
+    # 길이가 제각각인 클라이언트 request_key를 고정 길이(32바이트)로 바꿔서 유니크 인덱스에 저장
+    # MySQL의 UNHEX(SHA2(request_key, 256))와 같은 값 (마이그레이션에서 사용)
+    # internal이면 UNHEX(SHA2(CONCAT(X'FF', request_key), 256))
+    data = request_key.encode("utf-8")
+    if internal:
+        data = INTERNAL_KEY_PREFIX + data
+    return hashlib.sha256(data).digest()
+
+
+class RecentLedgerKeys:
+    """최근 처리한 idempotency_key -> ledger id를 기억하는 LRU 캐시 (워커별)
+
+    같은 요청이 재전송되면 잔액 UPDATE/INSERT를 시도하지 않고 PK 조회 한 번으로 기존 거래를 돌려줌.
+    캐시에 없으면 DB의 유니크 인덱스가 중복을 막으므로 정확성은 캐시에 의존하지 않음
+    """
+
+    def __init__(self, max_size: int = MAX_RECENT_KEYS) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, int] = OrderedDict()
+
+    def get(self, idempotency_key: bytes) -> int | None:
+        ledger_id = self._entries.get(idempotency_key)
+        if ledger_id is not None:
+            self._entries.move_to_end(idempotency_key)
+        return ledger_id
+
+    def add(self, idempotency_key: bytes, ledger_id: int) -> None:
+        self._entries[idempotency_key] = ledger_id
+        self._entries.move_to_end(idempotency_key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, idempotency_key: bytes) -> None:
+        self._entries.pop(idempotency_key, None)
+
+
+recent_ledger_keys = RecentLedgerKeys()
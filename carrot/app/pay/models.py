@@ -1,9 +1,9 @@
 from datetime import datetime
 import enum
-import uuid
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BINARY, BigInteger, DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from carrot.app.pay.idempotency import hash_request_key
 from carrot.app.user.models import User
 from carrot.db.common import Base
 
@@ -12,14 +12,36 @@ class TransactionType(enum.Enum):
     DEPOSIT = "DEPOSIT"
     WITHDRAW = "WITHDRAW"
     TRANSFER = "TRANSFER"
+    HOLD = "HOLD"  # 경매 입찰 시 코인 예치
+    RELEASE = "RELEASE"  # 상위 입찰이 들어와 예치 해제
+    SETTLE = "SETTLE"  # 낙찰 확정, 예치금을 판매자에게 지급
+
+
+# 거래 유형별로 보낸 쪽(user_id) 잔액에 곱해지는 부호. 받는 쪽(receive_user_id)은 항상 +amount
+# SETTLE은 낙찰자 잔액이 HOLD 때 이미 줄었으므로 0
+SENDER_BALANCE_SIGN = {
+    TransactionType.DEPOSIT: 1,
+    TransactionType.WITHDRAW: -1,
+    TransactionType.TRANSFER: -1,
+    TransactionType.HOLD: -1,
+    TransactionType.RELEASE: 1,
+    TransactionType.SETTLE: 0,
+}
+
+# 서버가 만드는 거래. request_key를 클라이언트 키와 다른 공간으로 해시해서
+# 클라이언트가 같은 문자열(예: "auction-settle:<id>")을 먼저 써도 막히지 않음
+INTERNAL_TRANSACTION_TYPES = {TransactionType.HOLD, TransactionType.RELEASE, TransactionType.SETTLE}
 
 
 class Ledger(Base):
     __tablename__ = "ledger"
 
-    id: Mapped[str] = mapped_column(
-        String(512), primary_key=True
-    )
+    # 고정 길이 surrogate PK. 보조 인덱스마다 PK가 붙으므로 작게 유지
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # 클라이언트가 보낸 멱등 키 원문 (응답용, 인덱스 없음)
+    request_key: Mapped[str] = mapped_column(String(512), nullable=False)
+    # sha256(request_key), 서버가 만드는 거래는 구분 바이트를 붙여서 해시. 중복 요청은 이 컬럼의 유니크 인덱스로 막음
+    idempotency_key: Mapped[bytes] = mapped_column(BINARY(32), nullable=False)
 
     transaction_type: Mapped[TransactionType] = mapped_column(
         Enum(TransactionType, native_enum=False), nullable=False
@@ -35,9 +57,33 @@ class Ledger(Base):
         String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=True
     )
 
+    # 거래 직후 잔액 (유저 행 잠금 안에서 기록). 도입 이전 거래는 NULL
+    balance_after: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    receive_balance_after: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     user: Mapped[User] = relationship(
         "User", foreign_keys=[user_id], back_populates="sent_ledgers"
     )
     receive_user: Mapped[User | None] = relationship(
         "User", foreign_keys=[receive_user_id], back_populates="received_ledgers"
     )
+
+    @validates("request_key", "transaction_type")
+    def _hash_request_key(self, key: str, value):
+        # 생성자 인자 순서와 상관없이 두 값이 모두 정해지면 해시를 채움
+        request_key = value if key == "request_key" else self.request_key
+        transaction_type = value if key == "transaction_type" else self.transaction_type
+        if request_key is not None and transaction_type is not None:
+            self.idempotency_key = hash_request_key(
+                request_key, internal=transaction_type in INTERNAL_TRANSACTION_TYPES
+            )
+        return value
+
+    __table_args__ = (
+        Index("ux_ledger_idempotency_key", "idempotency_key", unique=True),
+        # 유저별 거래 내역을 최신순으로 읽기 위한 인덱스 (InnoDB가 뒤에 PK(id)를 붙임)
+        Index("ix_ledger_user_id_time", "user_id", "time"),
+        Index("ix_ledger_receive_user_id_time", "receive_user_id", "time"),
+        # 특정 상대와의 거래 내역 (양방향 모두 이 인덱스 하나로 처리)
+        Index("ix_ledger_user_id_receive_user_id_time", "user_id", "receive_user_id", "time"),
+    )
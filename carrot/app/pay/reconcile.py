@@ -0,0 +1,46 @@
+import asyncio
+import sys
+
+from carrot.db.connection import db
+from carrot.app.pay.repositories import PayRepository
+from carrot.app.user.repositories import UserRepository
+
+BATCH_SIZE = 500
+
+
+async def reconcile_balances(batch_size: int = BATCH_SIZE) -> tuple[int, list[tuple[str, int, int]]]:
+    """User.coin과 원장 합계를 유저 id 순 배치로 비교. (검사한 유저 수, [(user_id, coin, 원장 합계)]) 반환"""
+    checked = 0
+    mismatches = []
+    after = None
+    while True:
+        # 배치마다 새 세션을 써서 긴 트랜잭션/스냅샷을 잡고 있지 않음
+        async with db.session_factory() as session:
+            users = await UserRepository(session).get_user_coins(after, batch_size)
+            if not users:
+                break
+            balances = await PayRepository(session).get_ledger_balances([user_id for user_id, _ in users])
+
+        for user_id, coin in users:
+            if balances[user_id] != coin:
+                mismatches.append((user_id, coin, balances[user_id]))
+        checked += len(users)
+        after = users[-1][0]
+    return checked, mismatches
+
+
+async def main() -> int:
+    try:
+        checked, mismatches = await reconcile_balances()
+    finally:
+        await db.engine.dispose()
+
+    for user_id, coin, ledger_balance in mismatches:
+        print(f"{user_id}: coin={coin} ledger={ledger_balance} diff={coin - ledger_balance}")
+    print(f"{checked}명 검사, 불일치 {len(mismatches)}명")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    # python -m carrot.app.pay.reconcile
+    sys.exit(asyncio.run(main()))
@@ -1,55 +1,185 @@
 from datetime import datetime
 from typing import Annotated
 from fastapi import Depends
-from sqlalchemy import and_, desc, or_, select
+from sqlalchemy import RowMapping, Select, and_, case, func, insert, literal, select, tuple_, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from carrot.app.pay.idempotency import hash_request_key
 from carrot.app.pay.models import Ledger
-from carrot.app.pay.models import TransactionType
+from carrot.app.pay.models import SENDER_BALANCE_SIGN, TransactionType
+from carrot.app.user.models import User
 from carrot.db.connection import get_db_session
 
 
+def _latest_first(stmt: Select, limit: int, after: tuple[datetime, int] | None) -> Select:
+    # (time, id) 내림차순 keyset 스캔 하나. UNION ALL로 합칠 수 있도록 서브쿼리로 감쌈
+    if after is not None:
+        stmt = stmt.where(tuple_(Ledger.time, Ledger.id) < tuple_(*after))
+    return select(
+        stmt.order_by(Ledger.time.desc(), Ledger.id.desc()).limit(limit).subquery()
+    )
+
+
 class PayRepository:
     def __init__(
         self, session: Annotated[AsyncSession, Depends(get_db_session)]
     ) -> None:
         self.session = session
 
-    async def add_ledger(self, ledger: Ledger) -> Ledger:
+    async def add_to_balance(
+        self, user_id: str, amount: int, min_balance: int | None = None
+    ) -> bool:
+        # 잔액 확인과 변경을 조건부 UPDATE 한 번으로 처리 (갱신된 행은 트랜잭션 끝까지 잠김)
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(coin=User.coin + amount)
+            .execution_options(synchronize_session=False)
+        )
+        if min_balance is not None:
+            stmt = stmt.where(User.coin >= min_balance)
+        result = await self.session.execute(stmt)
+        return result.rowcount == 1
+
+    async def get_users_by_ids(self, user_ids: list[str]) -> dict[str, User]:
+        # 방금 갱신한 잔액을 읽으므로 identity map의 값을 덮어씀
+        stmt = (
+            select(User)
+            .where(User.id.in_(set(user_ids)))
+            .execution_options(populate_existing=True)
+        )
+        users = await self.session.scalars(stmt)
+        return {user.id: user for user in users.all()}
+
+    async def insert_ledger(self, ledger: Ledger) -> None:
+        # INSERT만 실행 (관계 재조회 없음). 같은 request_key가 있으면 IntegrityError
         self.session.add(ledger)
         await self.session.flush()
-        await self.session.refresh(ledger, attribute_names=["receive_user"])
-        return ledger
+
+    async def insert_ledgers(self, ledgers: list[Ledger]) -> None:
+        # multi-row INSERT 한 번. ORM flush는 autoincrement id를 받으려고 행마다 INSERT하므로 쓰지 않음
+        # 생성된 id가 필요하면 get_ledger_ids로 다시 읽음
+        columns = [column.key for column in Ledger.__table__.columns if column.key != "id"]
+        await self.session.execute(
+            insert(Ledger),
+            [{column: getattr(ledger, column) for column in columns} for ledger in ledgers],
+        )
+
+    async def get_ledger_ids(self, idempotency_keys: list[bytes]) -> dict[bytes, int]:
+        stmt = select(Ledger.idempotency_key, Ledger.id).where(
+            Ledger.idempotency_key.in_(idempotency_keys)
+        )
+        result = await self.session.execute(stmt)
+        return dict(result.tuples().all())
 
     async def get_ledgers(
-        self, user_id: str, limit: int, offset: int, partner_id: str | None
+        self,
+        user_id: str,
+        limit: int,
+        after: tuple[datetime, int] | None,
+        partner_id: str | None,
     ) -> list[Ledger]:
+        # OR 조건 대신 방향별 조건을 각각 인덱스 순서대로 limit개만 읽어서 UNION ALL
         if partner_id:
-            where_stmt = or_(
+            # (user_id, receive_user_id, time) 인덱스 하나로 양방향 모두 범위 스캔
+            conditions = [
                 and_(Ledger.user_id == partner_id, Ledger.receive_user_id == user_id),
                 and_(Ledger.user_id == user_id, Ledger.receive_user_id == partner_id),
-            )
+            ]
         else:
-            where_stmt = or_(
-                Ledger.user_id == user_id, Ledger.receive_user_id == user_id
-            )
+            conditions = [Ledger.user_id == user_id, Ledger.receive_user_id == user_id]
 
+        merged = union_all(
+            *(
+                _latest_first(select(Ledger.id, Ledger.time).where(condition), limit, after)
+                for condition in conditions
+            )
+        ).subquery()
         stmt = (
             select(Ledger)
-            .where(where_stmt)
-            .order_by(desc(Ledger.time))
+            .join(merged, merged.c.id == Ledger.id)
+            .order_by(merged.c.time.desc(), merged.c.id.desc())
             .limit(limit)
-            .offset(offset)
             .options(selectinload(Ledger.user), selectinload(Ledger.receive_user))
         )
         ledgers = await self.session.scalars(stmt)
         return list(ledgers.all())
 
-    async def get_ledger_by_id(self, id: str) -> Ledger | None:
+    async def get_ledger_by_id(self, id: int) -> Ledger | None:
         stmt = (
             select(Ledger)
             .where(Ledger.id == id)
             .options(selectinload(Ledger.user), selectinload(Ledger.receive_user))
         )
         return await self.session.scalar(stmt)
+
+    async def get_ledger_by_key(self, idempotency_key: bytes) -> Ledger | None:
+        stmt = (
+            select(Ledger)
+            .where(Ledger.idempotency_key == idempotency_key)
+            .options(selectinload(Ledger.user), selectinload(Ledger.receive_user))
+        )
+        return await self.session.scalar(stmt)
+
+    async def get_ledgers_by_keys(self, request_keys: list[str]) -> dict[str, Ledger]:
+        # request_key -> 이미 기록된 거래
+        stmt = (
+            select(Ledger)
+            .where(Ledger.idempotency_key.in_([hash_request_key(key) for key in request_keys]))
+            .options(selectinload(Ledger.user), selectinload(Ledger.receive_user))
+        )
+        ledgers = await self.session.scalars(stmt)
+        return {ledger.request_key: ledger for ledger in ledgers.all()}
+
+    async def get_statement(
+        self, user_id: str, limit: int, after: tuple[datetime, int] | None
+    ) -> list[RowMapping]:
+        # 보낸 쪽/받는 쪽을 각각 (user_id, time) 인덱스로 최신순 limit개만 읽고 합침
+        # OR 조건 하나로 쓰면 두 인덱스를 쓰지 못하고 정렬을 따로 하게 됨
+        def scan(owner_column, partner_column, balance_column, outgoing: bool):
+            stmt = select(
+                Ledger.id,
+                Ledger.transaction_type,
+                Ledger.amount,
+                Ledger.description,
+                Ledger.time,
+                balance_column.label("balance_after"),
+                partner_column.label("partner_id"),
+                literal(outgoing).label("outgoing"),
+            ).where(owner_column == user_id)
+            return _latest_first(stmt, limit, after)
+
+        merged = union_all(
+            scan(Ledger.user_id, Ledger.receive_user_id, Ledger.balance_after, True),
+            scan(Ledger.receive_user_id, Ledger.user_id, Ledger.receive_balance_after, False),
+        ).subquery()
+        stmt = (
+            select(merged)
+            .order_by(merged.c.time.desc(), merged.c.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.mappings().all())
+
+    async def get_ledger_balances(self, user_ids: list[str]) -> dict[str, int]:
+        # 원장만으로 계산한 유저별 잔액 (DB에서 집계하므로 원장 행을 메모리에 올리지 않음)
+        sign = case(
+            *((Ledger.transaction_type == type_, value) for type_, value in SENDER_BALANCE_SIGN.items()),
+            else_=0,
+        )
+        sent = await self.session.execute(
+            select(Ledger.user_id, func.sum(sign * Ledger.amount))
+            .where(Ledger.user_id.in_(user_ids))
+            .group_by(Ledger.user_id)
+        )
+        received = await self.session.execute(
+            select(Ledger.receive_user_id, func.sum(Ledger.amount))
+            .where(Ledger.receive_user_id.in_(user_ids))
+            .group_by(Ledger.receive_user_id)
+        )
+
+        balances = dict.fromkeys(user_ids, 0)
+        for user_id, total in [*sent.tuples(), *received.tuples()]:
+            balances[user_id] += int(total or 0)
+        return balances
@@ -2,60 +2,120 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query, status
 
 from carrot.app.auth.exceptions import InvalidAccountException
-from carrot.app.auth.utils import login_with_header
+from carrot.app.auth.utils import login_with_header, login_with_header_detached
 from carrot.app.pay.models import Ledger, TransactionType
 from carrot.app.pay.schemas import (
     BalanceRequest,
+    BatchTransferItemResponse,
+    BatchTransferItemStatus,
+    BatchTransferRequest,
+    BatchTransferResponse,
+    StatementPageResponse,
+    TransactionPageResponse,
     TransactionResponse,
     TransferRequest,
     TransferResponse,
+    create_statement_entry,
     create_transaction_response,
 )
 from carrot.app.pay.services import PayService
 from carrot.app.user.models import User
+from carrot.db.transaction import run_in_transaction
 
 pay_router = APIRouter()
 
 
 @pay_router.post("/deposit", status_code=status.HTTP_201_CREATED)
 async def deposit(
-    user: Annotated[User, Depends(login_with_header)],
+    user: Annotated[User, Depends(login_with_header_detached)],
     request: BalanceRequest,
-    pay_service: Annotated[PayService, Depends()],
 ) -> TransactionResponse:
-    ledger = await pay_service.deposit(user=user, **request.model_dump())
+    ledger = await run_in_transaction(
+        "pay.deposit",
+        lambda session: PayService.create(session).deposit(user=user, **request.model_dump()),
+    )
     return create_transaction_response(ledger)
 
 
 @pay_router.post("/withdraw", status_code=status.HTTP_201_CREATED)
 async def withdraw(
-    user: Annotated[User, Depends(login_with_header)],
+    user: Annotated[User, Depends(login_with_header_detached)],
     request: BalanceRequest,
-    pay_service: Annotated[PayService, Depends()],
 ) -> TransactionResponse:
-    ledger = await pay_service.withdraw(user=user, **request.model_dump())
+    ledger = await run_in_transaction(
+        "pay.withdraw",
+        lambda session: PayService.create(session).withdraw(user=user, **request.model_dump()),
+    )
     return create_transaction_response(ledger)
 
 
 @pay_router.post("/transfer", status_code=status.HTTP_201_CREATED)
 async def transfer(
-    user: Annotated[User, Depends(login_with_header)],
+    user: Annotated[User, Depends(login_with_header_detached)],
     request: TransferRequest,
-    pay_service: Annotated[PayService, Depends()],
 ) -> TransactionResponse:
-    ledger = await pay_service.transfer(send_user=user, **request.model_dump())
+    ledger = await run_in_transaction(
+        "pay.transfer",
+        lambda session: PayService.create(session).transfer(send_user=user, **request.model_dump()),
+    )
     return create_transaction_response(ledger)
 
 
+@pay_router.post("/transfer/batch", status_code=status.HTTP_201_CREATED)
+async def transfer_batch(
+    user: Annotated[User, Depends(login_with_header_detached)],
+    request: BatchTransferRequest,
+) -> BatchTransferResponse:
+    results = await run_in_transaction(
+        "pay.transfer_batch",
+        lambda session: PayService.create(session).transfer_batch(
+            items=request.items, mode=request.mode, send_user=user
+        ),
+    )
+    failed = sum(result.status == BatchTransferItemStatus.FAILED for result in results)
+    return BatchTransferResponse(
+        mode=request.mode,
+        succeeded=len(results) - failed,
+        failed=failed,
+        results=[
+            BatchTransferItemResponse(
+                request_key=result.request_key,
+                status=result.status,
+                transaction=create_transaction_response(result.ledger) if result.ledger else None,
+                error_code=result.error.error_code if result.error else None,
+                error_msg=result.error.error_msg if result.error else None,
+            )
+            for result in results
+        ],
+    )
+
+
 @pay_router.get("/", status_code=status.HTTP_200_OK)
 async def get_transactions(
     user: Annotated[User, Depends(login_with_header)],
     pay_service: Annotated[PayService, Depends()],
     limit: int = Query(default=10, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
     partner_id: str | None = Query(default=None),
-) -> list[TransactionResponse]:
-    ledgers = await pay_service.get_transactions(
-        user=user, limit=limit, offset=offset, partner_id=partner_id
+) -> TransactionPageResponse:
+    ledgers, next_cursor = await pay_service.get_transactions(
+        user=user, limit=limit, cursor=cursor, partner_id=partner_id
+    )
+    return TransactionPageResponse(
+        items=[create_transaction_response(ledger) for ledger in ledgers],
+        next_cursor=next_cursor,
+    )
+
+
+@pay_router.get("/statement", status_code=status.HTTP_200_OK)
+async def get_statement(
+    user: Annotated[User, Depends(login_with_header)],
+    pay_service: Annotated[PayService, Depends()],
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+) -> StatementPageResponse:
+    rows, next_cursor = await pay_service.get_statement(user=user, limit=limit, cursor=cursor)
+    return StatementPageResponse(
+        items=[create_statement_entry(row) for row in rows],
+        next_cursor=next_cursor,
     )
-    return [create_transaction_response(ledger) for ledger in ledgers]
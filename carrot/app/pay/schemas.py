@@ -1,7 +1,8 @@
 from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel, ConfigDict, Field
 
-from carrot.app.pay.models import Ledger, TransactionType
+from carrot.app.pay.models import SENDER_BALANCE_SIGN, Ledger, TransactionType
 from carrot.app.user.schemas import PublicUserResponse, UserResponse
 
 
@@ -17,6 +18,27 @@ class TransferRequest(BalanceRequest):
     receive_user_id: str
 
 
+# 한 번의 배치 이체에 담을 수 있는 최대 건수 (ledger multi-row INSERT 한 번 크기)
+BATCH_TRANSFER_MAX_ITEMS = 500
+
+
+class BatchTransferMode(str, Enum):
+    ALL_OR_NOTHING = "all_or_nothing"  # 한 건이라도 실패하면 전체 취소
+    PARTIAL = "partial"  # 실패한 건만 빼고 나머지는 처리
+
+
+class BatchTransferItem(BaseModel):
+    amount: int = Field(gt=0)
+    description: str
+    request_key: str
+    receive_user_id: str
+
+
+class BatchTransferRequest(BaseModel):
+    mode: BatchTransferMode = BatchTransferMode.ALL_OR_NOTHING
+    items: list[BatchTransferItem] = Field(min_length=1, max_length=BATCH_TRANSFER_MAX_ITEMS)
+
+
 class BalanceResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -35,17 +57,75 @@ class TransferResponse(BalanceResponse):
 class TransactionResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: int
+    request_key: str
     type: TransactionType
     details: TransferResponse | BalanceResponse
 
 
+class TransactionPageResponse(BaseModel):
+    items: list[TransactionResponse]
+    next_cursor: str | None = None
+
+
+class BatchTransferItemStatus(str, Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"  # 이미 처리된 request_key -> 기존 거래를 돌려줌
+    FAILED = "failed"
+
+
+class BatchTransferItemResponse(BaseModel):
+    request_key: str
+    status: BatchTransferItemStatus
+    transaction: TransactionResponse | None = None
+    error_code: str | None = None
+    error_msg: str | None = None
+
+
+class BatchTransferResponse(BaseModel):
+    mode: BatchTransferMode
+    succeeded: int
+    failed: int
+    results: list[BatchTransferItemResponse]
+
+
 def create_transaction_response(ledger: Ledger) -> TransactionResponse:
-    if ledger.transaction_type == TransactionType.TRANSFER:
+    if ledger.transaction_type in (TransactionType.TRANSFER, TransactionType.SETTLE):
         details = TransferResponse.model_validate(ledger)
     else:
         details = BalanceResponse.model_validate(ledger)
 
     return TransactionResponse(
-        id=ledger.id, type=ledger.transaction_type, details=details
+        id=ledger.id,
+        request_key=ledger.request_key,
+        type=ledger.transaction_type,
+        details=details,
+    )
+
+
+class StatementEntryResponse(BaseModel):
+    id: int
+    type: TransactionType
+    amount: int  # 내 잔액 변화량 (입금 +, 출금 -)
+    balance_after: int | None  # 거래 직후 내 잔액 (기록 도입 이전 거래는 null)
+    description: str | None
+    time: datetime
+    partner_id: str | None
+
+
+class StatementPageResponse(BaseModel):
+    items: list[StatementEntryResponse]
+    next_cursor: str | None = None
+
+
+def create_statement_entry(row) -> StatementEntryResponse:
+    sign = SENDER_BALANCE_SIGN[row["transaction_type"]] if row["outgoing"] else 1
+    return StatementEntryResponse(
+        id=row["id"],
+        type=row["transaction_type"],
+        amount=sign * row["amount"],
+        balance_after=row["balance_after"],
+        description=row["description"],
+        time=row["time"],
+        partner_id=row["partner_id"],
     )
@@ -1,14 +1,51 @@
 from datetime import datetime, timezone
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, NamedTuple
+from fastapi import Depends
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from carrot.app.pay.exceptions import CoinLackException, ReceiverNotFoundException
+from sqlalchemy.orm.attributes import set_committed_value
+from carrot.app.auth.exceptions import InvalidAccountException
+from carrot.app.pay.idempotency import recent_ledger_keys
+from carrot.app.pay.exceptions import (
+    CoinLackException,
+    DuplicateRequestKeyException,
+    ReceiverNotFoundException,
+    SelfTransferException,
+)
 from carrot.app.pay.models import Ledger
 from carrot.app.pay.repositories import PayRepository
 from carrot.app.pay.models import TransactionType
+from carrot.app.pay.schemas import BatchTransferItem, BatchTransferItemStatus, BatchTransferMode
 from carrot.app.user.models import User
 from carrot.app.user.repositories import UserRepository
 from carrot.db.connection import get_db_session
+from carrot.db.errors import is_duplicate_key_error
+from carrot.common.exceptions import CarrotException, InvalidCursorException
+from carrot.common.pagination import decode_cursor, encode_cursor
+
+
+def _decode_time_cursor(cursor: str | None, kind: str) -> tuple[datetime, int] | None:
+    if cursor is None:
+        return None
+    values = decode_cursor(cursor, kind)
+    try:
+        return datetime.fromisoformat(values[0]), int(values[1])
+    except (IndexError, TypeError, ValueError):
+        raise InvalidCursorException()
+
+
+class BalanceChange(NamedTuple):
+    user_id: str
+    amount: int
+    min_balance: int | None  # 변경 전 잔액이 이 값 이상이어야 함
+    error: type[Exception]  # 조건부 UPDATE가 0행이면 발생시킬 예외
+
+
+class BatchTransferResult(NamedTuple):
+    request_key: str
+    status: BatchTransferItemStatus
+    ledger: Ledger | None
+    error: CarrotException | None
 
 
 class PayService:
@@ -22,75 +59,87 @@ class PayService:
         self.user_repository = user_repository
         self.session = session
 
-    async def deposit(
-        self, request_key: str, amount: int, description: str, user: User
-    ) -> Ledger:
-        async with self.session.begin_nested():
-            ledger = await self.pay_repository.get_ledger_by_id(request_key)
-            if ledger:
-                return ledger
-
-            ledger = Ledger(
-                id=request_key,
-                transaction_type=TransactionType.DEPOSIT,
-                amount=amount,
-                description=description,
-                time=datetime.now(timezone.utc),
-                user_id=user.id,
-                receive_user_id=None,
-            )
-            await self.pay_repository.add_ledger(ledger)
+    @classmethod
+    def create(cls, session: AsyncSession) -> "PayService":
+        """주어진 세션을 쓰는 인스턴스 생성 (run_in_transaction 등 요청 세션 밖에서 사용)"""
+        return cls(PayRepository(session), UserRepository(session), session)
 
-            locked_user = await self.user_repository.get_user_for_update(user.id)
-            if not locked_user:
-                raise RuntimeError(f"User {user.id} disappeared during transaction.")
-            locked_user.coin += amount
-            await self.user_repository.update_user(locked_user)
-            return ledger
-
-    async def withdraw(
-        self, request_key: str, amount: int, description: str, user: User
+    async def _post_ledger(
+        self, ledger: Ledger, changes: list[BalanceChange]
     ) -> Ledger:
-        async with self.session.begin_nested():
-            ledger = await self.pay_repository.get_ledger_by_id(request_key)
-            if ledger:
-                return ledger
-            ledger = Ledger(
-                id=request_key,
-                transaction_type=TransactionType.WITHDRAW,
-                amount=amount,
-                description=description,
-                time=datetime.now(timezone.utc),
-                user_id=user.id,
-                receive_user_id=None,
-            )
-            await self.pay_repository.add_ledger(ledger)
+        # 조건부 UPDATE(유저별) -> 잔액 SELECT 한 번 -> ledger INSERT 한 번
+        # request_key가 이미 처리됐으면 INSERT가 중복 키로 실패하고, savepoint 롤백으로 잔액 변경도 취소됨
+        ledger_id = recent_ledger_keys.get(ledger.idempotency_key)
+        if ledger_id is not None:
+            # 최근에 처리한 재요청은 잠금 없이 PK 조회 한 번으로 응답
+            existing = await self.pay_repository.get_ledger_by_id(ledger_id)
+            if existing is not None and existing.idempotency_key == ledger.idempotency_key:
+                return existing
+            # 캐시에 넣은 뒤 트랜잭션이 롤백된 경우
+            recent_ledger_keys.discard(ledger.idempotency_key)
 
-            locked_user = await self.user_repository.get_user_for_update(user.id)
-            if not locked_user:
-                raise RuntimeError(f"User {user.id} disappeared during transaction.")
+        try:
+            async with self.session.begin_nested():
+                # 여러 유저는 id 순으로 갱신해서 잠금 순서를 고정 (데드락 방지)
+                for change in sorted(changes, key=lambda c: c.user_id):
+                    updated = await self.pay_repository.add_to_balance(
+                        change.user_id, change.amount, change.min_balance
+                    )
+                    if not updated:
+                        raise change.error()
 
-            if locked_user.coin <= amount:
-                raise CoinLackException()
-            locked_user.coin -= amount
-
-            await self.user_repository.update_user(locked_user)
-            return ledger
+                users = await self.pay_repository.get_users_by_ids(
+                    [change.user_id for change in changes]
+                )
+                ledger.balance_after = users[ledger.user_id].coin
+                if ledger.receive_user_id is not None:
+                    ledger.receive_balance_after = users[ledger.receive_user_id].coin
+                await self.pay_repository.insert_ledger(ledger)
+        except IntegrityError as e:
+            if not is_duplicate_key_error(e):
+                raise
+            existing = await self.pay_repository.get_ledger_by_key(ledger.idempotency_key)
+            recent_ledger_keys.add(existing.idempotency_key, existing.id)
+            return existing
 
-    async def _get_2_users_for_update(
-        self, user_id1: str, user_id2: str
-    ) -> tuple[User | None, User | None]:
-        # consistent locking order to prevent deadlock
-        # returns the users in the order of arguments given, not in the arguments in which locks were called
+        recent_ledger_keys.add(ledger.idempotency_key, ledger.id)
+        # 응답 직렬화에 필요한 관계는 이미 가진 객체로 채움 (재조회 없음)
+        set_committed_value(ledger, "user", users[ledger.user_id])
+        set_committed_value(ledger, "receive_user", users.get(ledger.receive_user_id))
+        return ledger
 
-        if user_id1 < user_id2:
-            user1 = await self.user_repository.get_user_for_update(user_id1)
-            user2 = await self.user_repository.get_user_for_update(user_id2)
-        else:
-            user2 = await self.user_repository.get_user_for_update(user_id2)
-            user1 = await self.user_repository.get_user_for_update(user_id1)
+    async def deposit(
+        self, request_key: str, amount: int, description: str, user: User
+    ) -> Ledger:
+        ledger = Ledger(
+            request_key=request_key,
+            transaction_type=TransactionType.DEPOSIT,
+            amount=amount,
+            description=description,
+            time=datetime.now(timezone.utc),
+            user_id=user.id,
+            receive_user_id=None,
+        )
+        return await self._post_ledger(
+            ledger, [BalanceChange(user.id, amount, None, InvalidAccountException)]
+        )
 
-        return (user1, user2)
+    async def withdraw(
+        self, request_key: str, amount: int, description: str, user: User
+    ) -> Ledger:
+        ledger = Ledger(
+            request_key=request_key,
+            transaction_type=TransactionType.WITHDRAW,
+            amount=amount,
+            description=description,
+            time=datetime.now(timezone.utc),
+            user_id=user.id,
+            receive_user_id=None,
+        )
+        # 기존 동작 유지: 출금 후 잔액이 0보다 커야 함
+        return await self._post_ledger(
+            ledger, [BalanceChange(user.id, -amount, amount + 1, CoinLackException)]
+        )
 
     async def transfer(
         self,
@@ -100,49 +149,219 @@ class PayService:
         receive_user_id: str,
         send_user: User,
     ) -> Ledger:
-        async with self.session.begin_nested():
-            ledger = await self.pay_repository.get_ledger_by_id(request_key)
-            if ledger:
-                return ledger
+        if receive_user_id == send_user.id:
+            raise SelfTransferException()
+
+        ledger = Ledger(
+            request_key=request_key,
+            transaction_type=TransactionType.TRANSFER,
+            amount=amount,
+            description=description,
+            time=datetime.now(timezone.utc),
+            user_id=send_user.id,
+            receive_user_id=receive_user_id,
+        )
+        return await self._post_ledger(
+            ledger,
+            [
+                BalanceChange(send_user.id, -amount, amount + 1, CoinLackException),
+                BalanceChange(receive_user_id, amount, None, ReceiverNotFoundException),
+            ],
+        )
+
+    async def transfer_batch(
+        self, items: list[BatchTransferItem], mode: BatchTransferMode, send_user: User
+    ) -> list[BatchTransferResult]:
+        # 건마다 두 유저를 잠그는 대신, 관련 유저 전체를 id 순으로 한 번에 잠그고
+        # 메모리에서 잔액을 계산한 뒤 ledger를 multi-row INSERT 한 번으로 기록
+        request_keys = [item.request_key for item in items]
+        if len(set(request_keys)) != len(request_keys):
+            raise DuplicateRequestKeyException()
+
+        users = await self.user_repository.get_users_for_update(
+            [send_user.id, *(item.receive_user_id for item in items)]
+        )
+        sender = users.get(send_user.id)
+        if sender is None:
+            raise InvalidAccountException()
+        # 보내는 유저를 잠근 뒤에 확인하므로 같은 유저의 재시도와 겹치지 않음
+        existing = await self.pay_repository.get_ledgers_by_keys(request_keys)
+
+        now = datetime.now(timezone.utc)
+        results: list[BatchTransferResult] = []
+        ledgers: list[Ledger] = []
+        balances = {user_id: user.coin for user_id, user in users.items()}
+        for item in items:
+            previous = existing.get(item.request_key)
+            if previous is not None and previous.user_id == sender.id:
+                results.append(BatchTransferResult(
+                    item.request_key, BatchTransferItemStatus.DUPLICATE, previous, None
+                ))
+                continue
+
+            error = None
+            if previous is not None:
+                # 다른 유저가 이미 쓴 request_key. 그 유저의 거래 내용은 돌려주지 않음
+                error = DuplicateRequestKeyException()
+            elif item.receive_user_id == sender.id:
+                error = SelfTransferException()
+            elif item.receive_user_id not in users:
+                error = ReceiverNotFoundException()
+            elif balances[sender.id] <= item.amount:
+                # 단건 이체와 같은 규칙: 이체 후 잔액이 0보다 커야 함
+                error = CoinLackException()
+            if error is not None:
+                if mode == BatchTransferMode.ALL_OR_NOTHING:
+                    raise error
+                results.append(BatchTransferResult(
+                    item.request_key, BatchTransferItemStatus.FAILED, None, error
+                ))
+                continue
+
+            balances[sender.id] -= item.amount
+            balances[item.receive_user_id] += item.amount
             ledger = Ledger(
-                id=request_key,
+                request_key=item.request_key,
                 transaction_type=TransactionType.TRANSFER,
-                amount=amount,
-                description=description,
-                time=datetime.now(timezone.utc),
-                user_id=send_user.id,
-                receive_user_id=receive_user_id,
+                amount=item.amount,
+                description=item.description,
+                time=now,
+                user_id=sender.id,
+                receive_user_id=item.receive_user_id,
+                balance_after=balances[sender.id],
+                receive_balance_after=balances[item.receive_user_id],
             )
-            await self.pay_repository.add_ledger(ledger)
+            ledgers.append(ledger)
+            results.append(BatchTransferResult(
+                item.request_key, BatchTransferItemStatus.CREATED, ledger, None
+            ))
 
-            if receive_user_id == send_user.id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Cannot transfer to self",
-                )
+        if not ledgers:
+            return results
 
-            receive_user_locked, send_user_locked = await self._get_2_users_for_update(
-                receive_user_id, send_user.id
-            )
-            if not send_user_locked:
-                raise RuntimeError(
-                    f"User {send_user.id} disappeared during transaction."
-                )
-            if not receive_user_locked:
-                raise ReceiverNotFoundException()
+        try:
+            async with self.session.begin_nested():
+                for user_id, coin in balances.items():
+                    users[user_id].coin = coin
+                await self.session.flush()
+                await self.pay_repository.insert_ledgers(ledgers)
+        except IntegrityError as e:
+            # 다른 유저의 요청이 같은 request_key를 먼저 기록한 경우
+            if not is_duplicate_key_error(e):
+                raise
+            raise DuplicateRequestKeyException()
 
-            if send_user_locked.coin <= amount:
-                raise CoinLackException()
-            send_user_locked.coin -= amount
+        ids = await self.pay_repository.get_ledger_ids([ledger.idempotency_key for ledger in ledgers])
+        for ledger in ledgers:
+            ledger.id = ids[ledger.idempotency_key]
+            recent_ledger_keys.add(ledger.idempotency_key, ledger.id)
+            set_committed_value(ledger, "user", sender)
+            set_committed_value(ledger, "receive_user", users[ledger.receive_user_id])
+        return results
 
-            receive_user_locked.coin += amount
+    async def get_transactions(
+        self, user: User, limit: int, cursor: str | None, partner_id: str | None
+    ) -> tuple[list[Ledger], str | None]:
+        after = _decode_time_cursor(cursor, "transactions")
+        ledgers = await self.pay_repository.get_ledgers(user.id, limit + 1, after, partner_id)
+        if len(ledgers) <= limit:
+            return ledgers, None
+        ledgers = ledgers[:limit]
+        last = ledgers[-1]
+        return ledgers, encode_cursor("transactions", [last.time.isoformat(), last.id])
 
-            await self.user_repository.update_user(send_user_locked)
-            await self.user_repository.update_user(receive_user_locked)
+    async def get_statement(
+        self, user: User, limit: int, cursor: str | None
+    ) -> tuple[list, str | None]:
+        after = _decode_time_cursor(cursor, "statement")
+        rows = await self.pay_repository.get_statement(user.id, limit + 1, after)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor("statement", [last["time"].isoformat(), last["id"]])
 
-            return ledger
+    async def hold_for_bid(
+        self,
+        bid_id: str,
+        auction_id: str,
+        bidder_id: str,
+        amount: int,
+        outbid_user_id: str | None,
+        outbid_amount: int,
+    ) -> None:
+        # 입찰 금액을 예치하고, 밀려난 직전 최고 입찰자의 예치금은 같은 트랜잭션에서 해제
+        # 호출하는 쪽에서 경매 행을 먼저 잠근 상태여야 함 (경매 -> 유저 순서로 잠금)
+        user_ids = [bidder_id] if outbid_user_id is None else [bidder_id, outbid_user_id]
+        users = await self.user_repository.get_users_for_update(user_ids)
+        bidder = users.get(bidder_id)
+        if not bidder:
+            raise RuntimeError(f"User {bidder_id} disappeared during transaction.")
 
-    async def get_transactions(
-        self, user: User, limit: int, offset: int, partner_id: str | None
-    ):
-        return await self.pay_repository.get_ledgers(user.id, limit, offset, partner_id)
+        # 자기 입찰가를 올리는 경우 기존 예치금이 먼저 풀림
+        available = bidder.coin + (outbid_amount if outbid_user_id == bidder_id else 0)
+        if available < amount:
+            raise CoinLackException()
+
+        now = datetime.now(timezone.utc)
+        ledgers = []
+        outbid_user = users.get(outbid_user_id) if outbid_user_id else None
+        if outbid_user:
+            outbid_user.coin += outbid_amount
+            ledgers.append(
+                Ledger(
+                    request_key=f"bid-release:{bid_id}",
+                    transaction_type=TransactionType.RELEASE,
+                    amount=outbid_amount,
+                    description=f"auction {auction_id} outbid",
+                    time=now,
+                    user_id=outbid_user_id,
+                    receive_user_id=None,
+                    balance_after=outbid_user.coin,
+                )
+            )
+        bidder.coin -= amount
+        ledgers.append(
+            Ledger(
+                request_key=f"bid-hold:{bid_id}",
+                transaction_type=TransactionType.HOLD,
+                amount=amount,
+                description=f"auction {auction_id} bid",
+                time=now,
+                user_id=bidder_id,
+                receive_user_id=None,
+                balance_after=bidder.coin,
+            )
+        )
+        await self.pay_repository.insert_ledgers(ledgers)
+
+    async def settle_auctions(self, settlements: list[tuple[str, str, str, int]]) -> None:
+        # (auction_id, winner_id, seller_id, amount)
+        # 낙찰자의 코인은 입찰 시점에 이미 예치(차감)되어 있으므로 판매자에게 지급만 함
+        if not settlements:
+            return
+        # 낙찰자도 같이 잠가서 거래 직후 잔액을 정확히 기록
+        users = await self.user_repository.get_users_for_update(
+            [user_id for _, winner_id, seller_id, _ in settlements for user_id in (winner_id, seller_id)]
+        )
+
+        now = datetime.now(timezone.utc)
+        ledgers = []
+        for auction_id, winner_id, seller_id, amount in settlements:
+            seller = users[seller_id]
+            seller.coin += amount
+            ledgers.append(
+                Ledger(
+                    request_key=f"auction-settle:{auction_id}",
+                    transaction_type=TransactionType.SETTLE,
+                    amount=amount,
+                    description=f"auction {auction_id} settled",
+                    time=now,
+                    user_id=winner_id,
+                    receive_user_id=seller_id,
+                    # 낙찰자 잔액은 예치 시점에 이미 줄었으므로 그대로
+                    balance_after=users[winner_id].coin,
+                    receive_balance_after=seller.coin,
+                )
+            )
+        await self.pay_repository.insert_ledgers(ledgers)
@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from carrot.common.http_cache import CachedResponse, make_etag
+
+# 다른 워커에서 발생한 변경은 무효화 훅이 전달되지 않으므로 TTL로 최대 지연을 제한
+CACHE_TTL_SECONDS = 30.0
+MAX_DETAIL_ENTRIES = 2048
+MAX_LISTING_ENTRIES = 256
+
+
+class ProductResponseCache:
+    """상품 상세/목록 응답을 직렬화된 JSON 바이트로 보관하는 프로세스 내 캐시"""
+
+    def __init__(self) -> None:
+        self._details: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._listings: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        # 무효화가 일어날 때마다 증가. 조회 도중 무효화된 결과가 캐시에 남지 않도록 비교용으로 사용
+        self.generation = 0
+
+    def _get(self, store: OrderedDict, key: Hashable) -> CachedResponse | None:
+        entry = store.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del store[key]
+            return None
+        store.move_to_end(key)
+        return entry
+
+    def _set(
+        self, store: OrderedDict, key: Hashable, body: bytes, generation: int, max_entries: int
+    ) -> CachedResponse:
+        entry = CachedResponse(
+            etag=make_etag(body),
+            body=body,
+            expires_at=time.monotonic() + CACHE_TTL_SECONDS,
+        )
+        if generation == self.generation:
+            store[key] = entry
+            store.move_to_end(key)
+            while len(store) > max_entries:
+                store.popitem(last=False)
+        return entry
+
+    def get_detail(self, product_id: str) -> CachedResponse | None:
+        return self._get(self._details, product_id)
+
+    def set_detail(self, product_id: str, body: bytes, generation: int) -> CachedResponse:
+        return self._set(self._details, product_id, body, generation, MAX_DETAIL_ENTRIES)
+
+    def get_listing(self, key: Hashable) -> CachedResponse | None:
+        return self._get(self._listings, key)
+
+    def set_listing(self, key: Hashable, body: bytes, generation: int) -> CachedResponse:
+        return self._set(self._listings, key, body, generation, MAX_LISTING_ENTRIES)
+
+    def invalidate_product(self, product_id: str) -> None:
+        # 상품 하나가 바뀌면 그 상품이 포함됐을 수 있는 목록 페이지도 모두 무효
+        self.generation += 1
+        self._details.pop(product_id, None)
+        self._listings.clear()
+
+    def invalidate_detail(self, product_id: str) -> None:
+        self.generation += 1
+        self._details.pop(product_id, None)
+
+    def invalidate_listings(self) -> None:
+        self.generation += 1
+        self._listings.clear()
+
+
+product_cache = ProductResponseCache()
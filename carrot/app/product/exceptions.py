@@ -23,4 +23,12 @@ class ShouldLoginException(CarrotException):
             status_code=403,
             error_code="ERR_003",
             error_msg="Should Login"
+        )
+
+class InvalidImageIDException(CarrotException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=400,
+            error_code="ERR_004",
+            error_msg="Invalid Image ID"
         )
\ No newline at end of file
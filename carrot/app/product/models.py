@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import String, Integer, ForeignKey, Boolean, JSON
+from sqlalchemy import String, Integer, ForeignKey, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
@@ -8,7 +8,20 @@ from carrot.db.common import Base
 from carrot.app.user.models import User
 from carrot.app.category.models import Category
 from carrot.app.region.models import Region
-    
+from carrot.app.image.models import Image
+
+
+class ProductImage(Base):
+    __tablename__ = "product_image"
+
+    # (product_id, position) PK 순서대로 저장되므로 상품별 이미지 조회가 PK 범위 스캔 한 번
+    product_id: Mapped[str] = mapped_column(String(36), ForeignKey("product.id", ondelete="CASCADE"), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    image_id: Mapped[str] = mapped_column(String(36), ForeignKey("image.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    image: Mapped[Image] = relationship("Image", lazy="joined")
+
+
 class Product(Base):
     __tablename__ = "product"
 
@@ -18,7 +31,6 @@ class Product(Base):
     region_id: Mapped[str] = mapped_column(String(36), ForeignKey("region.id", ondelete="CASCADE"), nullable=False, index=True)
 
     title: Mapped[str] = mapped_column(String(50))
-    image_ids: Mapped[list] = mapped_column(JSON, default=list, nullable=False)
     content: Mapped[str | None] = mapped_column(String(500))
     price: Mapped[int] = mapped_column(Integer, nullable=False)
     like_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -27,9 +39,39 @@ class Product(Base):
     user: Mapped[User] = relationship("User")
     category: Mapped[Category] = relationship("Category")
     region: Mapped[Region] = relationship("Region")
-    
+    images: Mapped[list[ProductImage]] = relationship(
+        "ProductImage", order_by=ProductImage.position, cascade="all, delete-orphan", lazy="selectin"
+    )
+
     auction: Mapped["Auction"] = relationship("Auction", back_populates="product", uselist=False, cascade="all, delete-orphan")
-    
+
+    @property
+    def image_ids(self) -> list[str]:
+        return [image.image_id for image in self.images]
+
+    @image_ids.setter
+    def image_ids(self, image_ids: list[str]) -> None:
+        if list(image_ids) == self.image_ids:
+            return
+        # 새 행은 기존 position 뒤에서부터 번호를 매겨, 같은 PK의 DELETE/INSERT 순서 충돌을 피함
+        next_position = max((image.position for image in self.images), default=-1) + 1
+        self.images = [
+            ProductImage(position=next_position + offset, image_id=image_id)
+            for offset, image_id in enumerate(image_ids)
+        ]
+
+    @property
+    def image_urls(self) -> list[str]:
+        return [image.image.image_url for image in self.images]
+
+    @property
+    def thumbnail_url(self) -> str | None:
+        if not self.images:
+            return None
+        image = self.images[0].image
+        return image.thumbnail_url or image.image_url
+
+
 class UserProduct(Base):
     __tablename__ = "user_product"
 
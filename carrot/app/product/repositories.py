@@ -1,11 +1,38 @@
-from typing import List
+from typing import Sequence
 
-from sqlalchemy import select, or_
+from sqlalchemy import RowMapping, func, select, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from carrot.app.product.models import Product
+from carrot.app.product.models import Product, ProductImage
 from carrot.app.auction.models import Auction
+from carrot.app.image.models import Image
+
+# 첫 번째 이미지의 썸네일 URL, 축소본이 없는 예전 이미지는 원본 URL (product_image PK 범위 스캔 + image PK 조회)
+_thumbnail_url = (
+    select(func.coalesce(Image.thumbnail_url, Image.image_url))
+    .join(ProductImage, ProductImage.image_id == Image.id)
+    .where(ProductImage.product_id == Product.id)
+    .order_by(ProductImage.position)
+    .limit(1)
+    .correlate(Product)
+    .scalar_subquery()
+)
+
+# 목록 응답(ProductListResponse)에 필요한 컬럼만 조회하기 위한 projection
+# image_ids는 get_image_ids_by_product_ids로 한 번에 채움
+PRODUCT_LIST_COLUMNS = (
+    Product.id,
+    Product.owner_id,
+    Product.title,
+    Product.content,
+    Product.price,
+    Product.like_count,
+    Product.category_id,
+    Product.region_id,
+    Product.is_sold,
+    _thumbnail_url.label("thumbnail_url"),
+)
 
 
 class ProductRepository:
@@ -39,23 +66,23 @@ class ProductRepository:
         result = await self.session.execute(query)
         return result.scalars().one_or_none()
 
-    async def get_posts_by_query(
+    async def get_post_rows_by_query(
         self,
         user_id: str | None,
         keyword: str | None,
         region_id: str | None,
-        with_auction: bool = False,
-    ) -> List[Product]:
-        query = select(Product)
-
-        # 1. 필터링 로직 추가: with_auction이 False이면 Auction이 없는 것만 가져옴
-        if not with_auction:
-            # Product와 Auction을 Outer Join 한 뒤, Auction 데이터가 없는 것(None)만 필터링
-            query = query.outerjoin(Product.auction).where(Auction.id == None)
-        else:
-            # Auction이 있는 것만 혹은 전체를 가져오고 싶다면 상황에 맞춰 innerjoin 등으로 변경 가능
-            # 현재는 'auction 정보를 포함해서' 가져온다는 의미로 selectinload 유지
-            query = query.options(selectinload(Product.auction))
+        category_id: str | None = None,
+        limit: int = 20,
+        after: str | None = None,
+    ) -> Sequence[RowMapping]:
+        # ORM 엔티티를 만들지 않고 필요한 컬럼만 Row로 가져오는 읽기 전용 경로
+        # (identity map 등록, 속성 계측 비용이 없음)
+        query = (
+            select(*PRODUCT_LIST_COLUMNS)
+            .select_from(Product)
+            .outerjoin(Auction, Auction.product_id == Product.id)
+            .where(Auction.id == None)
+        )
 
         if user_id:
             query = query.where(Product.owner_id == user_id)
@@ -72,20 +99,32 @@ class ProductRepository:
         if region_id:
             query = query.where(Product.region_id == region_id)
 
-        result = await self.session.execute(query)
-        return result.scalars().all()
+        if category_id:
+            query = query.where(Product.category_id == category_id)
 
-    async def get_posts_all(self, with_auction: bool = False) -> List[Product]:
-        query = select(Product)
-
-        if not with_auction:
-            # 경매 상품 제외 (Auction ID가 없는 것만)
-            query = query.outerjoin(Product.auction).where(Auction.id == None)
-        else:
-            query = query.options(selectinload(Product.auction))
+        # keyset: 이전 페이지 마지막 상품의 id 다음부터. InnoDB 보조 인덱스 끝에 PK가 붙으므로
+        # 필터 하나(owner/region/category)면 그 인덱스 순서대로 읽고 정렬하지 않음
+        if after is not None:
+            query = query.where(Product.id > after)
+        query = query.order_by(Product.id).limit(limit)
 
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return result.mappings().all()
+
+    async def get_image_ids_by_product_ids(self, product_ids: list[str]) -> dict[str, list[str]]:
+        image_ids: dict[str, list[str]] = {product_id: [] for product_id in product_ids}
+        if not product_ids:
+            return image_ids
+
+        query = (
+            select(ProductImage.product_id, ProductImage.image_id)
+            .where(ProductImage.product_id.in_(product_ids))
+            .order_by(ProductImage.product_id, ProductImage.position)
+        )
+        result = await self.session.execute(query)
+        for product_id, image_id in result.tuples():
+            image_ids[product_id].append(image_id)
+        return image_ids
 
     async def remove_post(self, product: Product) -> None:
         await self.session.delete(product)
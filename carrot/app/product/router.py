@@ -1,21 +1,27 @@
-from typing import Annotated, List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import TypeAdapter
 
 from carrot.app.auth.utils import login_with_header, partial_login_with_header, login_with_header_optional
 from carrot.app.user.models import User
 from carrot.app.product.models import Product, UserProduct
 from carrot.app.product.schemas import (
-    ProductListResponse,
+    ProductListPageResponse,
     ProductPostRequest,
     ProductPatchRequest,
     ProductResponse,
 )
 from carrot.app.product.services import ProductService
 from carrot.app.product.exceptions import ShouldLoginException
+from carrot.app.product.cache import product_cache
+from carrot.common.http_cache import build_cached_response
 
 product_router = APIRouter()
 
+# 목록 행(dict)을 응답 스키마로 페이지 단위 한 번에 검증하고 직렬화
+product_page_adapter = TypeAdapter(ProductListPageResponse)
+
 
 @product_router.post("/", status_code=201, response_model=ProductResponse)
 async def create_post(
@@ -54,31 +60,47 @@ async def update_post(
 @product_router.get("/{product_id}", status_code=200, response_model=ProductResponse)
 async def view_post(
     product_id: str,
+    request: Request,
     service: Annotated[ProductService, Depends()],
-) -> ProductResponse:
-    product = await service.view_post_by_product_id(product_id)
-    
-    return ProductResponse.model_validate(product)
+) -> Response:
+    entry = product_cache.get_detail(product_id)
+    if entry is None:
+        generation = product_cache.generation
+        product = await service.view_post_by_product_id(product_id)
+        body = ProductResponse.model_validate(product).model_dump_json().encode()
+        entry = product_cache.set_detail(product_id, body, generation)
+
+    return build_cached_response(request, entry)
 
-@product_router.get("/", status_code=200, response_model=List[ProductListResponse])
+@product_router.get("/", status_code=200, response_model=ProductListPageResponse)
 async def view_posts(
+    request: Request,
     service: Annotated[ProductService, Depends()],
     user: Annotated[User | None, Depends(login_with_header_optional)],
     user_id: str | None = Query(default=None, alias="seller"),
     keyword: str | None = Query(default=None, alias="search"),
     region_id: str | None = Query(default=None, alias="region"),
-) -> List[ProductListResponse]:
+    category_id: str | None = Query(default=None, alias="category"),
+    cursor: str | None = Query(default=None, description="이전 응답의 next_cursor"),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> Response:
     if user_id == "me":
         if user is None:
             raise ShouldLoginException
         user_id = user.id
 
-    if user_id or keyword or region_id:
-        products = await service.view_posts_by_query(user_id, keyword, region_id)
-    else:
-        products = await service.view_posts_all()
+    cache_key = (user_id, keyword, region_id, category_id, cursor, limit)
+    entry = product_cache.get_listing(cache_key)
+    if entry is None:
+        generation = product_cache.generation
+        rows, next_cursor = await service.view_post_rows(
+            user_id, keyword, region_id, category_id, limit, cursor
+        )
+        page = product_page_adapter.validate_python({"items": rows, "next_cursor": next_cursor})
+        body = product_page_adapter.dump_json(page)
+        entry = product_cache.set_listing(cache_key, body, generation)
 
-    return [ProductListResponse.model_validate(p) for p in products]
+    return build_cached_response(request, entry)
 
 @product_router.delete("/{product_id}", status_code=200, response_model=None)
 async def remove_post(
@@ -72,6 +72,7 @@ class ProductResponse(BaseModel):
     category_id: str
     region_id: str
     is_sold: bool
+    image_urls: List[str] = []
 
     auction: AuctionResponse | None = None
 
@@ -89,6 +90,11 @@ class ProductListResponse(BaseModel):
     category_id: str
     region_id: str
     is_sold: bool
+    thumbnail_url: str | None = None
 
     class Config:
         from_attributes = True
+
+class ProductListPageResponse(BaseModel):
+    items: List[ProductListResponse]
+    next_cursor: str | None = None  # 다음 페이지가 없으면 null
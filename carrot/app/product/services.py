@@ -1,3 +1,5 @@
+from collections import Counter
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
@@ -6,12 +8,21 @@ from carrot.db.connection import get_session_factory
 from carrot.app.product.models import Product
 from carrot.app.auction.models import Auction, AuctionStatus
 from carrot.app.product.repositories import ProductRepository
-from carrot.app.product.exceptions import NotYourProductException, InvalidProductIDException
+from carrot.app.product.cache import product_cache
+from carrot.app.product.exceptions import (
+    NotYourProductException,
+    InvalidProductIDException,
+    InvalidImageIDException,
+)
 from carrot.app.auction.exceptions import NotAllowedActionError
 
 from carrot.app.image.services import ImageService
+from carrot.app.image.worker import image_deletion_worker
 from carrot.app.product.schemas import ProductPostRequest
 from carrot.app.auction.schemas import AuctionCreate
+from carrot.app.auction.scheduler import auction_close_scheduler
+from carrot.common.exceptions import InvalidCursorException
+from carrot.common.pagination import decode_cursor, encode_cursor
 
 
 class ProductService:
@@ -20,6 +31,12 @@ class ProductService:
         self.repository = ProductRepository(session)
         self.image_service = ImageService(session)
 
+    async def _attach_images(self, image_ids: list) -> None:
+        # 상품에 붙이는 이미지의 참조 수를 올림
+        # 존재하지 않거나 지우는 중인 이미지를 참조하면 FK 위반(500) 대신 400으로 응답
+        if not await self.image_service.attach_product_images(list(image_ids)):
+            raise InvalidImageIDException
+
     async def create_post(
         self,
         user_id: str,
@@ -28,6 +45,8 @@ class ProductService:
         auction_data: AuctionCreate | None,
     ) -> Product:
         async with self.session.begin():  # ✅ 여기서 트랜잭션 시작/커밋/롤백
+            await self._attach_images(product_request.image_ids)
+
             product = Product(
                 owner_id=user_id,
                 title=product_request.title,
@@ -44,13 +63,18 @@ class ProductService:
                 auction = Auction(
                     product_id=new_product.id,
                     current_price=new_product.price,
+                    category_id=new_product.category_id,
+                    region_id=new_product.region_id,
                     end_at=auction_data.end_at,
                 )
                 await self.repository.create_auction(auction)
 
         # begin 블록을 나가면 commit된 상태
         # 필요하면 최신 상태 반영(선택)
-        await self.session.refresh(new_product, attribute_names=["auction"])
+        await self.session.refresh(new_product, attribute_names=["auction", "images"])
+        product_cache.invalidate_listings()
+        if new_product.auction is not None:
+            auction_close_scheduler.schedule(new_product.auction.id, new_product.auction.end_at)
         return new_product
 
     async def update_post(
@@ -79,6 +103,13 @@ class ProductService:
             if product.auction is not None:
                 raise NotAllowedActionError
 
+            # 새로 붙인 이미지는 참조 수를 올리고, 뗀 이미지는 내린 뒤 삭제 요청을 기록
+            previous = Counter(product.image_ids)
+            current = Counter(image_ids)
+            await self._attach_images(list((current - previous).elements()))
+            detached = list((previous - current).elements())
+            await self.image_service.remove_product_images(detached)
+
             product.title = title
             product.image_ids = image_ids
             product.content = content
@@ -93,6 +124,9 @@ class ProductService:
             updated = await self.repository.update_post(product)
 
         await self.session.refresh(updated)
+        product_cache.invalidate_product(updated.id)
+        if detached:
+            image_deletion_worker.notify()
         return updated
 
     async def view_post_by_product_id(self, product_id: str):
@@ -106,18 +140,37 @@ class ProductService:
 
         return product
 
-    async def view_posts_by_query(self, user_id: str | None, keyword: str | None, region_id: str | None):
-        products = await self.repository.get_posts_by_query(
+    async def view_post_rows(
+        self,
+        user_id: str | None,
+        keyword: str | None,
+        region_id: str | None,
+        category_id: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        after = None
+        if cursor is not None:
+            values = decode_cursor(cursor, "products")
+            if len(values) != 1 or not isinstance(values[0], str):
+                raise InvalidCursorException()
+            after = values[0]
+
+        # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+        rows = await self.repository.get_post_rows_by_query(
             user_id=user_id,
             keyword=keyword,
             region_id=region_id,
-            with_auction=False,
+            category_id=category_id,
+            limit=limit + 1,
+            after=after,
         )
-        return products
-
-    async def view_posts_all(self):
-        products = await self.repository.get_posts_all(with_auction=False)
-        return products
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("products", [rows[-1]["id"]])
+        image_ids = await self.repository.get_image_ids_by_product_ids([row["id"] for row in rows])
+        return [{**row, "image_ids": image_ids[row["id"]]} for row in rows], next_cursor
 
     async def remove_post(self, user_id: str, product_id: str) -> None:
         async with self.session.begin():
@@ -132,10 +185,8 @@ class ProductService:
 
             image_ids = list(product.image_ids or [])
             await self.repository.remove_post(product)
+            # 상품 삭제와 같은 트랜잭션에서 이미지 삭제 요청을 outbox에 기록
+            await self.image_service.remove_product_images(image_ids)
 
-        # 트랜잭션 밖에서 이미지 best-effort 삭제
-        for image_id in image_ids:
-            try:
-                await self.image_service.remove_product_image(image_id)
-            except Exception:
-                pass
+        product_cache.invalidate_product(product_id)
+        image_deletion_worker.notify()
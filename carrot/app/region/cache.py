@@ -0,0 +1,100 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from carrot.common.http_cache import CachedResponse, make_etag
+from carrot.db.connection import db
+from carrot.app.region.repositories import RegionRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+# 지역은 마이그레이션으로만 바뀌는 참조 데이터(약 3.5k행). 이 주기가 지나면 백그라운드에서 다시 읽음
+REFRESH_INTERVAL_SECONDS = 60 * 60
+
+
+def _cached(value: list) -> CachedResponse:
+    # FastAPI 기본 JSONResponse와 같은 직렬화
+    body = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+    return CachedResponse(etag=make_etag(body), body=body, expires_at=math.inf)
+
+
+@dataclass(frozen=True)
+class RegionTree:
+    """시도 -> 시군구 -> 동 계층의 응답 JSON을 미리 직렬화해 둔 불변 구조"""
+
+    sido: CachedResponse
+    sigugun: Mapping[str, CachedResponse]
+    dong: Mapping[tuple[str, str], CachedResponse]
+
+    # 없는 시도/시군구는 DB 조회 때와 같이 빈 목록
+    EMPTY = _cached([])
+
+    @classmethod
+    def build(cls, rows: list[tuple[str, str, str, str]]) -> "RegionTree":
+        # rows는 (id, sido, sigugun, dong)을 sido, sigugun, dong 순으로 정렬한 것. DB 정렬(collation) 순서를 그대로 유지
+        tree: dict[str, dict[str, list[dict[str, str]]]] = {}
+        for region_id, sido, sigugun, dong in rows:
+            tree.setdefault(sido, {}).setdefault(sigugun, []).append({"id": region_id, "dong": dong})
+
+        return cls(
+            sido=_cached(list(tree)),
+            sigugun=MappingProxyType({sido: _cached(list(children)) for sido, children in tree.items()}),
+            dong=MappingProxyType({
+                (sido, sigugun): _cached(dongs)
+                for sido, children in tree.items()
+                for sigugun, dongs in children.items()
+            }),
+        )
+
+    def get_sigugun(self, sido: str) -> CachedResponse:
+        return self.sigugun.get(sido, self.EMPTY)
+
+    def get_dong(self, sido: str, sigugun: str) -> CachedResponse:
+        return self.dong.get((sido, sigugun), self.EMPTY)
+
+
+class RegionTreeCache:
+    """프로세스 전역 지역 계층 캐시. 시작 시 로드하고, 이후 조회는 DB를 거치지 않음"""
+
+    def __init__(self) -> None:
+        self._tree: RegionTree | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    def _is_fresh(self) -> bool:
+        return self._tree is not None and self._loaded_at + REFRESH_INTERVAL_SECONDS > time.monotonic()
+
+    async def load(self) -> RegionTree:
+        async with self._lock:
+            # 동시에 여러 요청이 로드를 시작해도 DB 조회는 한 번만
+            if self._is_fresh():
+                return self._tree
+            async with db.session_factory() as session:
+                rows = await RegionRepository(session).get_region_tree_rows()
+            # 새 트리로 통째로 교체. 내용이 같으면 ETag도 같으므로 클라이언트 캐시는 그대로 유효
+            self._tree = RegionTree.build(rows)
+            self._loaded_at = time.monotonic()
+            return self._tree
+
+    async def get(self) -> RegionTree:
+        if self._tree is None:
+            return await self.load()
+        if not self._is_fresh() and (self._refresh_task is None or self._refresh_task.done()):
+            # 만료돼도 요청은 기존 트리로 바로 응답하고 다시 읽기는 백그라운드에서
+            self._refresh_task = asyncio.create_task(self._reload())
+        return self._tree
+
+    async def _reload(self) -> None:
+        try:
+            await self.load()
+        except Exception:
+            logger.exception("failed to reload region tree")
+
+
+region_tree_cache = RegionTreeCache()
@@ -1,7 +1,7 @@
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from carrot.app.region.models import Region
@@ -23,30 +23,13 @@ class RegionRepository:
     async def get_region_by_id(self, id: str) -> Region | None:
         return await self.session.scalar(select(Region).where(Region.id == id))
 
-    async def get_all_sido(self) -> list[str]:
-        result = await self.session.scalars(
-            select(Region.sido).distinct().order_by(Region.sido)
-        )
-        return list(result.all())
-
-    async def get_all_sigugun(self, sido: str) -> list[str]:
-        result = await self.session.scalars(
-            select(Region.sigugun)
-            .where(Region.sido == sido)
-            .distinct()
-            .order_by(Region.sigugun)
-        )
-        return list(result.all())
-
-    async def get_all_dong(self, sido: str, sigugun: str) -> list[dict[str, str]]:
+    async def get_region_tree_rows(self) -> list[tuple[str, str, str, str]]:
         result = await self.session.execute(
-            select(Region.id, Region.dong)
-            .where(and_(Region.sido == sido, Region.sigugun == sigugun))
-            .distinct()
-            .order_by(Region.dong)
+            select(Region.id, Region.sido, Region.sigugun, Region.dong).order_by(
+                Region.sido, Region.sigugun, Region.dong
+            )
         )
-
-        return [dict(row) for row in result.mappings()]
+        return [tuple(row) for row in result.all()]
 
     async def get_region_from_coordinates(
         self, lat: float, long: float
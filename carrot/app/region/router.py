@@ -1,9 +1,11 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from carrot.app.region.cache import region_tree_cache
 from carrot.app.region.schemas import RegionResponse
 from carrot.app.region.services import RegionService
+from carrot.common.http_cache import build_cached_response
 
 region_router = APIRouter()
 
@@ -34,30 +36,29 @@ async def nearby_region(
     return RegionResponse.model_validate(region)
 
 
-@region_router.get("/sido", status_code=status.HTTP_200_OK)
-async def get_all_sido(
-    region_service: Annotated[RegionService, Depends()],
-) -> list[str]:
-    return await region_service.get_all_sido()
+# 시도/시군구/동 목록은 메모리의 지역 트리에서 미리 직렬화된 JSON으로 응답 (DB 조회 없음)
+@region_router.get("/sido", status_code=status.HTTP_200_OK, response_model=list[str])
+async def get_all_sido(request: Request) -> Response:
+    tree = await region_tree_cache.get()
+    return build_cached_response(request, tree.sido)
 
 
-@region_router.get("/sido/{sido_nm}/sigugun", status_code=status.HTTP_200_OK)
-async def get_all_sigugun(
-    sido_nm: str,
-    region_service: Annotated[RegionService, Depends()],
-) -> list[str]:
-    return await region_service.get_all_sigugun(sido_nm=sido_nm)
+@region_router.get(
+    "/sido/{sido_nm}/sigugun", status_code=status.HTTP_200_OK, response_model=list[str]
+)
+async def get_all_sigugun(sido_nm: str, request: Request) -> Response:
+    tree = await region_tree_cache.get()
+    return build_cached_response(request, tree.get_sigugun(sido_nm))
 
 
 @region_router.get(
-    "/sido/{sido_nm}/sigugun/{sigugun_nm}/dong", status_code=status.HTTP_200_OK
+    "/sido/{sido_nm}/sigugun/{sigugun_nm}/dong",
+    status_code=status.HTTP_200_OK,
+    response_model=list[dict],
 )
-async def get_all_dong(
-    sido_nm: str,
-    sigugun_nm: str,
-    region_service: Annotated[RegionService, Depends()],
-) -> list[dict]:
-    return await region_service.get_all_dong(sido_nm=sido_nm, sigugun_nm=sigugun_nm)
+async def get_all_dong(sido_nm: str, sigugun_nm: str, request: Request) -> Response:
+    tree = await region_tree_cache.get()
+    return build_cached_response(request, tree.get_dong(sido_nm, sigugun_nm))
 
 
 @region_router.get("/{region_id}", status_code=status.HTTP_200_OK)
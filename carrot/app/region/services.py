@@ -17,17 +17,6 @@ class RegionService:
     async def get_region_by_id(self, id: str) -> Region | None:
         return await self.region_repository.get_region_by_id(id=id)
 
-    async def get_all_sido(self) -> list[str]:
-        return await self.region_repository.get_all_sido()
-
-    async def get_all_sigugun(self, sido_nm: str) -> list[str]:
-        return await self.region_repository.get_all_sigugun(sido=sido_nm)
-
-    async def get_all_dong(self, sido_nm: str, sigugun_nm: str) -> list[dict[str, str]]:
-        return await self.region_repository.get_all_dong(
-            sido=sido_nm, sigugun=sigugun_nm
-        )
-
     async def get_region_from_coordinates(
         self, lat: float, long: float
     ) -> Region | None:
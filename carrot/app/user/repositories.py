@@ -52,6 +52,27 @@ class UserRepository:
         )
         return await self.session.scalar(stmt)
 
+    async def get_users_for_update(self, user_ids: list[str]) -> dict[str, User]:
+        # 여러 유저를 잠글 때는 항상 id 순서로 한 번에 잠가서 데드락을 피함
+        stmt = (
+            select(User)
+            .where(User.id.in_(set(user_ids)))
+            .order_by(User.id)
+            .with_for_update()
+            # 로그인 시 읽어둔 유저 객체가 있어도 잠근 시점의 잔액으로 덮어씀
+            .execution_options(populate_existing=True)
+        )
+        users = await self.session.scalars(stmt)
+        return {user.id: user for user in users.all()}
+
+    async def get_user_coins(self, after: str | None, limit: int) -> list[tuple[str, int]]:
+        # id 순 keyset 배치 조회 (정산 검증용)
+        stmt = select(User.id, User.coin).order_by(User.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(User.id > after)
+        result = await self.session.execute(stmt)
+        return list(result.tuples().all())
+
     async def get_user_by_email(self, email: str) -> User | None:
         return await self.session.scalar(
             select(User)
@@ -45,4 +45,20 @@ class InvalidFormatException(CarrotException):
             status_code=400,
             error_code="ERR_003",
             error_msg="INVALID FIELD FORMAT"
-        )
\ No newline at end of file
+        )
+
+class InvalidCursorException(CarrotException):
+    def __init__(self):
+        super().__init__(
+            status_code=400,
+            error_code="ERR_013",
+            error_msg="INVALID PAGINATION CURSOR"
+        )
+
+class TransactionConflictException(CarrotException):
+    def __init__(self):
+        super().__init__(
+            status_code=503,
+            error_code="ERR_016",
+            error_msg="TOO MANY CONCURRENT UPDATES, TRY AGAIN"
+        )
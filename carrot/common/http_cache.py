@@ -0,0 +1,34 @@
+import hashlib
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """직렬화된 JSON 응답 바이트와 그 ETag"""
+
+    etag: str
+    body: bytes
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # W/ 접두사는 약한 비교로 취급
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def build_cached_response(request: Request, entry: CachedResponse) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,24 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from carrot.common.exceptions import InvalidCursorException
+
+
+def encode_cursor(kind: str, values: list[Any]) -> str:
+    # 클라이언트에는 내용을 알 수 없는 문자열로 전달
+    payload = json.dumps({"k": kind, "v": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursorException()
+    # 정렬 기준이 다른 커서를 재사용하는 경우
+    if not isinstance(payload, dict) or payload.get("k") != kind or not isinstance(payload.get("v"), list):
+        raise InvalidCursorException()
+    return payload["v"]
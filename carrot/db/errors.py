@@ -0,0 +1,18 @@
+from sqlalchemy.exc import DBAPIError
+
+# MySQL 서버 에러 코드
+ER_DUP_ENTRY = 1062
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+
+def mysql_error_code(exc: DBAPIError) -> int | None:
+    # pymysql/aiomysql 예외는 args[0]에 에러 코드를 담음
+    args = getattr(exc.orig, "args", ())
+    if args and isinstance(args[0], int):
+        return args[0]
+    return None
+
+
+def is_duplicate_key_error(exc: DBAPIError) -> bool:
+    return mysql_error_code(exc) == ER_DUP_ENTRY
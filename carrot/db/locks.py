@@ -0,0 +1,19 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@asynccontextmanager
+async def try_advisory_lock(session: AsyncSession, name: str) -> AsyncIterator[bool]:
+    """MySQL GET_LOCK 기반 이름 잠금. 기다리지 않고 획득 여부만 돌려줌.
+
+    잠금은 커넥션 단위이므로 같은 세션(트랜잭션) 안에서 사용해야 함
+    """
+    acquired = await session.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": name})
+    try:
+        yield bool(acquired)
+    finally:
+        if acquired:
+            await session.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
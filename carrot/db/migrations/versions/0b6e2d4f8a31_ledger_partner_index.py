@@ -0,0 +1,27 @@
+"""ledger (user_id, receive_user_id, time) index
+
+Revision ID: 0b6e2d4f8a31
+Revises: f3a5b7c91d24
+Create Date: 2026-10-19 20:31:17.554029
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e2d4f8a31'
+down_revision: Union[str, Sequence[str], None] = 'f3a5b7c91d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_ledger_user_id_receive_user_id_time', 'ledger',
+        ['user_id', 'receive_user_id', 'time'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ledger_user_id_receive_user_id_time', table_name='ledger')
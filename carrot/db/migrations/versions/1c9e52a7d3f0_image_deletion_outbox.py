@@ -0,0 +1,40 @@
+"""image_deletion_outbox
+
+Revision ID: 1c9e52a7d3f0
+Revises: f7f338e4bd6c
+Create Date: 2026-10-19 15:40:27.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9e52a7d3f0'
+down_revision: Union[str, Sequence[str], None] = 'f7f338e4bd6c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'image_deletion_outbox',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('image_id', sa.String(length=36), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_image_deletion_outbox_next_attempt_at'),
+        'image_deletion_outbox',
+        ['next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_image_deletion_outbox_next_attempt_at'), table_name='image_deletion_outbox')
+    op.drop_table('image_deletion_outbox')
@@ -0,0 +1,34 @@
+"""hash server-generated ledger keys in their own namespace
+
+Revision ID: 5b7d9e1f3a60
+Revises: e1f4a7c2b953
+Create Date: 2026-10-20 10:12:37.540219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7d9e1f3a60'
+down_revision: Union[str, Sequence[str], None] = 'e1f4a7c2b953'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INTERNAL_TYPES = "('HOLD', 'RELEASE', 'SETTLE')"
+
+
+def upgrade() -> None:
+    # 입찰 예치/해제, 낙찰 정산 거래의 키를 X'FF'를 붙여 다시 해시 (carrot.app.pay.idempotency.hash_request_key)
+    # 클라이언트 키는 UTF-8이라 이 해시와 겹칠 수 없음
+    op.execute(
+        "UPDATE ledger SET idempotency_key = UNHEX(SHA2(CONCAT(X'FF', request_key), 256)) "
+        f"WHERE transaction_type IN {INTERNAL_TYPES}"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE ledger SET idempotency_key = UNHEX(SHA2(request_key, 256)) "
+        f"WHERE transaction_type IN {INTERNAL_TYPES}"
+    )
@@ -0,0 +1,33 @@
+"""auction winning_bid_id
+
+Revision ID: 5e0a9d27b1c4
+Revises: 8b31d0e6c4a2
+Create Date: 2026-10-19 16:48:05.302914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a9d27b1c4'
+down_revision: Union[str, Sequence[str], None] = '8b31d0e6c4a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('auction', sa.Column('winning_bid_id', sa.String(length=36), nullable=True))
+    op.create_foreign_key(
+        'fk_auction_winning_bid_id_bid', 'auction', 'bid',
+        ['winning_bid_id'], ['id'], ondelete='SET NULL',
+    )
+    # 종료 스케줄러가 (status, end_at) 순서로 만료 경매를 찾음
+    op.create_index('ix_auction_status_end_at', 'auction', ['status', 'end_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auction_status_end_at', table_name='auction')
+    op.drop_constraint('fk_auction_winning_bid_id_bid', 'auction', type_='foreignkey')
+    op.drop_column('auction', 'winning_bid_id')
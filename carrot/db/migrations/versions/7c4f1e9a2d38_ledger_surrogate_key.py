@@ -0,0 +1,117 @@
+"""ledger surrogate key and hashed idempotency key
+
+Revision ID: 7c4f1e9a2d38
+Revises: 0b6e2d4f8a31
+Create Date: 2026-10-19 21:04:42.871305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4f1e9a2d38'
+down_revision: Union[str, Sequence[str], None] = '0b6e2d4f8a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 한 번에 옮기는 행 수. 청크마다 커밋해서 undo log와 잠금을 작게 유지
+CHUNK_SIZE = 5000
+
+TRANSACTION_TYPE = sa.Enum(
+    'DEPOSIT', 'WITHDRAW', 'TRANSFER', 'HOLD', 'RELEASE', 'SETTLE',
+    name='transactiontype', native_enum=False,
+)
+
+COPY_COLUMNS = (
+    'transaction_type, amount, description, time, user_id, receive_user_id, '
+    'balance_after, receive_balance_after'
+)
+
+
+def _ledger_columns() -> list[sa.Column]:
+    return [
+        sa.Column('transaction_type', TRANSACTION_TYPE, nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('time', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('receive_user_id', sa.String(length=36), nullable=True),
+        sa.Column('balance_after', sa.Integer(), nullable=True),
+        sa.Column('receive_balance_after', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['receive_user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    ]
+
+
+def _create_ledger_indexes(table: str) -> None:
+    op.create_index('ix_ledger_user_id_time', table, ['user_id', 'time'], unique=False)
+    op.create_index('ix_ledger_receive_user_id_time', table, ['receive_user_id', 'time'], unique=False)
+    op.create_index(
+        'ix_ledger_user_id_receive_user_id_time', table,
+        ['user_id', 'receive_user_id', 'time'], unique=False,
+    )
+
+
+def _copy_in_chunks(source: str, insert_sql: str, start) -> None:
+    # 원본 PK 순서로 CHUNK_SIZE개씩 범위를 잘라 INSERT ... SELECT (전체를 메모리에 올리지 않음)
+    # 복사 중 들어온 거래는 옮겨지지 않으므로 서비스 쓰기를 멈춘 상태에서 실행해야 함
+    bind = op.get_bind()
+    after = start
+    with op.get_context().autocommit_block():
+        while True:
+            last = bind.execute(
+                sa.text(f'SELECT id FROM {source} WHERE id > :after ORDER BY id LIMIT 1 OFFSET :offset'),
+                {'after': after, 'offset': CHUNK_SIZE - 1},
+            ).scalar()
+            if last is None:
+                bind.execute(sa.text(insert_sql + ' WHERE id > :after ORDER BY time, id'), {'after': after})
+                return
+            bind.execute(
+                sa.text(insert_sql + ' WHERE id > :after AND id <= :last ORDER BY time, id'),
+                {'after': after, 'last': last},
+            )
+            after = last
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ledger_new',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('request_key', sa.String(length=512), nullable=False),
+        sa.Column('idempotency_key', sa.BINARY(length=32), nullable=False),
+        *_ledger_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ux_ledger_idempotency_key', 'ledger_new', ['idempotency_key'], unique=True)
+    _create_ledger_indexes('ledger_new')
+
+    # 기존 id(request_key)는 원문으로 보관하고, 해시는 hash_request_key와 같은 sha256
+    _copy_in_chunks(
+        'ledger',
+        f'INSERT INTO ledger_new (request_key, idempotency_key, {COPY_COLUMNS}) '
+        f'SELECT id, UNHEX(SHA2(id, 256)), {COPY_COLUMNS} FROM ledger',
+        '',
+    )
+    op.execute('RENAME TABLE ledger TO ledger_old, ledger_new TO ledger')
+    op.drop_table('ledger_old')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'ledger_old',
+        sa.Column('id', sa.String(length=512), nullable=False),
+        *_ledger_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    _create_ledger_indexes('ledger_old')
+
+    _copy_in_chunks(
+        'ledger',
+        f'INSERT INTO ledger_old (id, {COPY_COLUMNS}) '
+        f'SELECT request_key, {COPY_COLUMNS} FROM ledger',
+        0,
+    )
+    op.execute('RENAME TABLE ledger TO ledger_new, ledger_old TO ledger')
+    op.drop_table('ledger_new')
@@ -0,0 +1,31 @@
+"""category_product_count
+
+Revision ID: 8b31d0e6c4a2
+Revises: 1c9e52a7d3f0
+Create Date: 2026-10-19 16:12:53.117640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b31d0e6c4a2'
+down_revision: Union[str, Sequence[str], None] = '1c9e52a7d3f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'category_product_count',
+        sa.Column('region_id', sa.String(length=36), nullable=False),
+        sa.Column('category_id', sa.String(length=36), nullable=False),
+        sa.Column('product_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('region_id', 'category_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('category_product_count')
@@ -0,0 +1,32 @@
+"""image dimensions and variants
+
+Revision ID: 9d2b6c0e4f17
+Revises: 7c4f1e9a2d38
+Create Date: 2026-10-19 22:12:05.413982
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2b6c0e4f17'
+down_revision: Union[str, Sequence[str], None] = '7c4f1e9a2d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 이미지는 축소본이 없으므로 NULL (목록은 원본 URL로 대체)
+    op.add_column('image', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('image', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('image', sa.Column('thumbnail_url', sa.String(length=255), nullable=True))
+    op.add_column('image', sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('image', 'variants')
+    op.drop_column('image', 'thumbnail_url')
+    op.drop_column('image', 'height')
+    op.drop_column('image', 'width')
@@ -0,0 +1,39 @@
+"""image_variant_outbox
+
+Revision ID: a2c6e8f04b17
+Revises: 5b7d9e1f3a60
+Create Date: 2026-10-19 17:12:03.418260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c6e8f04b17'
+down_revision: Union[str, Sequence[str], None] = '5b7d9e1f3a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'image_variant_outbox',
+        sa.Column('image_id', sa.String(length=36), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('image_id'),
+    )
+    op.create_index(
+        op.f('ix_image_variant_outbox_next_attempt_at'),
+        'image_variant_outbox',
+        ['next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_image_variant_outbox_next_attempt_at'), table_name='image_variant_outbox')
+    op.drop_table('image_variant_outbox')
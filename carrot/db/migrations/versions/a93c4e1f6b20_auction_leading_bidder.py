@@ -0,0 +1,32 @@
+"""auction leading_bidder_id
+
+Revision ID: a93c4e1f6b20
+Revises: 5e0a9d27b1c4
+Create Date: 2026-10-19 17:21:37.660412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93c4e1f6b20'
+down_revision: Union[str, Sequence[str], None] = '5e0a9d27b1c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 입찰은 코인을 예치하지 않았으므로 채워 넣지 않음
+    # (채우면 다음 입찰 때 예치한 적 없는 금액이 해제되고, 종료 시 판매자에게 지급됨)
+    op.add_column('auction', sa.Column('leading_bidder_id', sa.String(length=36), nullable=True))
+    op.create_foreign_key(
+        'fk_auction_leading_bidder_id_user', 'auction', 'user',
+        ['leading_bidder_id'], ['id'], ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_auction_leading_bidder_id_user', 'auction', type_='foreignkey')
+    op.drop_column('auction', 'leading_bidder_id')
@@ -0,0 +1,25 @@
+"""image deleting flag
+
+Revision ID: b4e9d2a7c310
+Revises: c7d1f3a95e28
+Create Date: 2026-10-20 10:12:53.417062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e9d2a7c310'
+down_revision: Union[str, Sequence[str], None] = 'c7d1f3a95e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('image', sa.Column('deleting', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('image', 'deleting')
@@ -0,0 +1,56 @@
+"""auction listing filters and sort indexes
+
+Revision ID: c2d87f5a3e19
+Revises: a93c4e1f6b20
+Create Date: 2026-10-19 18:05:44.913520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d87f5a3e19'
+down_revision: Union[str, Sequence[str], None] = 'a93c4e1f6b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('auction', sa.Column('category_id', sa.String(length=36), nullable=True))
+    op.add_column('auction', sa.Column('region_id', sa.String(length=36), nullable=True))
+    op.execute(
+        """
+        UPDATE auction a
+        JOIN product p ON p.id = a.product_id
+        SET a.category_id = p.category_id, a.region_id = p.region_id
+        """
+    )
+    op.alter_column('auction', 'category_id', existing_type=sa.String(length=36), nullable=False)
+    op.alter_column('auction', 'region_id', existing_type=sa.String(length=36), nullable=False)
+
+    # FK보다 인덱스를 먼저 만들어서 MySQL이 FK용 인덱스를 따로 만들지 않게 함
+    op.create_index('ix_auction_status_bid_count', 'auction', ['status', 'bid_count'], unique=False)
+    op.create_index('ix_auction_status_current_price', 'auction', ['status', 'current_price'], unique=False)
+    op.create_index('ix_auction_category_status_end_at', 'auction', ['category_id', 'status', 'end_at'], unique=False)
+    op.create_index('ix_auction_region_status_end_at', 'auction', ['region_id', 'status', 'end_at'], unique=False)
+    op.create_foreign_key(
+        'fk_auction_category_id_category', 'auction', 'category',
+        ['category_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        'fk_auction_region_id_region', 'auction', 'region',
+        ['region_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_auction_region_id_region', 'auction', type_='foreignkey')
+    op.drop_constraint('fk_auction_category_id_category', 'auction', type_='foreignkey')
+    op.drop_index('ix_auction_region_status_end_at', table_name='auction')
+    op.drop_index('ix_auction_category_status_end_at', table_name='auction')
+    op.drop_index('ix_auction_status_current_price', table_name='auction')
+    op.drop_index('ix_auction_status_bid_count', table_name='auction')
+    op.drop_column('auction', 'region_id')
+    op.drop_column('auction', 'category_id')
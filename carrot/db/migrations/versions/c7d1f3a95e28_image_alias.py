@@ -0,0 +1,34 @@
+"""image_alias
+
+Revision ID: c7d1f3a95e28
+Revises: a2c6e8f04b17
+Create Date: 2026-10-19 17:48:36.902771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d1f3a95e28'
+down_revision: Union[str, Sequence[str], None] = 'a2c6e8f04b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'image_alias',
+        sa.Column('image_id', sa.String(length=36), nullable=False),
+        sa.Column('target_image_id', sa.String(length=36), nullable=False),
+        sa.PrimaryKeyConstraint('image_id'),
+    )
+    op.create_index(
+        op.f('ix_image_alias_target_image_id'), 'image_alias', ['target_image_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_image_alias_target_image_id'), table_name='image_alias')
+    op.drop_table('image_alias')
@@ -0,0 +1,27 @@
+"""bid (auction_id, bid_at) index
+
+Revision ID: d6f1a08b2c57
+Revises: c2d87f5a3e19
+Create Date: 2026-10-19 18:41:09.227305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f1a08b2c57'
+down_revision: Union[str, Sequence[str], None] = 'c2d87f5a3e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 새 인덱스가 auction_id FK를 받쳐주므로 기존 단독 인덱스는 삭제
+    op.create_index('ix_bid_auction_id_bid_at', 'bid', ['auction_id', 'bid_at'], unique=False)
+    op.drop_index('ix_bid_auction_id', table_name='bid')
+
+
+def downgrade() -> None:
+    op.create_index('ix_bid_auction_id', 'bid', ['auction_id'], unique=False)
+    op.drop_index('ix_bid_auction_id_bid_at', table_name='bid')
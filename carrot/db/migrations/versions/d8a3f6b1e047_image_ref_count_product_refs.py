@@ -0,0 +1,31 @@
+"""image ref_count counts product references
+
+Revision ID: d8a3f6b1e047
+Revises: b4e9d2a7c310
+Create Date: 2026-10-20 11:37:05.281944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a3f6b1e047'
+down_revision: Union[str, Sequence[str], None] = 'b4e9d2a7c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 새 이미지는 어느 상품에도 붙지 않은 상태로 시작
+    op.alter_column('image', 'ref_count', existing_type=sa.Integer(), existing_nullable=False, server_default='0')
+    # 업로드 수로 세던 기존 값을 상품 이미지 수로 다시 계산
+    op.execute(
+        "UPDATE image SET ref_count = "
+        "(SELECT COUNT(*) FROM product_image WHERE product_image.image_id = image.id)"
+    )
+
+
+def downgrade() -> None:
+    op.alter_column('image', 'ref_count', existing_type=sa.Integer(), existing_nullable=False, server_default='1')
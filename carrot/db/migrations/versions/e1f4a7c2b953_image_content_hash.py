@@ -0,0 +1,30 @@
+"""image content hash and reference count
+
+Revision ID: e1f4a7c2b953
+Revises: 9d2b6c0e4f17
+Create Date: 2026-10-19 23:04:41.208517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f4a7c2b953'
+down_revision: Union[str, Sequence[str], None] = '9d2b6c0e4f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 이미지는 해시를 채우지 않음 (NULL은 유니크 인덱스에서 서로 겹치지 않음)
+    op.add_column('image', sa.Column('content_hash', sa.BINARY(length=32), nullable=True))
+    op.add_column('image', sa.Column('ref_count', sa.Integer(), server_default='1', nullable=False))
+    op.create_index('ux_image_content_hash', 'image', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_image_content_hash', table_name='image')
+    op.drop_column('image', 'ref_count')
+    op.drop_column('image', 'content_hash')
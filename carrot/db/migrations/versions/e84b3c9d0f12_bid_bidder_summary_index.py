@@ -0,0 +1,29 @@
+"""bid (bidder_id, auction_id, bid_price) index
+
+Revision ID: e84b3c9d0f12
+Revises: d6f1a08b2c57
+Create Date: 2026-10-19 19:10:52.481736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e84b3c9d0f12'
+down_revision: Union[str, Sequence[str], None] = 'd6f1a08b2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_bid_bidder_id_auction_id_bid_price', 'bid',
+        ['bidder_id', 'auction_id', 'bid_price'], unique=False,
+    )
+    op.drop_index('ix_bid_bidder_id', table_name='bid')
+
+
+def downgrade() -> None:
+    op.create_index('ix_bid_bidder_id', 'bid', ['bidder_id'], unique=False)
+    op.drop_index('ix_bid_bidder_id_auction_id_bid_price', table_name='bid')
@@ -0,0 +1,33 @@
+"""auction (filter, status, sort key) indexes
+
+Revision ID: f2c6a9d4b871
+Revises: d8a3f6b1e047
+Create Date: 2026-10-20 12:24:18.630517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a9d4b871'
+down_revision: Union[str, Sequence[str], None] = 'd8a3f6b1e047'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_auction_category_status_bid_count', ['category_id', 'status', 'bid_count']),
+    ('ix_auction_category_status_current_price', ['category_id', 'status', 'current_price']),
+    ('ix_auction_region_status_bid_count', ['region_id', 'status', 'bid_count']),
+    ('ix_auction_region_status_current_price', ['region_id', 'status', 'current_price']),
+]
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, 'auction', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='auction')
@@ -0,0 +1,32 @@
+"""ledger running balance
+
+Revision ID: f3a5b7c91d24
+Revises: e84b3c9d0f12
+Create Date: 2026-10-19 19:52:30.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a5b7c91d24'
+down_revision: Union[str, Sequence[str], None] = 'e84b3c9d0f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 거래는 당시 잔액을 알 수 없으므로 NULL로 둠
+    op.add_column('ledger', sa.Column('balance_after', sa.Integer(), nullable=True))
+    op.add_column('ledger', sa.Column('receive_balance_after', sa.Integer(), nullable=True))
+    op.create_index('ix_ledger_user_id_time', 'ledger', ['user_id', 'time'], unique=False)
+    op.create_index('ix_ledger_receive_user_id_time', 'ledger', ['receive_user_id', 'time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ledger_receive_user_id_time', table_name='ledger')
+    op.drop_index('ix_ledger_user_id_time', table_name='ledger')
+    op.drop_column('ledger', 'receive_balance_after')
+    op.drop_column('ledger', 'balance_after')
@@ -0,0 +1,72 @@
+"""product_image association table
+
+Revision ID: f7f338e4bd6c
+Revises: 7fa611714908
+Create Date: 2026-10-19 15:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7f338e4bd6c'
+down_revision: Union[str, Sequence[str], None] = '7fa611714908'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_image',
+        sa.Column('product_id', sa.String(length=36), nullable=False),
+        sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('image_id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['image_id'], ['image.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'position'),
+    )
+    op.create_index(op.f('ix_product_image_image_id'), 'product_image', ['image_id'], unique=False)
+
+    # 기존 JSON 배열을 순서대로 옮김 (존재하지 않는 이미지 id는 버림)
+    op.execute(
+        """
+        INSERT INTO product_image (product_id, position, image_id)
+        SELECT p.id,
+               ROW_NUMBER() OVER (PARTITION BY p.id ORDER BY jt.ord) - 1,
+               jt.image_id
+        FROM product p
+        JOIN JSON_TABLE(
+            p.image_ids, '$[*]'
+            COLUMNS (ord FOR ORDINALITY, image_id VARCHAR(36) PATH '$')
+        ) AS jt
+        JOIN image i ON i.id = jt.image_id
+        """
+    )
+
+    op.drop_column('product', 'image_ids')
+
+
+def downgrade() -> None:
+    op.add_column('product', sa.Column('image_ids', sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE product p
+        SET p.image_ids = COALESCE(
+            (
+                SELECT JSON_ARRAYAGG(pi.image_id)
+                FROM (
+                    SELECT image_id FROM product_image
+                    WHERE product_id = p.id
+                    ORDER BY position
+                ) AS pi
+            ),
+            JSON_ARRAY()
+        )
+        """
+    )
+    op.alter_column('product', 'image_ids', existing_type=sa.JSON(), nullable=False)
+
+    op.drop_index(op.f('ix_product_image_image_id'), table_name='product_image')
+    op.drop_table('product_image')
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from carrot.common.exceptions import TransactionConflictException
+from carrot.db.connection import db
+from carrot.db.errors import ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT, mysql_error_code
+
+logger = logging.getLogger("uvicorn.error")
+
+T = TypeVar("T")
+
+# 다시 시도하면 성공할 수 있는 잠금 충돌. MySQL은 데드락이면 트랜잭션 전체를 롤백함
+RETRYABLE_ERRORS = {
+    ER_LOCK_DEADLOCK: "deadlock",
+    ER_LOCK_WAIT_TIMEOUT: "lock_wait_timeout",
+}
+MAX_ATTEMPTS = 4
+BASE_BACKOFF_SECONDS = 0.02
+MAX_BACKOFF_SECONDS = 0.5
+# 누적 재시도/포기 횟수를 로그로 남기는 주기
+METRICS_REPORT_INTERVAL_SECONDS = 60.0
+
+
+class TransactionMetrics:
+    """트랜잭션 이름별 재시도 횟수와 잠금 충돌로 버린 시간 (프로세스별 누적)"""
+
+    def __init__(self) -> None:
+        self.attempts: Counter[str] = Counter()
+        self.retries: Counter[tuple[str, str]] = Counter()  # (name, reason)
+        self.exhausted: Counter[str] = Counter()
+        # 잠금 충돌로 실패해서 버린 시도들이 걸린 시간 합 (성공한 시도의 잠금 대기는 포함하지 않음)
+        self.conflict_seconds: Counter[str] = Counter()
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "attempts": attempts,
+                "retries": {
+                    reason: count for (key, reason), count in self.retries.items() if key == name
+                },
+                "exhausted": self.exhausted[name],
+                "conflict_seconds": round(self.conflict_seconds[name], 3),
+            }
+            for name, attempts in self.attempts.items()
+        }
+
+
+transaction_metrics = TransactionMetrics()
+
+
+class TransactionMetricsReporter:
+    """transaction_metrics를 주기적으로 로그에 남기는 백그라운드 작업 (새 시도가 있었을 때만)"""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._reported_attempts = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 종료 직전까지 쌓인 값도 남김
+        self.report()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(METRICS_REPORT_INTERVAL_SECONDS)
+            try:
+                self.report()
+            except Exception:
+                logger.exception("transaction metrics report failed")
+
+    def report(self) -> bool:
+        attempts = sum(transaction_metrics.attempts.values())
+        if attempts == self._reported_attempts:
+            return False
+        self._reported_attempts = attempts
+        logger.info(f"transaction metrics: {json.dumps(transaction_metrics.snapshot(), sort_keys=True)}")
+        return True
+
+
+transaction_metrics_reporter = TransactionMetricsReporter()
+
+
+def retryable_reason(exc: BaseException) -> str | None:
+    """예외 체인에서 재시도할 수 있는 잠금 충돌을 찾음
+
+    데드락이면 InnoDB가 트랜잭션 전체를 롤백해서 savepoint도 사라지므로, begin_nested()가 빠져나가며
+    실행하는 ROLLBACK TO SAVEPOINT가 1305로 다시 실패함. 원래 예외(1213)는 __context__로만 남음
+    SQLAlchemy 예외의 __cause__는 항상 드라이버 예외이므로 __cause__와 __context__를 모두 따라감
+    """
+    seen: set[int] = set()
+    pending: list[BaseException | None] = [exc]
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, DBAPIError):
+            reason = RETRYABLE_ERRORS.get(mysql_error_code(current))
+            if reason is not None:
+                return reason
+        pending += [current.__cause__, current.__context__]
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    # full jitter: 동시에 충돌한 요청들이 같은 시각에 다시 부딪히지 않도록 분산
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (attempt - 1)))
+
+
+async def run_in_transaction(
+    name: str,
+    operation: Callable[[AsyncSession], Awaitable[T]],
+    max_attempts: int = MAX_ATTEMPTS,
+) -> T:
+    """operation을 새 세션의 트랜잭션 안에서 실행하고 커밋. 데드락/잠금 대기 초과면 처음부터 다시 실행
+
+    시도마다 새 세션을 쓰므로 operation은 세션 밖의 ORM 객체를 지연 로딩하지 않아야 함
+    요청 세션이 커넥션을 쥔 채로 호출하면 요청 하나가 커넥션 두 개를 쓰므로,
+    로그인 유저는 login_with_header_detached로 받아야 함
+    """
+    for attempt in range(1, max_attempts + 1):
+        transaction_metrics.attempts[name] += 1
+        started = time.monotonic()
+        async with db.session_factory() as session:
+            try:
+                result = await operation(session)
+                await session.commit()
+                return result
+            except Exception as e:
+                reason = retryable_reason(e)
+                if reason is None:
+                    raise
+                waited = time.monotonic() - started
+                transaction_metrics.conflict_seconds[name] += waited
+                if attempt == max_attempts:
+                    transaction_metrics.exhausted[name] += 1
+                    logger.error(f"{name}: {reason} after {attempt} attempts, giving up")
+                    # 500 대신 잠시 후 다시 시도하라는 응답
+                    raise TransactionConflictException() from e
+                transaction_metrics.retries[(name, reason)] += 1
+
+        # 세션(커넥션)을 반납한 뒤에 대기
+        delay = _backoff(attempt)
+        logger.warning(
+            f"{name}: {reason} on attempt {attempt}/{max_attempts} "
+            f"(waited {waited:.3f}s), retrying in {delay:.3f}s"
+        )
+        await asyncio.sleep(delay)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
@@ -8,8 +10,44 @@ from carrot.api import api_router
 from carrot.common.exceptions import CarrotException, MissingRequiredFieldException
 from carrot.app.auth.settings import AUTH_SETTINGS
 from carrot.settings import SETTINGS
+from carrot.common.exceptions import logger
+from carrot.app.image.worker import image_deletion_worker, image_variant_worker
+from carrot.app.image import processing as image_processing
+from carrot.app.category.cache import category_cache
+from carrot.app.region.cache import region_tree_cache
+from carrot.app.category.worker import category_facet_refresher
+from carrot.app.auction.scheduler import auction_close_scheduler
+from carrot.db.transaction import transaction_metrics_reporter
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await category_cache.load()
+    except Exception:
+        # DB가 아직 준비되지 않았어도 서버는 뜨도록 하고, 첫 조회 때 다시 로드
+        logger.exception("failed to preload categories")
+    try:
+        await region_tree_cache.load()
+    except Exception:
+        logger.exception("failed to preload region tree")
+
+    image_processing.start()
+    image_deletion_worker.start()
+    image_variant_worker.start()
+    category_facet_refresher.start()
+    auction_close_scheduler.start()
+    transaction_metrics_reporter.start()
+    yield
+    await transaction_metrics_reporter.stop()
+    await auction_close_scheduler.stop()
+    await category_facet_refresher.stop()
+    await image_variant_worker.stop()
+    await image_deletion_worker.stop()
+    image_processing.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # add session middleware (this is used internally by starlette to execute the authorization flow)
 
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import uuid
+
+# 앱 설정은 import 시점에 환경 변수에서 읽으므로 carrot을 import하기 전에 채움
+os.environ.setdefault("ENV", "test")
+for _key, _value in {
+    "DB_DIALECT": "mysql",
+    "DB_DRIVER": "aiomysql",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_DATABASE": "test",
+    "ACCESS_TOKEN_SECRET": "test-access",
+    "REFRESH_TOKEN_SECRET": "test-refresh",
+    "SESSION_SECRET": "test-session",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "FRONTEND_URL": "http://localhost:8080",
+    "AWS_DEFAULT_REGION": "ap-northeast-2",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import pytest
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+import carrot.main  # noqa: F401  모든 모델(mapper)을 등록
+from carrot.db.common import Base
+from carrot.db.connection import db
+
+# 동시성 테스트는 실제 행 잠금이 있는 MySQL에서 돌려야 의미가 있음
+#   TEST_DATABASE_URL=mysql+aiomysql://user:pw@localhost:3306/carrot_test pytest
+# 지정하지 않으면 SQLite 파일 DB로 로직만 확인 (쓰기 트랜잭션이 직렬화됨)
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_sqlite(type_, compiler, **kw):
+    # SQLite는 INTEGER PRIMARY KEY만 autoincrement
+    return "INTEGER"
+
+
+def _sqlite_url() -> str:
+    return f"sqlite+aiosqlite:///{tempfile.gettempdir()}/carrot-test-{uuid.uuid4().hex}.db"
+
+
+def _prepare_sqlite(engine) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        # pysqlite의 암묵적 BEGIN을 끄고 아래 begin 이벤트에서 직접 시작 (SAVEPOINT가 제대로 동작하도록)
+        dbapi_connection.isolation_level = None
+        dbapi_connection.create_function("ST_GeomFromGeoJSON", 3, lambda geojson, options, srid: geojson)
+        # 잠금 대기 순서가 공정하지 않아 동시 쓰기가 많으면 일부 커넥션이 기본 5초를 넘겨 기다림
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout = 60000")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(connection):
+        # 행 잠금이 없으므로 쓰기 트랜잭션을 처음부터 직렬화
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """빈 스키마를 만들고 앱 전역 db(세션 팩토리)가 이 DB를 쓰도록 바꿈"""
+    url = TEST_DATABASE_URL or _sqlite_url()
+    engine = create_async_engine(url, pool_size=20, max_overflow=0, pool_timeout=30)
+    if engine.dialect.name == "sqlite":
+        _prepare_sqlite(engine)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    original = db.engine, db.session_factory
+    db.engine = engine
+    db.session_factory = async_sessionmaker(
+        bind=engine, expire_on_commit=False, autoflush=False, autocommit=False
+    )
+    try:
+        yield db.session_factory
+    finally:
+        db.engine, db.session_factory = original
+        if TEST_DATABASE_URL:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+        if engine.dialect.name == "sqlite":
+            os.remove(engine.url.database)
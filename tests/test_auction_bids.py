@@ -0,0 +1,81 @@
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import func, select
+
+from carrot.app.auction.exceptions import NotAllowedActionError
+from carrot.app.auction.models import Auction, Bid
+from carrot.app.auction.services import AuctionService
+from carrot.app.pay.exceptions import CoinLackException
+from carrot.app.pay.models import Ledger, TransactionType
+from carrot.app.user.models import User
+from carrot.common.exceptions import TransactionConflictException
+from carrot.db.transaction import run_in_transaction
+from tests.utils import create_auction, create_users
+
+pytestmark = pytest.mark.anyio
+
+BIDDERS = 20
+BIDS = 2000
+START_PRICE = 100
+INITIAL_COIN = 5000
+
+
+async def test_concurrent_bids_keep_auction_and_coins_consistent(database):
+    seller_id, *bidder_ids = await create_users(database, [0] + [INITIAL_COIN] * BIDDERS)
+    auction_id = await create_auction(database, seller_id, START_PRICE)
+
+    rng = random.Random(31)
+    # 대체로 오르지만 서로 겹치는 입찰가 -> 같은 경매 행을 두고 경합하고 일부는 거절됨
+    # 잔액보다 큰 입찰도 섞어서 예치 실패 경로도 지나가도록 함
+    bids = [
+        (rng.choice(bidder_ids), START_PRICE + index * 2 + rng.randint(0, 200))
+        for index in range(BIDS)
+    ]
+
+    async def place(bidder_id: str, price: int) -> bool:
+        try:
+            await run_in_transaction(
+                "auction.place_bid",
+                lambda session: AuctionService.create(session).place_bid(
+                    auction_id=auction_id, bidder_id=bidder_id, bid_price=price
+                ),
+            )
+            return True
+        except (NotAllowedActionError, CoinLackException, TransactionConflictException):
+            return False
+
+    results = await asyncio.gather(*(place(bidder_id, price) for bidder_id, price in bids))
+    accepted = sum(results)
+    assert accepted > 0
+
+    async with database() as session:
+        auction = await session.get(Auction, auction_id)
+        bid_rows = (await session.execute(
+            select(Bid.bidder_id, Bid.bid_price).where(Bid.auction_id == auction_id)
+        )).all()
+        coins = dict((await session.execute(select(User.id, User.coin))).tuples().all())
+        held = dict((await session.execute(
+            select(
+                Ledger.user_id,
+                func.sum(Ledger.amount).filter(Ledger.transaction_type == TransactionType.HOLD)
+                - func.coalesce(
+                    func.sum(Ledger.amount).filter(Ledger.transaction_type == TransactionType.RELEASE), 0
+                ),
+            ).group_by(Ledger.user_id)
+        )).tuples().all())
+
+    # 입찰 수 / 현재가 / 최고 입찰자가 실제 입찰 행과 일치
+    assert auction.bid_count == len(bid_rows) == accepted
+    top_bidder, top_price = max(bid_rows, key=lambda row: row.bid_price)
+    assert auction.current_price == top_price
+    assert auction.leading_bidder_id == top_bidder
+
+    # 코인 보존: 최고 입찰자의 예치금만 빠져 있고 나머지는 모두 돌려받음
+    assert sum(coins.values()) + auction.current_price == INITIAL_COIN * BIDDERS
+    for bidder_id in bidder_ids:
+        expected_hold = auction.current_price if bidder_id == auction.leading_bidder_id else 0
+        assert coins[bidder_id] == INITIAL_COIN - expected_hold
+        assert held.get(bidder_id, 0) == expected_hold
+    assert coins[seller_id] == 0
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import update
+
+from carrot.app.auction.models import Auction, AuctionStatus
+from carrot.app.auction.scheduler import AuctionCloseScheduler
+from carrot.app.auction.utils import utcnow
+from carrot.app.pay.services import PayService
+from carrot.app.user.models import User
+from tests.utils import create_expired_auction_with_bid, create_users
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failing_auction_does_not_block_others(database, monkeypatch):
+    seller_id, bidder_id = await create_users(database, [0, 1000])
+    auction_ids = [
+        await create_expired_auction_with_bid(database, seller_id, bidder_id, price)
+        for price in (110, 120, 130)
+    ]
+    # 종료 시각이 가장 이른(배치 맨 앞) 경매의 정산이 항상 실패
+    poisoned = auction_ids[0]
+    settle_auctions = PayService.settle_auctions
+    settle_attempts = []
+
+    async def failing_settle(self, settlements):
+        settle_attempts.append([auction_id for auction_id, *_ in settlements])
+        if any(auction_id == poisoned for auction_id, *_ in settlements):
+            raise RuntimeError("settlement failed")
+        await settle_auctions(self, settlements)
+
+    monkeypatch.setattr(PayService, "settle_auctions", failing_settle)
+
+    scheduler = AuctionCloseScheduler()
+    assert await scheduler.close_expired() == 2
+
+    async with database() as session:
+        statuses = {
+            auction_id: (await session.get(Auction, auction_id)).status for auction_id in auction_ids
+        }
+        seller = await session.get(User, seller_id)
+    assert statuses == {
+        poisoned: AuctionStatus.ACTIVE,
+        auction_ids[1]: AuctionStatus.FINISHED,
+        auction_ids[2]: AuctionStatus.FINISHED,
+    }
+    assert seller.coin == 120 + 130
+
+    # 실패한 경매는 백오프 동안 배치에서 빠지므로 다시 배치 전체를 롤백시키지 않음
+    settle_attempts.clear()
+    assert await scheduler.close_expired() == 0
+    assert settle_attempts == []
+
+
+async def test_failures_of_auctions_closed_elsewhere_are_pruned(database, monkeypatch):
+    seller_id, bidder_id = await create_users(database, [0, 1000])
+    auction_id = await create_expired_auction_with_bid(database, seller_id, bidder_id, 110)
+
+    async def failing_settle(self, settlements):
+        raise RuntimeError("settlement failed")
+
+    monkeypatch.setattr(PayService, "settle_auctions", failing_settle)
+    scheduler = AuctionCloseScheduler()
+    assert await scheduler.close_expired() == 0
+    assert scheduler._retrying_ids(utcnow()) == [auction_id]
+
+    # 아직 열려 있으면 백오프 기록을 유지
+    await scheduler.prune_failures()
+    assert scheduler._retrying_ids(utcnow()) == [auction_id]
+
+    # 다른 워커가 종료(또는 취소)하면 다음 재동기화 때 지움
+    async with database() as session:
+        await session.execute(
+            update(Auction).where(Auction.id == auction_id).values(status=AuctionStatus.CANCELED)
+        )
+        await session.commit()
+    await scheduler.prune_failures()
+    assert scheduler._retrying_ids(utcnow()) == []
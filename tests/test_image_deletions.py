@@ -0,0 +1,137 @@
+import io
+import uuid
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import select, update
+
+from carrot.app.image import services, worker
+from carrot.app.image.models import Image, ImageDeletion
+from carrot.app.image.repositories import ImageRepository
+from carrot.app.image.services import ImageService
+from carrot.app.image.storage import object_url
+from carrot.app.image.worker import MAX_ATTEMPTS, ImageDeletionWorker
+from carrot.app.product.exceptions import InvalidImageIDException
+from carrot.app.product.schemas import ProductPostRequest
+from carrot.app.product.services import ProductService
+from tests.utils import create_region_and_category, create_users
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_released_image(session_factory) -> str:
+    """참조가 모두 사라져 삭제 요청만 남은 이미지"""
+    image_id = str(uuid.uuid4())
+    async with session_factory() as session:
+        async with session.begin():
+            session.add(Image(
+                id=image_id, image_url=object_url(f"{image_id}.png"), content_hash=uuid.uuid4().bytes * 2, ref_count=0
+            ))
+            await ImageRepository(session).add_image_deletions([image_id])
+    return image_id
+
+
+async def ref_count(session_factory, image_id: str) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(Image.ref_count).where(Image.id == image_id))
+
+
+async def test_objects_are_deleted_outside_the_lease_transaction(database, monkeypatch):
+    image_id = await add_released_image(database)
+    seen = {}
+
+    async def delete_objects(keys):
+        # 다른 세션에서 보이면 S3를 부르기 전에 커밋된 것 (이미지/outbox 행을 잠근 채 기다리지 않음)
+        async with database() as session:
+            image = await session.get(Image, image_id)
+            seen["image"] = (image.deleting, image.content_hash)
+        return []
+
+    monkeypatch.setattr(worker, "delete_objects", delete_objects)
+    assert await ImageDeletionWorker().process_batch() == 1
+
+    # 지우는 중인 이미지는 같은 파일의 업로드가 공유하지 않음
+    assert seen["image"] == (True, None)
+    async with database() as session:
+        assert await session.get(Image, image_id) is None
+        assert await session.scalar(select(ImageDeletion.id)) is None
+
+
+async def test_exhausted_deletions_are_dropped(database, monkeypatch):
+    image_id = await add_released_image(database)
+
+    async def delete_objects(keys):
+        return keys
+
+    monkeypatch.setattr(worker, "delete_objects", delete_objects)
+    assert await ImageDeletionWorker().process_batch() == 1
+
+    async with database() as session:
+        image = await session.get(Image, image_id)
+        deletion = await session.scalar(select(ImageDeletion))
+    # S3 삭제가 실패하면 이미지 행은 지우는 중으로 남고 요청은 백오프 후 재시도
+    assert image.deleting
+    assert deletion.attempts == 1
+
+    async with database() as session:
+        await session.execute(update(ImageDeletion).values(attempts=MAX_ATTEMPTS))
+        await session.commit()
+    assert await ImageDeletionWorker().process_batch() == 0
+    async with database() as session:
+        assert await session.scalar(select(ImageDeletion.id)) is None
+
+
+async def test_reuploaded_photo_is_deleted_with_its_last_product(database, monkeypatch):
+    (owner_id,) = await create_users(database, [0])
+    region_id, category_id = await create_region_and_category(database)
+    deleted = []
+
+    async def upload_object(fileobj, key, content_type):
+        pass
+
+    async def delete_objects(keys):
+        deleted.extend(keys)
+        return []
+
+    monkeypatch.setattr(services, "upload_object", upload_object)
+    monkeypatch.setattr(worker, "delete_objects", delete_objects)
+
+    # 같은 사진을 두 번 올리면(재시도) 같은 이미지를 공유하고, 참조 수는 늘지 않음
+    images = []
+    for _ in range(2):
+        async with database() as session:
+            async with session.begin():
+                images.append(await ImageService(session).upload_image(
+                    UploadFile(io.BytesIO(b"photo"), size=5, filename="photo.png")
+                ))
+    assert images[0].id == images[1].id
+    image_id = images[0].id
+
+    async def create_post(image_ids):
+        async with database() as session:
+            request = ProductPostRequest(
+                title="상품", image_ids=image_ids, content="", price=1000, category_id=category_id
+            )
+            return (await ProductService(session).create_post(owner_id, request, region_id, None)).id
+
+    first = await create_post([image_id])
+    assert await ref_count(database, image_id) == 1
+    second = await create_post([image_id])
+    assert await ref_count(database, image_id) == 2
+
+    async with database() as session:
+        await ProductService(session).remove_post(owner_id, first)
+    assert await ImageDeletionWorker().process_batch() == 1
+    # 다른 상품이 아직 쓰고 있으면 지우지 않음
+    assert deleted == []
+
+    async with database() as session:
+        await ProductService(session).remove_post(owner_id, second)
+    assert await ImageDeletionWorker().process_batch() == 1
+    assert deleted == [f"{image_id}.png"]
+    async with database() as session:
+        assert await session.get(Image, image_id) is None
+
+    # 지운 이미지는 상품에 다시 붙일 수 없음
+    with pytest.raises(InvalidImageIDException):
+        await create_post([image_id])
@@ -0,0 +1,129 @@
+import base64
+import hashlib
+import io
+import uuid
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import UploadFile
+from sqlalchemy import select
+from starlette.datastructures import Headers
+
+from carrot.app.image import services
+from carrot.app.image.exceptions import FileUploadFailedException
+from carrot.app.image.models import Image
+from carrot.app.image.repositories import ImageRepository
+from carrot.app.image.services import ImageService
+from carrot.app.image.storage import object_key_from_url, object_url
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """서비스가 쓰는 S3 호출을 메모리 dict(키 -> sha256)로 대신함"""
+    objects: dict[str, bytes] = {}
+
+    async def head_object(key):
+        if key not in objects:
+            return None
+        checksum = base64.b64encode(objects[key]).decode()
+        return {"ContentLength": 100, "ContentType": "image/png", "ChecksumSHA256": checksum}
+
+    async def delete_objects(keys):
+        for key in keys:
+            objects.pop(key, None)
+        return []
+
+    monkeypatch.setattr(services, "head_object", head_object)
+    monkeypatch.setattr(services, "delete_objects", delete_objects)
+    return objects
+
+
+def upload(objects: dict[str, bytes], content: bytes) -> str:
+    key = f"{uuid.uuid4()}.png"
+    objects[key] = hashlib.sha256(content).digest()
+    return key
+
+
+async def confirm(session_factory, key: str) -> Image:
+    async with session_factory() as session:
+        async with session.begin():
+            return await ImageService(session).confirm_upload(key)
+
+
+async def ref_count(session_factory, image_id: str) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(Image.ref_count).where(Image.id == image_id))
+
+
+async def test_retried_confirm_of_deduplicated_upload_returns_the_same_image(database, s3):
+    first = await confirm(database, upload(s3, b"photo"))
+
+    key = upload(s3, b"photo")
+    shared = await confirm(database, key)
+    assert shared.id == first.id
+    # 클라이언트 객체는 지워짐
+    assert key not in s3
+
+    # 다시 확인해도 IMG_002가 아니라 같은 이미지. 참조 수는 상품에 붙일 때만 올라감
+    retried = await confirm(database, key)
+    assert retried.id == first.id
+    assert await ref_count(database, first.id) == 0
+
+
+async def test_losing_concurrent_confirm_keeps_the_shared_original(database, s3, monkeypatch):
+    if database.kw["bind"].dialect.name == "sqlite":
+        # SQLite의 UNIQUE 위반에는 MySQL 에러 코드(1062)가 없음
+        monkeypatch.setattr(services, "is_duplicate_key_error", lambda e: "UNIQUE" in str(e))
+    key = upload(s3, b"photo")
+    winner = await confirm(database, key)
+
+    # 같은 키의 확인이 동시에 들어와 먼저 저장된 뒤에 INSERT가 충돌한 쪽
+    image_id = key.split(".")[0]
+    async with database() as session:
+        async with session.begin():
+            saved, created = await ImageService(session)._save_image(
+                Image(id=image_id, image_url=object_url(key), content_hash=winner.content_hash)
+            )
+
+    assert (saved.id, created) == (winner.id, False)
+    assert object_key_from_url(winner.image_url) in s3
+    assert await ref_count(database, winner.id) == 0
+
+
+class ChunkedUpload(UploadFile):
+    """크기를 모르는 업로드 (Content-Length 없이 chunked로 받은 파일)"""
+
+    async def read(self, size: int = -1) -> bytes:
+        raise AssertionError("unknown-size upload must not be read into memory")
+
+
+async def test_upload_of_unknown_size_is_streamed_without_variants(database, monkeypatch):
+    uploaded = {}
+
+    async def upload_object(fileobj, key, content_type):
+        uploaded[key] = fileobj.read()
+
+    monkeypatch.setattr(services, "upload_object", upload_object)
+    file = ChunkedUpload(
+        io.BytesIO(b"photo"), size=None, filename="photo.png", headers=Headers({"content-type": "image/png"})
+    )
+    async with database() as session:
+        async with session.begin():
+            image = await ImageService(session).upload_image(file)
+            pending = await ImageRepository(session).get_pending_variant_image_ids([image.id])
+
+    assert uploaded == {object_key_from_url(image.image_url): b"photo"}
+    assert pending == set()
+
+
+async def test_storage_errors_are_reported_as_upload_failures(database, monkeypatch):
+    async def upload_object(fileobj, key, content_type):
+        raise ClientError({"Error": {"Code": "SlowDown"}}, "PutObject")
+
+    monkeypatch.setattr(services, "upload_object", upload_object)
+    file = UploadFile(io.BytesIO(b"photo"), size=5, filename="photo.png")
+    async with database() as session:
+        with pytest.raises(FileUploadFailedException):
+            await ImageService(session).upload_image(file)
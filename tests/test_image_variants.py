@@ -0,0 +1,96 @@
+import io
+import uuid
+
+import pytest
+from PIL import Image as PILImage
+
+from carrot.app.image import processing, worker
+from carrot.app.image.models import Image
+from carrot.app.image.repositories import ImageRepository
+from carrot.app.image.services import ImageService
+from carrot.app.image.storage import object_key_from_url, object_url
+from carrot.app.image.worker import ImageVariantWorker
+
+
+def png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (width, height), (200, 120, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_render_variants_checks_pixels_before_decoding(monkeypatch):
+    # Pillow 자체 한도(2배를 넘어야 에러)에는 한참 못 미치는 크기 -> 직접 확인해야만 걸림
+    monkeypatch.setattr(processing, "MAX_IMAGE_PIXELS", 100 * 100 - 1)
+    with pytest.raises(PILImage.DecompressionBombError):
+        processing.render_variants(png(100, 100))
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """워커가 쓰는 S3 호출을 메모리 dict로 대신함"""
+    objects: dict[str, bytes] = {}
+
+    async def download_object(key):
+        return objects[key]
+
+    async def upload_object(fileobj, key, content_type):
+        objects[key] = fileobj.read()
+
+    async def delete_objects(keys):
+        for key in keys:
+            objects.pop(key, None)
+        return []
+
+    monkeypatch.setattr(worker, "download_object", download_object)
+    monkeypatch.setattr(worker, "upload_object", upload_object)
+    monkeypatch.setattr(worker, "delete_objects", delete_objects)
+    yield objects
+    processing.shutdown()
+
+
+async def add_image(session_factory, objects: dict[str, bytes], data: bytes) -> str:
+    image_id = str(uuid.uuid4())
+    key = f"{image_id}.png"
+    objects[key] = data
+    async with session_factory() as session:
+        async with session.begin():
+            session.add(Image(id=image_id, image_url=object_url(key), content_hash=uuid.uuid4().bytes * 2))
+            await ImageRepository(session).add_variant_jobs([image_id])
+    return image_id
+
+
+@pytest.mark.anyio
+async def test_variants_are_rendered_after_the_request(database, s3):
+    image_id = await add_image(database, s3, png(1000, 500))
+
+    async with database() as session:
+        _, final = await ImageService(session).view_images_in_order([image_id])
+    # 축소본을 만들기 전 응답은 곧 바뀌므로 캐시하면 안 됨
+    assert not final
+
+    assert await ImageVariantWorker().process_batch() == 1
+
+    async with database() as session:
+        images, final = await ImageService(session).view_images_in_order([image_id])
+    image = images[0]
+    assert final
+    assert (image.width, image.height) == (1000, 500)
+    assert {(variant["width"], variant["format"]) for variant in image.variants} == {
+        (width, format) for width in (320, 640, 1000) for format in ("webp", "jpeg")
+    }
+    assert image.thumbnail_url == object_url(f"{image_id}_w320.webp")
+    assert all(object_key_from_url(url) in s3 for url in image.object_urls)
+    assert await ImageVariantWorker().process_batch() == 0
+
+
+@pytest.mark.anyio
+async def test_undecodable_image_keeps_only_the_original(database, s3):
+    image_id = await add_image(database, s3, b"not an image")
+
+    assert await ImageVariantWorker().process_batch() == 1
+
+    async with database() as session:
+        images, final = await ImageService(session).view_images_in_order([image_id])
+    assert final
+    assert images[0].variants is None
+    assert list(s3) == [f"{image_id}.png"]
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import select
+
+from carrot.app.auction.models import Auction, AuctionStatus
+from carrot.app.auction.scheduler import AuctionCloseScheduler
+from carrot.app.pay.exceptions import DuplicateRequestKeyException
+from carrot.app.pay.idempotency import hash_request_key
+from carrot.app.pay.models import Ledger, TransactionType
+from carrot.app.pay.schemas import BatchTransferItem, BatchTransferItemStatus, BatchTransferMode
+from carrot.app.pay.services import PayService
+from carrot.app.user.models import User
+from carrot.db.transaction import run_in_transaction
+from tests.utils import create_expired_auction_with_bid, create_users
+
+pytestmark = pytest.mark.anyio
+
+
+async def _deposit(database, user_id: str, request_key: str, amount: int) -> Ledger:
+    async with database() as session:
+        user = await session.get(User, user_id)
+    return await run_in_transaction(
+        "pay.deposit",
+        lambda session: PayService.create(session).deposit(
+            request_key=request_key, amount=amount, description="", user=user
+        ),
+    )
+
+
+def test_internal_keys_are_hashed_apart_from_client_keys():
+    client = Ledger(request_key="auction-settle:1", transaction_type=TransactionType.DEPOSIT)
+    internal = Ledger(transaction_type=TransactionType.SETTLE, request_key="auction-settle:1")
+    assert client.idempotency_key == hash_request_key("auction-settle:1")
+    assert internal.idempotency_key == hash_request_key("auction-settle:1", internal=True)
+    assert client.idempotency_key != internal.idempotency_key
+
+
+async def test_client_deposit_cannot_block_settlement(database):
+    seller_id, bidder_id, attacker_id = await create_users(database, [0, 1000, 10])
+    auction_id = await create_expired_auction_with_bid(database, seller_id, bidder_id, 150)
+
+    # 공개된 경매 id로 정산 ledger와 같은 request_key를 먼저 사용
+    deposit = await _deposit(database, attacker_id, f"auction-settle:{auction_id}", 5)
+    assert deposit.transaction_type == TransactionType.DEPOSIT
+
+    assert await AuctionCloseScheduler().close_expired() == 1
+
+    async with database() as session:
+        auction = await session.get(Auction, auction_id)
+        seller = await session.get(User, seller_id)
+        ledgers = (await session.execute(
+            select(Ledger.transaction_type, Ledger.user_id)
+            .where(Ledger.request_key == f"auction-settle:{auction_id}")
+        )).all()
+    assert auction.status == AuctionStatus.FINISHED
+    assert seller.coin == 150
+    assert set(ledgers) == {
+        (TransactionType.DEPOSIT, attacker_id),
+        (TransactionType.SETTLE, bidder_id),
+    }
+
+    # 같은 키로 다시 입금하면 기존 입금이 그대로 반환됨 (정산 ledger가 아님)
+    again = await _deposit(database, attacker_id, f"auction-settle:{auction_id}", 5)
+    assert again.id == deposit.id
+
+
+async def test_batch_does_not_return_another_users_ledger(database):
+    owner_id, sender_id, receiver_id = await create_users(database, [0, 1000, 0])
+    await _deposit(database, owner_id, "shared-key", 5)
+
+    async with database() as session:
+        sender = await session.get(User, sender_id)
+    items = [
+        BatchTransferItem(amount=10, description="", request_key="shared-key", receive_user_id=receiver_id),
+        BatchTransferItem(amount=10, description="", request_key="own-key", receive_user_id=receiver_id),
+    ]
+
+    async def transfer_batch(session):
+        return await PayService.create(session).transfer_batch(items, BatchTransferMode.PARTIAL, sender)
+
+    collided, created = await run_in_transaction("pay.transfer_batch", transfer_batch)
+    assert collided.status == BatchTransferItemStatus.FAILED
+    assert collided.ledger is None
+    assert collided.error.error_code == DuplicateRequestKeyException().error_code
+    assert created.status == BatchTransferItemStatus.CREATED
+
+    # 보낸 유저 자신의 재요청은 기존 거래를 그대로 돌려줌
+    _, again = await run_in_transaction("pay.transfer_batch", transfer_batch)
+    assert again.status == BatchTransferItemStatus.DUPLICATE
+    assert again.ledger.id == created.ledger.id
@@ -0,0 +1,150 @@
+import asyncio
+import random
+import uuid
+
+import httpx
+import pymysql
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from carrot.app.auth.settings import AUTH_SETTINGS
+from carrot.app.auth.utils import issue_token
+from carrot.app.pay.exceptions import CoinLackException
+from carrot.app.pay.models import Ledger
+from carrot.app.pay.reconcile import reconcile_balances
+from carrot.app.pay.repositories import PayRepository
+from carrot.app.pay.services import PayService
+from carrot.app.user.models import User
+from carrot.db.connection import db
+from carrot.db.errors import ER_LOCK_DEADLOCK
+from carrot.db.transaction import TransactionMetricsReporter, run_in_transaction, transaction_metrics
+from carrot.main import app
+from tests.conftest import _prepare_sqlite
+from tests.utils import create_users
+
+pytestmark = pytest.mark.anyio
+
+USERS = 6
+OPERATIONS = 600
+INITIAL_COIN = 100_000
+
+
+def deadlock() -> OperationalError:
+    return OperationalError(
+        "UPDATE user ...", {}, pymysql.err.OperationalError(ER_LOCK_DEADLOCK, "Deadlock found")
+    )
+
+
+async def test_deadlock_masked_by_savepoint_rollback_is_retried(database):
+    calls = 0
+
+    async def operation(session):
+        nonlocal calls
+        calls += 1
+        async with session.begin_nested():
+            if calls == 1:
+                # InnoDB처럼 트랜잭션 전체를 롤백해서 savepoint까지 없앤 뒤 1213을 던짐
+                # -> begin_nested()의 ROLLBACK TO SAVEPOINT가 실패하고 1213은 __context__로만 남음
+                await (await session.connection()).exec_driver_sql("ROLLBACK")
+                raise deadlock()
+        return calls
+
+    before = transaction_metrics.retries[("test.masked", "deadlock")]
+    assert await run_in_transaction("test.masked", operation) == 2
+    assert transaction_metrics.retries[("test.masked", "deadlock")] == before + 1
+
+    # 재시도 횟수는 주기적으로 로그에 남아 운영 중에 볼 수 있음
+    reporter = TransactionMetricsReporter()
+    assert reporter.report()
+    assert transaction_metrics.snapshot()["test.masked"]["retries"] == {"deadlock": before + 1}
+    assert not reporter.report()
+
+
+async def test_transfers_complete_under_forced_deadlocks(database, monkeypatch):
+    user_ids = await create_users(database, [INITIAL_COIN] * USERS)
+    rng = random.Random(44)
+    add_to_balance = PayRepository.add_to_balance
+
+    async def add_to_balance_with_deadlocks(self, user_id, amount, min_balance=None):
+        updated = await add_to_balance(self, user_id, amount, min_balance)
+        # 잔액 갱신의 10%를 데드락으로 실패시켜 재시도 경로를 계속 지나가게 함
+        if rng.random() < 0.1:
+            raise deadlock()
+        return updated
+
+    monkeypatch.setattr(PayRepository, "add_to_balance", add_to_balance_with_deadlocks)
+
+    async def run(index: int) -> str:
+        user_id = rng.choice(user_ids)
+        kind = rng.choice(["transfer", "transfer", "deposit", "withdraw"])
+        request_key = f"contention-{index}"
+
+        async def operation(session):
+            # 유저는 시도마다 새 세션에서 읽음 (세션 밖 ORM 객체를 쓰지 않음)
+            user = await session.get(User, user_id)
+            service = PayService.create(session)
+            amount = rng.randint(1, 500)
+            if kind == "deposit":
+                return await service.deposit(request_key, amount, kind, user)
+            if kind == "withdraw":
+                return await service.withdraw(request_key, amount, kind, user)
+            receiver_id = rng.choice([other for other in user_ids if other != user_id])
+            return await service.transfer(request_key, amount, kind, receiver_id, user)
+
+        try:
+            await run_in_transaction(f"test.{kind}", operation, max_attempts=20)
+        except CoinLackException:
+            return "rejected"
+        return "done"
+
+    retries_before = sum(transaction_metrics.retries.values())
+    results = await asyncio.gather(*(run(index) for index in range(OPERATIONS)))
+
+    assert results.count("done") + results.count("rejected") == OPERATIONS
+    assert sum(transaction_metrics.retries.values()) > retries_before
+
+    async with database() as session:
+        ledger_count = await session.scalar(select(func.count()).select_from(Ledger))
+    # 재시도한 요청도 원장에는 한 번만 남음
+    assert ledger_count == results.count("done")
+
+    # 테스트 유저는 원장 없이 INITIAL_COIN으로 만들었으므로 원장 합계는 그 차이와 같아야 함
+    checked, mismatches = await reconcile_balances()
+    assert checked == USERS
+    assert all(coin - INITIAL_COIN == ledger_balance for _, coin, ledger_balance in mismatches)
+
+
+async def test_pay_endpoints_do_not_hold_two_connections(database):
+    (user_id,) = await create_users(database, [0])
+    token = issue_token(user_id, 10, AUTH_SETTINGS.ACCESS_TOKEN_SECRET)
+
+    # 커넥션 두 개짜리 풀: 요청이 로그인 세션을 쥔 채 run_in_transaction 커넥션을 기다리면
+    # 동시 요청 둘이 풀을 나눠 갖고 서로 기다리다 pool timeout이 남
+    engine = create_async_engine(db.engine.url, pool_size=2, max_overflow=0, pool_timeout=2)
+    if engine.dialect.name == "sqlite":
+        _prepare_sqlite(engine)
+    original = db.engine, db.session_factory
+    db.engine = engine
+    db.session_factory = async_sessionmaker(
+        bind=engine, expire_on_commit=False, autoflush=False, autocommit=False
+    )
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.post(
+                    "/api/pay/deposit",
+                    headers={"Authorization": f"Bearer {token}"},
+                    json={"amount": 10, "description": "deposit", "request_key": str(uuid.uuid4())},
+                )
+                for _ in range(20)
+            ))
+    finally:
+        db.engine, db.session_factory = original
+        await engine.dispose()
+
+    assert [response.status_code for response in responses] == [201] * 20
+    async with database() as session:
+        assert await session.scalar(select(User.coin).where(User.id == user_id)) == 200
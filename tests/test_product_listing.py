@@ -0,0 +1,51 @@
+import uuid
+
+import httpx
+import pytest
+
+from carrot.app.product.cache import product_cache
+from carrot.app.product.models import Product
+from carrot.main import app
+from tests.utils import create_region_and_category, create_users
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_listing_is_paged_by_cursor(database):
+    (owner_id,) = await create_users(database, [0])
+    region_id, category_id = await create_region_and_category(database)
+    async with database() as session:
+        session.add_all([
+            Product(
+                id=str(uuid.uuid4()), owner_id=owner_id, category_id=category_id, region_id=region_id,
+                title="상품", content="", price=1000, like_count=0, is_sold=False,
+            )
+            for _ in range(5)
+        ])
+        await session.commit()
+    product_cache.invalidate_listings()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        ids, etags, cursor = [], set(), None
+        while True:
+            params = {"region": region_id, "limit": 2}
+            if cursor is not None:
+                params["cursor"] = cursor
+            response = await client.get("/api/product/", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 2
+            ids += [item["id"] for item in page["items"]]
+            # 페이지마다 다른 캐시 항목
+            etags.add(response.headers["etag"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(ids) == len(set(ids)) == 5
+        assert ids == sorted(ids)
+        assert len(etags) == 3
+
+        response = await client.get("/api/product/", params={"cursor": "not-a-cursor"})
+        assert response.json()["error_code"] == "ERR_013"
@@ -0,0 +1,103 @@
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from carrot.app.auction.models import Auction, AuctionStatus
+from carrot.app.auction.services import AuctionService
+from carrot.app.auction.utils import utcnow
+from carrot.app.category.models import Category
+from carrot.app.product.models import Product
+from carrot.app.region.models import Region
+from carrot.app.user.models import User, UserStatus
+from carrot.db.transaction import run_in_transaction
+
+
+async def create_users(session_factory, coins: list[int]) -> list[str]:
+    users = [
+        User(
+            id=str(uuid.uuid4()),
+            email=f"{uuid.uuid4().hex[:16]}@test.com",
+            nickname=f"user{index}",
+            coin=coin,
+            status=UserStatus.ACTIVE,
+        )
+        for index, coin in enumerate(coins)
+    ]
+    async with session_factory() as session:
+        session.add_all(users)
+        await session.commit()
+    return [user.id for user in users]
+
+
+def new_region_and_category() -> tuple[Region, Category]:
+    region = Region(
+        id=str(uuid.uuid4()),
+        sido="서울특별시",
+        sigugun="관악구",
+        dong=uuid.uuid4().hex[:8],
+        full_name=f"서울특별시 관악구 {uuid.uuid4().hex[:8]}",
+        geom='{"type":"Point","coordinates":[126.95,37.48]}',
+    )
+    category = Category(id=str(uuid.uuid4()), name=uuid.uuid4().hex[:16])
+    return region, category
+
+
+async def create_region_and_category(session_factory) -> tuple[str, str]:
+    region, category = new_region_and_category()
+    async with session_factory() as session:
+        session.add_all([region, category])
+        await session.commit()
+    return region.id, category.id
+
+
+async def create_auction(
+    session_factory, owner_id: str, price: int, ends_in: timedelta = timedelta(days=1)
+) -> str:
+    region, category = new_region_and_category()
+    product = Product(
+        id=str(uuid.uuid4()),
+        owner_id=owner_id,
+        category_id=category.id,
+        region_id=region.id,
+        title="경매 상품",
+        content="",
+        price=price,
+        like_count=0,
+        is_sold=False,
+    )
+    auction = Auction(
+        id=str(uuid.uuid4()),
+        product_id=product.id,
+        category_id=category.id,
+        region_id=region.id,
+        current_price=price,
+        end_at=utcnow() + ends_in,
+        bid_count=0,
+        status=AuctionStatus.ACTIVE,
+    )
+    async with session_factory() as session:
+        session.add(region)
+        session.add(category)
+        await session.flush()
+        session.add(product)
+        await session.flush()
+        session.add(auction)
+        await session.commit()
+    return auction.id
+
+
+async def create_expired_auction_with_bid(session_factory, seller_id: str, bidder_id: str, price: int) -> str:
+    auction_id = await create_auction(session_factory, seller_id, 100)
+    await run_in_transaction(
+        "auction.place_bid",
+        lambda session: AuctionService.create(session).place_bid(
+            auction_id=auction_id, bidder_id=bidder_id, bid_price=price
+        ),
+    )
+    async with session_factory() as session:
+        await session.execute(
+            update(Auction).where(Auction.id == auction_id).values(end_at=utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+    return auction_id